@@ -0,0 +1,51 @@
+'''By Ray Bernard ray.bernard@outlook.com
+     MIT License '''
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from cidr.allocator import SubnetAllocator
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Sustained allocate/free churn on a SubnetAllocator.')
+    parser.add_argument('--parent', default='10.0.0.0/8', help='the parent network')
+    parser.add_argument('--live', type=int, default=1000000, help='number of live subnets before the churn starts')
+    parser.add_argument('--operations', type=int, default=1000000, help='number of allocate/free operations in the churn')
+    parser.add_argument('--min-prefix', type=int, default=28, help='shortest prefix length allocated')
+    parser.add_argument('--max-prefix', type=int, default=32, help='longest prefix length allocated')
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    allocator = SubnetAllocator(args.parent)
+    live = []
+
+    start = time.perf_counter()
+    for _ in range(args.live):
+        live.append(allocator.allocate(rng.randint(args.min_prefix, args.max_prefix)))
+    elapsed = time.perf_counter() - start
+    print("{:<24} {:>12} {:>15}".format('Phase', 'Operations', 'Operations/s'))
+    print("{:<24} {:>12,} {:>15,.0f}".format('Fill', args.live, args.live / elapsed))
+
+    # Free a random live subnet, then allocate a random size, keeping the live count steady
+    start = time.perf_counter()
+    for _ in range(args.operations // 2):
+        index = rng.randrange(len(live))
+        live[index], live[-1] = live[-1], live[index]
+        allocator.free(live.pop())
+        live.append(allocator.allocate(rng.randint(args.min_prefix, args.max_prefix)))
+    elapsed = time.perf_counter() - start
+    print("{:<24} {:>12,} {:>15,.0f}".format('Churn (free + allocate)', args.operations, args.operations / elapsed))
+
+    start = time.perf_counter()
+    state = allocator.to_dict()
+    SubnetAllocator.from_dict(state)
+    print(f"Serialized and restored {len(allocator):,} subnets in {time.perf_counter() - start:.3f} s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+'''By Ray Bernard ray.bernard@outlook.com
+     MIT License '''
+import argparse
+import gc
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from cidr.network_calculator import Network_Calculator, Compact_Network_Calculator
+
+
+def random_cidrs(count, seed=0):
+    """
+    Generates random CIDR strings.
+    """
+    rng = random.Random(seed)
+    return [f"{rng.randrange(1, 224)}.{rng.randrange(256)}.{rng.randrange(256)}.{rng.randrange(256)}/{rng.randrange(8, 31)}"
+            for _ in range(count)]
+
+
+def measure(cls, ip_list):
+    """
+    Returns the construction time and the traced bytes per object for a class.
+    """
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    objects = [cls(ip_cidr) for ip_cidr in ip_list]
+    elapsed = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+
+    # Time again without tracemalloc, which slows allocation down
+    gc.collect()
+    start = time.perf_counter()
+    objects = [cls(ip_cidr) for ip_cidr in ip_list]
+    elapsed = time.perf_counter() - start
+    del objects
+    return elapsed, size / len(ip_list)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare Network_Calculator and Compact_Network_Calculator.')
+    parser.add_argument('--count', type=int, default=200000, help='number of objects to build')
+    args = parser.parse_args()
+
+    ip_list = random_cidrs(args.count)
+    print("{:<30} {:>15} {:>15} {:>15}".format('Class', 'Build (s)', 'Objects/s', 'Bytes/object'))
+    for cls in (Network_Calculator, Compact_Network_Calculator):
+        elapsed, per_object = measure(cls, ip_list)
+        print("{:<30} {:>15.3f} {:>15,.0f} {:>15,.1f}".format(cls.__name__, elapsed, args.count / elapsed, per_object))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+'''By Ray Bernard ray.bernard@outlook.com
+     MIT License '''
+import argparse
+import os
+import sys
+import time
+from ipaddress import IPv4Address, IPv4Network
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import numpy as np
+from generators import cidr_list
+from cidr.flowjoin import FlowJoin
+from cidr.interval_set import IPv4IntervalSet
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Flow log to subnet join against per-address containment checks.')
+    parser.add_argument('--subnets', type=int, default=50000, help='number of subnets, nested as in an IPAM export')
+    parser.add_argument('--addresses', type=int, default=100000000, help='number of flow source addresses')
+    parser.add_argument('--chunk-size', type=int, default=1 << 22, help='addresses handled per pass')
+    parser.add_argument('--naive-subnets', type=int, default=1000, help='table size for the containment checks')
+    args = parser.parse_args()
+
+    ip_list = cidr_list(args.subnets, 'enterprise')
+    rng = np.random.default_rng(0)
+    start = time.perf_counter()
+    join = FlowJoin(ip_list)
+    print(f"Flattened {len(join):,} subnets in {time.perf_counter() - start:.3f} s; "
+          f"distinct host bitmap {IPv4IntervalSet.from_cidrs(ip_list).num_addresses() / 8 / (1 << 20):,.1f} MiB")
+
+    # Flows mostly come from private space, so most addresses land in some subnet
+    def flows(count):
+        for first in range(0, count, args.chunk_size):
+            size = min(args.chunk_size, count - first)
+            yield np.where(rng.random(size) < 0.9, rng.integers(0x0A000000, 0x0B000000, size),
+                           rng.integers(0xC0A80000, 0xC0A90000, size)).astype(np.uint32)
+
+    print("{:<34} {:>14} {:>15}".format('Method', 'Addresses', 'Addresses/s'))
+    for count_distinct in (False, True):
+        join = FlowJoin(ip_list, count_distinct=count_distinct)
+        elapsed = 0.0
+        for chunk in flows(args.addresses):
+            start = time.perf_counter()
+            join.add(chunk, args.chunk_size)
+            elapsed += time.perf_counter() - start
+        name = 'FlowJoin.add, hits and hosts' if count_distinct else 'FlowJoin.add, hits only'
+        print("{:<34} {:>14,} {:>15,.0f}".format(name, args.addresses, args.addresses / elapsed))
+    print(f"{int(join.unmatched):,} unmatched, {int(join.active_hosts.sum()):,} active hosts")
+
+    # The containment checks are far too slow for the full table, so they get a smaller one
+    networks = [IPv4Network(ip_cidr, strict=False) for ip_cidr in ip_list[:args.naive_subnets]]
+    sample = [IPv4Address(address) for address in next(flows(200)).tolist()]
+    start = time.perf_counter()
+    for address in sample:
+        best = None
+        for network in networks:
+            if address in network and (best is None or network.prefixlen > best.prefixlen):
+                best = network
+    elapsed = time.perf_counter() - start
+    print("{:<34} {:>14,} {:>15,.0f}".format(f"'in' checks, {len(networks):,} subnets", len(sample),
+                                             len(sample) / elapsed))
+
+
+if __name__ == '__main__':
+    main()
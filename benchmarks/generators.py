@@ -0,0 +1,67 @@
+'''By Ray Bernard ray.bernard@outlook.com
+     MIT License '''
+import random
+
+
+# Rough prefix length mixes seen in practice, as (prefix length, weight)
+DISTRIBUTIONS = {
+    # A global routing table: mostly /24, then /22, /23 and /20, a few short prefixes
+    'bgp': [(8, 1), (12, 2), (14, 3), (16, 12), (17, 4), (18, 6), (19, 12), (20, 24), (21, 20),
+            (22, 50), (23, 40), (24, 280)],
+    # An enterprise IPAM export: private space cut into LAN, point-to-point and loopback subnets
+    'enterprise': [(16, 2), (20, 4), (22, 10), (23, 12), (24, 40), (25, 8), (26, 10), (27, 8),
+                   (28, 6), (29, 6), (30, 14), (31, 6), (32, 10)],
+    # Every prefix length equally likely
+    'uniform': [(prefix_len, 1) for prefix_len in range(8, 33)],
+}
+
+_PRIVATE = [(0x0A000000, 8), (0xAC100000, 12), (0xC0A80000, 16)]
+
+
+def cidr_list(count, distribution='bgp', seed=0):
+    """
+    Generates CIDR strings with a realistic prefix length mix.
+
+    Parameters:
+        count (int): The number of CIDRs.
+        distribution (str): 'bgp', 'enterprise' or 'uniform'.
+        seed (int): The random seed, so runs are repeatable.
+
+    Returns:
+        list: The CIDR strings. Host bits are clear except for the uniform mix.
+    """
+    rng = random.Random(seed)
+    lengths, weights = zip(*DISTRIBUTIONS[distribution])
+    prefixes = rng.choices(lengths, weights, k=count)
+    ip_list = []
+    for prefix_len in prefixes:
+        if distribution == 'enterprise':
+            base, base_len = rng.choice(_PRIVATE)
+            address = base | rng.getrandbits(32 - base_len)
+        else:
+            address = rng.randrange(0x01000000, 0xE0000000)
+        if distribution != 'uniform':
+            address &= 0xFFFFFFFF ^ ((1 << (32 - prefix_len)) - 1)
+        ip_list.append(f"{address >> 24}.{(address >> 16) & 0xFF}.{(address >> 8) & 0xFF}.{address & 0xFF}/{prefix_len}")
+    return ip_list
+
+
+def bandwidth_inputs(count, seed=0):
+    """
+    Generates BandwidthCalculator constructor arguments.
+
+    Parameters:
+        count (int): The number of argument tuples.
+        seed (int): The random seed, so runs are repeatable.
+
+    Returns:
+        list: (media throughput, read ratio, write ratio, initial data size) tuples.
+    """
+    rng = random.Random(seed)
+    throughputs = ['100 Mbps', '1 Gbps', '10 Gbps', '25 Gbps', '40 Gbps', '100 Gbps', '400 Gbps', '1 Tbps']
+    sizes = ['500 GB', '1 TB', '10 TB', '50 TB', '100 TB', '1 PB']
+    inputs = []
+    for _ in range(count):
+        read_ratio = rng.choice([10, 20, 25, 30, 50, 70, 75, 80, 90])
+        inputs.append((rng.choice(throughputs), read_ratio, 100 - read_ratio, rng.choice(sizes)))
+    return inputs
@@ -0,0 +1,54 @@
+'''By Ray Bernard ray.bernard@outlook.com
+     MIT License '''
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from cidr.network_calculator import Network_Calculator
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Host enumeration speed against a plain memory copy.')
+    parser.add_argument('--network', default='10.0.0.0/8', help='the network to enumerate')
+    parser.add_argument('--chunk-size', type=int, default=65536, help='hosts per chunk')
+    parser.add_argument('--sample', type=int, default=1000000, help='hosts to sample')
+    args = parser.parse_args()
+
+    hosts = Network_Calculator(args.network).hosts()
+    total = hosts.num_hosts()
+    print("{:<28} {:>12} {:>10} {:>12}".format('Mode', 'Hosts', 'Seconds', 'GB/s'))
+
+    start = time.perf_counter()
+    for chunk in hosts.chunks(args.chunk_size, as_array=True):
+        pass
+    elapsed = time.perf_counter() - start
+    print("{:<28} {:>12,} {:>10.3f} {:>12.2f}".format('chunks(as_array=True)', total, elapsed, 4 * total / elapsed / 1e9))
+
+    # The same bytes written by a plain copy, as the memory bandwidth reference
+    block = np.zeros(args.chunk_size, dtype=np.uint32)
+    start = time.perf_counter()
+    for _ in range(0, total, args.chunk_size):
+        block.copy()
+    elapsed = time.perf_counter() - start
+    print("{:<28} {:>12,} {:>10.3f} {:>12.2f}".format('numpy copy, same chunks', total, elapsed, 4 * total / elapsed / 1e9))
+
+    start = time.perf_counter()
+    count = 0
+    for chunk in hosts[:10 * args.chunk_size].chunks(args.chunk_size):
+        count += len(chunk)
+    elapsed = time.perf_counter() - start
+    print("{:<28} {:>12,} {:>10.3f} {:>12}".format('chunks() as strings', count, elapsed, ''))
+
+    start = time.perf_counter()
+    hosts.sample(args.sample, seed=0, as_array=True)
+    elapsed = time.perf_counter() - start
+    print("{:<28} {:>12,} {:>10.3f} {:>12}".format('sample(as_array=True)', args.sample, elapsed, ''))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+'''By Ray Bernard ray.bernard@outlook.com
+     MIT License '''
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from generators import bandwidth_inputs, cidr_list
+from cidr.report import stream_to_csv
+from feeds.bulk import process_inventory
+from netcalc.incremental import update_bandwidth_report, update_network_report
+
+
+def _write_lines(filename, lines):
+    with open(filename, 'w') as file:
+        file.write('\n'.join(lines) + '\n')
+
+
+def _timed(function, *args, **kwargs):
+    start = time.perf_counter()
+    function(*args, **kwargs)
+    return time.perf_counter() - start
+
+
+def _full_network(source, output):
+    with open(source) as file:
+        stream_to_csv(file, output, batch=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Full rebuild against incremental update of a report.')
+    parser.add_argument('--rows', type=int, default=1000000, help='input rows')
+    parser.add_argument('--changed', type=float, default=1.0, help='percent of rows edited between runs')
+    parser.add_argument('--seed', type=int, default=0, help='random seed')
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    edits = max(1, int(args.rows * args.changed / 100))
+    cidrs = cidr_list(args.rows, seed=args.seed)
+    inventory = [f"{throughput},{read_ratio},{write_ratio},{size}"
+                 for throughput, read_ratio, write_ratio, size in bandwidth_inputs(args.rows, seed=args.seed)]
+    replacements = {
+        'network': cidr_list(edits, 'enterprise', seed=args.seed + 1),
+        'bandwidth': [f"{throughput},{read_ratio},{write_ratio},{size}"
+                      for throughput, read_ratio, write_ratio, size in bandwidth_inputs(edits, seed=args.seed + 1)],
+    }
+
+    print("{:<12} {:>14} {:>16} {:>18} {:>10}".format('Report', 'Full rebuild', 'Unchanged input',
+                                                        f"{args.changed:g}% edited", 'Speedup'))
+    with tempfile.TemporaryDirectory() as scratch:
+        source = os.path.join(scratch, 'input')
+        output = os.path.join(scratch, 'report.csv')
+        full_output = os.path.join(scratch, 'full.csv')
+        for name, lines, full, update in [
+                ('network', cidrs, lambda: _full_network(source, full_output),
+                 lambda: update_network_report(source, output, batch=True)),
+                ('bandwidth', inventory, lambda: process_inventory(source, full_output),
+                 lambda: update_bandwidth_report(source, output))]:
+            _write_lines(source, lines)
+            update()
+            unchanged = _timed(update)
+
+            lines = list(lines)
+            for index, line in zip(rng.sample(range(len(lines)), edits), replacements[name]):
+                lines[index] = line
+            _write_lines(source, lines)
+            full_seconds = _timed(full)
+            incremental = _timed(update)
+            print("{:<12} {:>12.2f} s {:>14.3f} s {:>16.2f} s {:>9.1f}x".format(
+                name, full_seconds, unchanged, incremental, full_seconds / incremental))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+'''By Ray Bernard ray.bernard@outlook.com
+     MIT License '''
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from cidr.parallel import write_to_csv_parallel
+from cidr.report import stream_to_csv
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Network report throughput by worker count.')
+    parser.add_argument('--count', type=int, default=2000000, help='number of CIDR lines')
+    parser.add_argument('--shard-bytes', type=int, default=8 << 20, help='shard size in bytes')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8], help='worker counts to try')
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, 'cidrs.txt')
+        output = os.path.join(tmp, 'network.csv')
+        with open(source, 'w') as file:
+            for _ in range(args.count):
+                file.write(f"{rng.randrange(1, 224)}.{rng.randrange(256)}.{rng.randrange(256)}.{rng.randrange(256)}/{rng.randrange(8, 31)}\n")
+
+        print("{:<20} {:>12} {:>15}".format('Mode', 'Seconds', 'Rows/s'))
+        start = time.perf_counter()
+        with open(source) as file:
+            stream_to_csv(file, output)
+        elapsed = time.perf_counter() - start
+        print("{:<20} {:>12.3f} {:>15,.0f}".format('stream_to_csv', elapsed, args.count / elapsed))
+
+        for workers in args.workers:
+            start = time.perf_counter()
+            write_to_csv_parallel(source, output, workers=workers, shard_bytes=args.shard_bytes)
+            elapsed = time.perf_counter() - start
+            print("{:<20} {:>12.3f} {:>15,.0f}".format(f'{workers} worker(s)', elapsed, args.count / elapsed))
+
+
+if __name__ == '__main__':
+    main()
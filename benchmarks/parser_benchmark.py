@@ -0,0 +1,59 @@
+'''By Ray Bernard ray.bernard@outlook.com
+     MIT License '''
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from cidr import parser
+from cidr.network_calculator import Network_Calculator
+
+
+def random_text(count, seed=0):
+    """
+    Generates a newline-separated buffer of random CIDRs.
+    """
+    rng = random.Random(seed)
+    return ''.join(f"{rng.randrange(1, 224)}.{rng.randrange(256)}.{rng.randrange(256)}.{rng.randrange(256)}/{rng.randrange(8, 33)}\n"
+                   for _ in range(count)).encode()
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Measure bulk CIDR parse throughput.')
+    arg_parser.add_argument('--count', type=int, default=2000000, help='number of CIDR lines')
+    args = arg_parser.parse_args()
+
+    data = random_text(args.count)
+    lines = data.decode().splitlines()
+
+    print("{:<30} {:>12} {:>15}".format('Path', 'Seconds', 'Lines/s'))
+    start = time.perf_counter()
+    parser.parse_cidrs(data)
+    elapsed = time.perf_counter() - start
+    print("{:<30} {:>12.3f} {:>15,.0f}".format('parse_cidrs (bytes)', elapsed, args.count / elapsed))
+
+    start = time.perf_counter()
+    parser.parse_cidrs(lines)
+    elapsed = time.perf_counter() - start
+    print("{:<30} {:>12.3f} {:>15,.0f}".format('parse_cidrs (list)', elapsed, args.count / elapsed))
+
+    numpy, parser.np = parser.np, None
+    start = time.perf_counter()
+    parser.parse_cidrs(data)
+    elapsed = time.perf_counter() - start
+    parser.np = numpy
+    print("{:<30} {:>12.3f} {:>15,.0f}".format('parse_cidrs (no NumPy)', elapsed, args.count / elapsed))
+
+    sample = lines[:min(len(lines), 200000)]
+    start = time.perf_counter()
+    for ip_cidr in sample:
+        Network_Calculator(ip_cidr)
+    elapsed = time.perf_counter() - start
+    print("{:<30} {:>12.3f} {:>15,.0f}".format('Network_Calculator', elapsed, len(sample) / elapsed))
+
+
+if __name__ == '__main__':
+    main()
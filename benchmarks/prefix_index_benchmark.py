@@ -0,0 +1,67 @@
+'''By Ray Bernard ray.bernard@outlook.com
+     MIT License '''
+import argparse
+import os
+import random
+import sys
+import time
+from ipaddress import IPv4Address, IPv4Network
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import numpy as np
+from cidr.prefix_index import PrefixIndex
+
+
+def random_routes(count, seed=0):
+    """
+    Generates a route table with a BGP-like prefix length mix.
+    """
+    rng = random.Random(seed)
+    lengths = [8, 12, 16, 19, 20, 21, 22, 23, 24, 24, 24, 24, 24]
+    return [f"{rng.randrange(1, 224)}.{rng.randrange(256)}.{rng.randrange(256)}.0/{rng.choice(lengths)}"
+            for _ in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Longest-prefix-match throughput against a linear scan.')
+    parser.add_argument('--routes', type=int, default=100000, help='number of prefixes in the table')
+    parser.add_argument('--lookups', type=int, default=1000000, help='number of addresses to look up')
+    parser.add_argument('--naive-routes', type=int, default=2000, help='table size for the linear scan')
+    args = parser.parse_args()
+
+    routes = random_routes(args.routes)
+    addresses = np.random.default_rng(0).integers(0x01000000, 0xE0000000, size=args.lookups, dtype=np.uint32)
+
+    start = time.perf_counter()
+    index = PrefixIndex(routes)
+    print(f"Built index of {len(index):,} prefixes in {time.perf_counter() - start:.3f} s")
+
+    print("{:<34} {:>12} {:>15}".format('Method', 'Lookups', 'Lookups/s'))
+    start = time.perf_counter()
+    index.lookup_many(addresses)
+    elapsed = time.perf_counter() - start
+    print("{:<34} {:>12,} {:>15,.0f}".format('PrefixIndex.lookup_many', args.lookups, args.lookups / elapsed))
+
+    sample = addresses[:100000].tolist()
+    start = time.perf_counter()
+    for address in sample:
+        index.lookup(address)
+    elapsed = time.perf_counter() - start
+    print("{:<34} {:>12,} {:>15,.0f}".format('PrefixIndex.lookup', len(sample), len(sample) / elapsed))
+
+    # The linear scan is far too slow for the full table, so it gets a smaller one
+    networks = [IPv4Network(ip_cidr, strict=False) for ip_cidr in routes[:args.naive_routes]]
+    sample = [IPv4Address(address) for address in addresses[:200].tolist()]
+    start = time.perf_counter()
+    for address in sample:
+        best = None
+        for network in networks:
+            if address in network and (best is None or network.prefixlen > best.prefixlen):
+                best = network
+    elapsed = time.perf_counter() - start
+    print("{:<34} {:>12,} {:>15,.0f}".format(f'Linear scan ({len(networks):,} prefixes)', len(sample), len(sample) / elapsed))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+'''By Ray Bernard ray.bernard@outlook.com
+     MIT License '''
+import argparse
+import os
+import sys
+import time
+from ipaddress import IPv4Address, summarize_address_range
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import numpy as np
+from cidr.aggregate import range_to_cidrs
+from cidr.ranges import ranges_to_blocks, ranges_to_cidrs
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Bulk IP range to CIDR conversion against per-range loops.')
+    parser.add_argument('--ranges', type=int, default=200000, help='number of address ranges')
+    parser.add_argument('--max-length', type=int, default=1 << 24, help='largest range length in addresses')
+    parser.add_argument('--stdlib-ranges', type=int, default=20000, help='ranges given to summarize_address_range')
+    args = parser.parse_args()
+
+    # Random starts and lengths split into many blocks each, the worst case for the per-range loops
+    rng = np.random.default_rng(0)
+    starts = rng.integers(0, 1 << 32, args.ranges)
+    ends = np.minimum(starts + rng.integers(0, args.max_length, args.ranges), 0xFFFFFFFF)
+    start_list, end_list = starts.tolist(), ends.tolist()
+
+    print("{:<34} {:>14} {:>15}".format('Method', 'Ranges', 'Ranges/s'))
+
+    def report(name, count, function):
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        print("{:<34} {:>14,} {:>15,.0f}".format(name, count, count / elapsed))
+        return result
+
+    networks, _, _ = report('ranges_to_blocks', args.ranges, lambda: ranges_to_blocks(starts, ends))
+    report('ranges_to_cidrs', args.ranges, lambda: ranges_to_cidrs(starts, ends))
+    report('range_to_cidrs loop, tuples', args.ranges,
+           lambda: [block for first, last in zip(start_list, end_list) for block in range_to_cidrs(first, last)])
+    count = min(args.stdlib_ranges, args.ranges)
+    report('summarize_address_range loop', count,
+           lambda: [network for first, last in zip(start_list[:count], end_list[:count])
+                    for network in summarize_address_range(IPv4Address(first), IPv4Address(last))])
+    print(f"{networks.size:,} blocks, {networks.size / args.ranges:.1f} per range")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+'''By Ray Bernard ray.bernard@outlook.com
+     MIT License '''
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+def make_body(endpoint, cidrs_per_request, rng):
+    if endpoint == 'bandwidth':
+        payload = {'media_throughput': f"{rng.choice([1, 10, 40, 100])} Gbps", 'read_ratio': 50,
+                   'write_ratio': 50, 'initial_data_size': f"{rng.randint(1, 100)} TB"}
+    else:
+        payload = {'cidrs': [f"10.{rng.randrange(256)}.{rng.randrange(256)}.0/{rng.randint(16, 30)}"
+                             for _ in range(cidrs_per_request)]}
+    return json.dumps(payload).encode()
+
+
+async def client(host, port, path, endpoint, requests, cidrs_per_request, latencies, seed):
+    """
+    Sends requests one after another on a single keep-alive connection.
+    """
+    rng = random.Random(seed)
+    if path:
+        reader, writer = await asyncio.open_unix_connection(path)
+    else:
+        reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for _ in range(requests):
+            body = make_body(endpoint, cidrs_per_request, rng)
+            start = time.perf_counter()
+            writer.write(f"POST /{endpoint} HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+                         f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+            head = await reader.readuntil(b'\r\n\r\n')
+            length = int(head.split(b'Content-Length: ', 1)[1].split(b'\r\n', 1)[0])
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - start)
+            if not head.startswith(b'HTTP/1.1 200'):
+                raise RuntimeError(head.decode())
+    finally:
+        writer.close()
+
+
+async def run(args):
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(client(args.host, args.port, args.unix, args.endpoint, args.requests,
+                                  args.cidrs, latencies, seed) for seed in range(args.connections)))
+    elapsed = time.perf_counter() - start
+    return latencies, elapsed
+
+
+def wait_for_server(host, port, path, server=None, timeout=10):
+    async def probe():
+        if path:
+            _, writer = await asyncio.open_unix_connection(path)
+        else:
+            _, writer = await asyncio.open_connection(host, port)
+        writer.close()
+
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            asyncio.run(probe())
+            return
+        except OSError:
+            if server is not None and server.poll() is not None:
+                raise RuntimeError('The service exited before accepting connections')
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.05)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load generator for the netcalc service.')
+    parser.add_argument('--host', default='127.0.0.1', help='the service address')
+    parser.add_argument('--port', type=int, default=8089, help='the service TCP port')
+    parser.add_argument('--unix', help='connect to this Unix socket instead of TCP')
+    parser.add_argument('--endpoint', choices=['network', 'bandwidth'], default='network', help='the endpoint to load')
+    parser.add_argument('--connections', type=int, default=64, help='concurrent keep-alive connections')
+    parser.add_argument('--requests', type=int, default=200, help='requests per connection')
+    parser.add_argument('--cidrs', type=int, default=1, help='CIDRs per network request')
+    parser.add_argument('--external', action='store_true', help='load a service that is already running')
+    args = parser.parse_args()
+
+    server = None
+    if not args.external:
+        command = [sys.executable, '-m', 'netcalc.service', '--host', args.host, '--port', str(args.port)]
+        if args.unix:
+            command += ['--unix', args.unix]
+        server = subprocess.Popen(command, env=dict(os.environ, PYTHONPATH=SRC))
+    try:
+        wait_for_server(args.host, args.port, args.unix, server)
+        latencies, elapsed = asyncio.run(run(args))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    print(f"{len(latencies):,} requests over {args.connections} connections in {elapsed:.2f} s")
+    print("{:<12} {:>12}".format('Metric', 'Value'))
+    print("{:<12} {:>12,.0f}".format('Requests/s', len(latencies) / elapsed))
+    if args.endpoint == 'network':
+        print("{:<12} {:>12,.0f}".format('CIDRs/s', len(latencies) * args.cidrs / elapsed))
+    print("{:<12} {:>12.2f}".format('p50 ms', 1000 * percentile(latencies, 0.50)))
+    print("{:<12} {:>12.2f}".format('p99 ms', 1000 * percentile(latencies, 0.99)))
+
+
+if __name__ == '__main__':
+    main()
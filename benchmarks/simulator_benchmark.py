@@ -0,0 +1,38 @@
+'''By Ray Bernard ray.bernard@outlook.com
+     MIT License '''
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from feeds.simulator import simulate
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Nightly feeds sharing a few links, simulated with fair sharing.')
+    parser.add_argument('--transfers', type=int, default=100000, help='number of transfers')
+    parser.add_argument('--links', type=int, default=8, help='number of links')
+    parser.add_argument('--window', type=float, default=8, help='hours over which transfers start')
+    parser.add_argument('--seed', type=int, default=0, help='random seed')
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    links = {f"link{i}": rng.choice(['10 Gbps', '40 Gbps', '100 Gbps']) for i in range(args.links)}
+    names = list(links)
+    sizes = ['1 GB', '10 GB', '50 GB', '200 GB', '1 TB']
+    transfers = [(rng.choice(sizes), rng.choice([20, 50, 80]), rng.uniform(0, args.window * 3600), rng.choice(names))
+                 for _ in range(args.transfers)]
+
+    start = time.perf_counter()
+    result = simulate(transfers, links)
+    elapsed = time.perf_counter() - start
+    print(result.summary())
+    print(f"\nSimulated {len(result):,} transfers on {len(links)} links in {elapsed:.2f} s "
+          f"({len(result) / elapsed:,.0f} transfers/s); the last one completed after {result.makespan() / 3600:,.1f} hours")
+
+
+if __name__ == '__main__':
+    main()
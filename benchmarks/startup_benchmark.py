@@ -0,0 +1,58 @@
+'''By Ray Bernard ray.bernard@outlook.com
+     MIT License '''
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+
+# What the installed console script runs; python -m netcalc also pays for runpy
+NETCALC = ['-c', 'import sys; from netcalc.cli import main; sys.exit(main())']
+
+COMMANDS = [
+    ('python -c pass', ['-c', 'pass'], b''),
+    ('netcalc --help', NETCALC + ['--help'], b''),
+    ('netcalc network (1 CIDR)', NETCALC + ['network'], b'10.0.0.0/8\n'),
+    ('netcalc network --batch', NETCALC + ['network', '--batch'], b'10.0.0.0/8\n'),
+    ('netcalc bandwidth', NETCALC + ['bandwidth', '-t', '1 Gbps', '-s', '1 TB'], b''),
+]
+
+
+def time_command(arguments, stdin, runs):
+    """
+    Returns the wall times in seconds of running the interpreter with the given arguments.
+    """
+    env = dict(os.environ, PYTHONPATH=SRC)
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable] + arguments, input=stdin, stdout=subprocess.DEVNULL, env=env, check=True)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure netcalc command startup time.')
+    parser.add_argument('--runs', type=int, default=20, help='runs per command')
+    parser.add_argument('--target', type=float, default=50.0, help='startup target in milliseconds')
+    args = parser.parse_args()
+
+    # The bare interpreter start is shown too, since slow machines pay it on every command
+    print("{:<28} {:>10} {:>10} {:>12} {:>8}".format('Command', 'Min ms', 'Median ms', 'Over python', 'Target'))
+    baseline = None
+    for label, arguments, stdin in COMMANDS:
+        timings = time_command(arguments, stdin, args.runs)
+        median = 1000 * statistics.median(timings)
+        if baseline is None:
+            baseline = median
+        # The batch mode loads NumPy on purpose, so it is not held to the target
+        verdict = '' if label == 'python -c pass' or '--batch' in arguments else ('ok' if median <= args.target else 'SLOW')
+        print("{:<28} {:>10.1f} {:>10.1f} {:>12.1f} {:>8}".format(
+            label, 1000 * min(timings), median, median - baseline, verdict))
+
+
+if __name__ == '__main__':
+    main()
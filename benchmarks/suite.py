@@ -0,0 +1,305 @@
+'''By Ray Bernard ray.bernard@outlook.com
+     MIT License '''
+import argparse
+import contextlib
+import datetime
+import gc
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCHMARKS, '..', 'src'))
+sys.path.insert(0, BENCHMARKS)
+
+from generators import bandwidth_inputs, cidr_list
+
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+# The columns most consumers read, for the projected report cases
+PROJECTED_COLUMNS = ['Network ID', 'Total IPs']
+ALL_SIZES = [1000, 10000, 100000, 1000000, 10000000]
+
+
+def _network_construct(ip_list, _):
+    from cidr.network_calculator import Network_Calculator
+    for ip_cidr in ip_list:
+        Network_Calculator(ip_cidr)
+
+
+def _network_getters(ip_list, _):
+    from cidr.network_calculator import Network_Calculator
+    for ip_cidr in ip_list:
+        net_calc = Network_Calculator(ip_cidr)
+        net_calc.get_subnet_mask()
+        net_calc.get_network_id()
+        net_calc.get_next_network()
+        net_calc.get_broadcast_id()
+        net_calc.get_first_ip()
+        net_calc.get_last_ip()
+        net_calc.get_total_ips()
+
+
+def _network_print(ip_list, _):
+    from cidr.network_calculator import Network_Calculator
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        Network_Calculator.print_network_info(ip_list)
+
+
+def _network_csv(ip_list, filename):
+    from cidr.network_calculator import Network_Calculator
+    Network_Calculator.write_to_csv(ip_list, filename)
+
+
+def _network_csv_batch(ip_list, filename):
+    from cidr.network_calculator import Network_Calculator
+    Network_Calculator.write_to_csv(ip_list, filename, batch=True)
+
+
+def _network_csv_projected(ip_list, filename):
+    from cidr.network_calculator import Network_Calculator
+    Network_Calculator.write_to_csv(ip_list, filename, columns=PROJECTED_COLUMNS)
+
+
+def _network_csv_batch_projected(ip_list, filename):
+    from cidr.network_calculator import Network_Calculator
+    Network_Calculator.write_to_csv(ip_list, filename, batch=True, columns=PROJECTED_COLUMNS)
+
+
+def _bandwidth_calculate(inputs, _):
+    from feeds.bandwidth_calculator import BandwidthCalculator
+    for arguments in inputs:
+        BandwidthCalculator(*arguments).calculate()
+
+
+def _bandwidth_csv(inputs, filename):
+    from feeds.bandwidth_calculator import BandwidthCalculator
+    for arguments in inputs:
+        BandwidthCalculator(*arguments).write_to_csv(filename)
+
+
+def _bandwidth_bulk(inputs, filename):
+    from feeds.bulk import process_inventory
+    lines = (f"{throughput},{read_ratio},{write_ratio},{size}\n" for throughput, read_ratio, write_ratio, size in inputs)
+    process_inventory(lines, filename)
+
+
+# name: (function, input generator, largest size worth running)
+CASES = {
+    'network.construct': (_network_construct, cidr_list, None),
+    'network.getters': (_network_getters, cidr_list, None),
+    'network.print_network_info': (_network_print, cidr_list, None),
+    'network.write_to_csv': (_network_csv, cidr_list, None),
+    'network.write_to_csv_batch': (_network_csv_batch, cidr_list, None),
+    'network.write_to_csv_projected': (_network_csv_projected, cidr_list, None),
+    'network.write_to_csv_batch_projected': (_network_csv_batch_projected, cidr_list, None),
+    'bandwidth.calculate': (_bandwidth_calculate, bandwidth_inputs, None),
+    # Every call opens and rewrites the file, so this one is mostly file system cost
+    'bandwidth.write_to_csv': (_bandwidth_csv, bandwidth_inputs, 100000),
+    'bandwidth.bulk': (_bandwidth_bulk, bandwidth_inputs, None),
+}
+
+
+def _max_rss_bytes():
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == 'darwin' else rss * 1024
+
+
+def run_case(name, size, repeat=3, distribution='bgp', seed=0):
+    """
+    Runs one benchmark case in this process.
+
+    The inputs are generated and the case is warmed up on a few rows before
+    the clock starts. Peak memory is how far the process high-water mark
+    rose during the first run, so cases must run in a fresh process to be
+    comparable.
+
+    Parameters:
+        name (str): The case name, a key of CASES.
+        size (int): The number of rows.
+        repeat (int): The number of timed runs; the fastest is kept.
+        distribution (str): The prefix length mix for network cases.
+        seed (int): The input random seed.
+
+    Returns:
+        dict: case, size, seconds, rows_per_second and peak_bytes.
+    """
+    function, generator, _ = CASES[name]
+    inputs = generator(size, distribution, seed) if generator is cidr_list else generator(size, seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        filename = os.path.join(tmp, 'output.csv')
+        # Warm up so imports and first-call setup are not timed
+        function(inputs[:100], filename)
+        timings = []
+        peak = 0
+        for attempt in range(repeat):
+            gc.collect()
+            before = _max_rss_bytes()
+            start = time.perf_counter()
+            function(inputs, filename)
+            timings.append(time.perf_counter() - start)
+            if attempt == 0:
+                peak = _max_rss_bytes() - before
+    seconds = min(timings)
+    return {'case': name, 'size': size, 'seconds': seconds, 'rows_per_second': size / seconds, 'peak_bytes': peak}
+
+
+def run_isolated(name, size, repeat, distribution, seed):
+    """
+    Runs one benchmark case in a fresh interpreter and returns its result.
+    """
+    output = subprocess.run([sys.executable, os.path.abspath(__file__), 'case', name, str(size),
+                             '--repeat', str(repeat), '--distribution', distribution, '--seed', str(seed)],
+                            check=True, stdout=subprocess.PIPE, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def _numpy_version():
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy.__version__
+
+
+def run_suite(sizes, cases=None, repeat=3, distribution='bgp', seed=0, progress=None):
+    """
+    Runs the benchmark cases over a range of input sizes.
+
+    Parameters:
+        sizes (list): The row counts to run, for example 1e3 to 1e7.
+        cases (list): The case names. None runs them all.
+        repeat (int): Timed runs per case and size; large sizes run once.
+        distribution (str): The prefix length mix for network cases.
+        seed (int): The input random seed.
+        progress (callable): Called with each result as it arrives.
+
+    Returns:
+        dict: Run metadata and the list of results, ready for json.dump.
+    """
+    results = []
+    for name in cases or list(CASES):
+        if name.startswith('network.write_to_csv_batch') and _numpy_version() is None:
+            continue
+        for size in sizes:
+            max_size = CASES[name][2]
+            if max_size is not None and size > max_size:
+                continue
+            result = run_isolated(name, size, repeat if size < 1000000 else 1, distribution, seed)
+            results.append(result)
+            if progress is not None:
+                progress(result)
+    return {
+        'meta': {
+            'created': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'numpy': _numpy_version(),
+            'distribution': distribution,
+            'seed': seed,
+        },
+        'results': results,
+    }
+
+
+def compare(baseline, current, throughput_threshold=0.10, memory_threshold=0.20, memory_floor=1 << 20):
+    """
+    Compares two suite results and lists the regressions.
+
+    Parameters:
+        baseline (dict): The reference results.
+        current (dict): The new results.
+        throughput_threshold (float): The largest allowed fractional drop in rows per second.
+        memory_threshold (float): The largest allowed fractional rise in peak memory.
+        memory_floor (int): Peak memory rises smaller than this many bytes are ignored as noise.
+
+    Returns:
+        tuple: A list of report lines and a list of regression lines.
+    """
+    reference = {(result['case'], result['size']): result for result in baseline['results']}
+    lines = []
+    regressions = []
+    for result in current['results']:
+        old = reference.get((result['case'], result['size']))
+        if old is None:
+            continue
+        speed = result['rows_per_second'] / old['rows_per_second'] - 1
+        memory_rise = result['peak_bytes'] - old['peak_bytes']
+        memory = memory_rise / old['peak_bytes'] if old['peak_bytes'] else 0.0
+        line = "{:<38} {:>10,} {:>+10.1%} {:>+10.1%}".format(result['case'], result['size'], speed, memory)
+        lines.append(line)
+        if speed < -throughput_threshold:
+            regressions.append(f"{line}   throughput")
+        if memory_rise > memory_floor and (not old['peak_bytes'] or memory > memory_threshold):
+            regressions.append(f"{line}   peak memory")
+    return lines, regressions
+
+
+def _print_result(result):
+    print("{:<38} {:>10,} {:>10.3f} {:>15,.0f} {:>12,.1f}".format(
+        result['case'], result['size'], result['seconds'], result['rows_per_second'], result['peak_bytes'] / (1 << 20)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark suite for the network and bandwidth calculators.')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run = commands.add_parser('run', help='run the suite and write JSON results')
+    run.add_argument('--sizes', type=lambda text: [int(float(size)) for size in text.split(',')],
+                     default=DEFAULT_SIZES, help='comma-separated row counts, e.g. 1e3,1e4,1e5,1e6,1e7')
+    run.add_argument('--all-sizes', action='store_true', help='run every size from 1e3 to 1e7')
+    run.add_argument('--cases', help='comma-separated case names; defaults to all')
+    run.add_argument('--repeat', type=int, default=3, help='timed runs per case below 1e6 rows')
+    run.add_argument('--distribution', default='bgp', help='prefix length mix: bgp, enterprise or uniform')
+    run.add_argument('--seed', type=int, default=0, help='input random seed')
+    run.add_argument('--output', default='benchmark_results.json', help='the JSON file to write')
+
+    cmp = commands.add_parser('compare', help='fail when results regress against a baseline')
+    cmp.add_argument('baseline', help='the reference JSON results')
+    cmp.add_argument('current', help='the new JSON results')
+    cmp.add_argument('--throughput-threshold', type=float, default=0.10, help='allowed fractional throughput drop')
+    cmp.add_argument('--memory-threshold', type=float, default=0.20, help='allowed fractional peak memory rise')
+
+    case = commands.add_parser('case', help='run one case in this process and print its JSON result')
+    case.add_argument('name', choices=sorted(CASES))
+    case.add_argument('size', type=int)
+    case.add_argument('--repeat', type=int, default=3)
+    case.add_argument('--distribution', default='bgp')
+    case.add_argument('--seed', type=int, default=0)
+
+    commands.add_parser('list', help='list the case names')
+    args = parser.parse_args()
+
+    if args.command == 'list':
+        print('\n'.join(CASES))
+    elif args.command == 'case':
+        print(json.dumps(run_case(args.name, args.size, args.repeat, args.distribution, args.seed)))
+    elif args.command == 'run':
+        print("{:<38} {:>10} {:>10} {:>15} {:>12}".format('Case', 'Rows', 'Seconds', 'Rows/s', 'Peak MiB'))
+        report = run_suite(ALL_SIZES if args.all_sizes else args.sizes, args.cases.split(',') if args.cases else None,
+                           args.repeat, args.distribution, args.seed, _print_result)
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2)
+        print(f"Wrote {len(report['results'])} results to {args.output}")
+    else:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        with open(args.current) as file:
+            current = json.load(file)
+        lines, regressions = compare(baseline, current, args.throughput_threshold, args.memory_threshold)
+        print("{:<38} {:>10} {:>10} {:>10}".format('Case', 'Rows', 'Speed', 'Memory'))
+        print('\n'.join(lines))
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) past the thresholds:")
+            print('\n'.join(regressions))
+            sys.exit(1)
+        print("\nNo regressions.")
+
+
+if __name__ == '__main__':
+    main()
@@ -7,6 +7,12 @@ setup(
     author_email='ray.bernard@outlook.com',
     description='A network calculator package',
     packages=find_packages(),
+    extras_require={
+        'numpy': ['numpy'],
+    },
+    entry_points={
+        'console_scripts': ['netcalc = netcalc.cli:main'],
+    },
     classifiers=[
         'Development Status :: 3 - Alpha',
         'Intended Audience :: Developers',
@@ -0,0 +1,201 @@
+'''By Ray Bernard ray.bernard@outlook.com
+     MIT License '''
+import csv
+import numpy as np
+
+from .parser import parse_cidrs
+from .ranges import ranges_to_cidrs
+from .report import HEADERS, compute_rows, stream_to_csv
+
+
+OVERLAP_HEADERS = HEADERS + ['Overlap', 'Covered By']
+
+
+def _masks(prefixes):
+    return (np.int64(0x100000000) - np.left_shift(np.int64(1), 32 - prefixes.astype(np.int64))).astype(np.int64)
+
+
+def parse_networks(ip_list):
+    """
+    Parses CIDRs into network integers and prefix lengths, host bits cleared.
+
+    Parameters:
+        ip_list (list): A list of IP addresses with CIDR notation.
+
+    Returns:
+        tuple: int64 network and prefix length arrays, in input order.
+    """
+    parsed = parse_cidrs(ip_list)
+    parsed.raise_for_errors()
+    prefixes = np.frombuffer(parsed.prefixes, dtype=np.uint8).astype(np.int64)
+    networks = np.frombuffer(parsed.addresses, dtype=np.uint32).astype(np.int64) & _masks(prefixes)
+    return networks, prefixes
+
+
+def cidr_intervals(ip_list):
+    """
+    Converts CIDRs to inclusive (start, end) address intervals.
+
+    Parameters:
+        ip_list (list): A list of IP addresses with CIDR notation.
+
+    Returns:
+        tuple: int64 start and end arrays, in input order.
+    """
+    networks, prefixes = parse_networks(ip_list)
+    return networks, networks + np.left_shift(np.int64(1), 32 - prefixes) - 1
+
+
+def merge_intervals(starts, ends):
+    """
+    Merges overlapping and adjacent inclusive intervals in O(n log n).
+
+    Parameters:
+        starts (array-like): Interval start addresses.
+        ends (array-like): Interval end addresses, inclusive.
+
+    Returns:
+        tuple: Sorted, disjoint, non-adjacent int64 start and end arrays.
+    """
+    starts = np.asarray(starts, dtype=np.int64)
+    ends = np.asarray(ends, dtype=np.int64)
+    if not starts.size:
+        return starts, ends
+    order = np.argsort(starts, kind='stable')
+    starts, ends = starts[order], ends[order]
+
+    # An interval opens a new group when it starts past everything seen so far
+    reach = np.maximum.accumulate(ends)
+    opens = np.empty(starts.size, dtype=bool)
+    opens[0] = True
+    opens[1:] = starts[1:] > reach[:-1] + 1
+    group_starts = np.flatnonzero(opens)
+    group_ends = np.concatenate((group_starts[1:], [starts.size])) - 1
+    return starts[group_starts], reach[group_ends]
+
+
+def range_to_cidrs(start, end):
+    """
+    Splits an inclusive address range into the fewest CIDR blocks that cover it exactly.
+
+    Parameters:
+        start (int): The first address of the range.
+        end (int): The last address of the range.
+
+    Returns:
+        list: (network int, prefix length) tuples in address order.
+    """
+    blocks = []
+    while start <= end:
+        # Largest aligned block at start that does not run past end
+        size = start & -start if start else 1 << 32
+        while size > end - start + 1:
+            size >>= 1
+        blocks.append((start, 33 - size.bit_length()))
+        start += size
+    return blocks
+
+
+def aggregate(ip_list):
+    """
+    Collapses CIDRs into the minimal set of CIDRs covering the same addresses.
+
+    Contained and duplicate prefixes are dropped and adjacent ones are merged,
+    like ipaddress.collapse_addresses but over integer arrays.
+
+    Parameters:
+        ip_list (list): A list of IP addresses with CIDR notation.
+
+    Returns:
+        list: The summarized CIDR strings, in address order.
+    """
+    return ranges_to_cidrs(*merge_intervals(*cidr_intervals(ip_list)))
+
+
+def find_overlaps(ip_list):
+    """
+    Finds CIDRs that duplicate or fall inside another CIDR of the list.
+
+    CIDR blocks never partially overlap, so every overlap is a duplicate or a
+    containment. Each affected CIDR is reported once, against the most
+    specific other CIDR covering it.
+
+    Parameters:
+        ip_list (list): A list of IP addresses with CIDR notation.
+
+    Returns:
+        list: (index, relation, covering index) tuples, where relation is
+        'duplicate' or 'contained' and the indexes point into ip_list.
+    """
+    ip_list = list(ip_list)
+    networks, prefixes = parse_networks(ip_list)
+    count = networks.size
+    covering = np.full(count, -1, dtype=np.int64)
+    duplicate = np.zeros(count, dtype=bool)
+    if not count:
+        return []
+
+    # Duplicates point at the first occurrence of the same network and prefix
+    keys = networks * 64 + prefixes
+    order = np.argsort(keys, kind='stable')
+    sorted_keys = keys[order]
+    repeats = np.empty(count, dtype=bool)
+    repeats[0] = False
+    repeats[1:] = sorted_keys[1:] == sorted_keys[:-1]
+    first_of_group = order[np.maximum.accumulate(np.where(repeats, 0, np.arange(count)))]
+    duplicate[order[repeats]] = True
+    covering[order[repeats]] = first_of_group[repeats]
+
+    # Containment: probe each shorter prefix length, most specific first
+    unique = order[~repeats]
+    for prefix_len in np.unique(prefixes)[::-1].tolist():
+        holders = unique[prefixes[unique] == prefix_len]
+        holder_networks = networks[holders]
+        pending = np.flatnonzero((covering < 0) & (prefixes > prefix_len))
+        if not pending.size:
+            continue
+        candidates = networks[pending] & _masks(np.array([prefix_len]))[0]
+        position = np.minimum(np.searchsorted(holder_networks, candidates), holder_networks.size - 1)
+        hit = holder_networks[position] == candidates
+        covering[pending[hit]] = holders[position[hit]]
+
+    found = np.flatnonzero(covering >= 0)
+    return [(index, 'duplicate' if duplicate[index] else 'contained', int(covering[index])) for index in found.tolist()]
+
+
+def write_aggregate_csv(ip_list, filename):
+    """
+    Writes the summarized CIDRs to a CSV file in the write_to_csv layout.
+
+    Parameters:
+        ip_list (list): A list of IP addresses with CIDR notation.
+        filename (str): The name of the CSV file to write to.
+
+    Returns:
+        int: The number of summarized CIDRs written.
+    """
+    return stream_to_csv(aggregate(ip_list), filename)
+
+
+def write_overlaps_csv(ip_list, filename):
+    """
+    Writes the overlap report to a CSV file.
+
+    Each row holds the write_to_csv columns for an overlapping CIDR, followed
+    by the kind of overlap and the CIDR covering it.
+
+    Parameters:
+        ip_list (list): A list of IP addresses with CIDR notation.
+        filename (str): The name of the CSV file to write to.
+
+    Returns:
+        int: The number of overlapping CIDRs written.
+    """
+    ip_list = list(ip_list)
+    overlaps = find_overlaps(ip_list)
+    rows = compute_rows([ip_list[index] for index, _, _ in overlaps])
+    with open(filename, 'w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(OVERLAP_HEADERS)
+        writer.writerows(row + [relation, ip_list[covering]] for row, (_, relation, covering) in zip(rows, overlaps))
+    return len(overlaps)
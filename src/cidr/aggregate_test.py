@@ -0,0 +1,54 @@
+'''By Ray Bernard ray.bernard@outlook.com
+     MIT License '''
+import csv
+import os
+import random
+import tempfile
+import unittest
+from ipaddress import IPv4Network, collapse_addresses, summarize_address_range, IPv4Address
+from cidr.aggregate import aggregate, find_overlaps, range_to_cidrs, write_aggregate_csv, write_overlaps_csv
+
+
+class TestAggregate(unittest.TestCase):
+    def test_aggregate_matches_collapse_addresses(self):
+        rng = random.Random(3)
+        ip_list = [f"10.{rng.randrange(4)}.{rng.randrange(256)}.{rng.randrange(256)}/{rng.randrange(14, 33)}"
+                   for _ in range(2000)]
+        expected = [str(network) for network in collapse_addresses(IPv4Network(ip_cidr, strict=False) for ip_cidr in ip_list)]
+        self.assertEqual(aggregate(ip_list), expected)
+
+    def test_adjacent_and_contained(self):
+        self.assertEqual(aggregate(['10.0.0.0/25', '10.0.0.128/25', '10.0.0.5/32', '10.0.1.0/24']), ['10.0.0.0/23'])
+        self.assertEqual(aggregate(['0.0.0.0/1', '128.0.0.0/1']), ['0.0.0.0/0'])
+        self.assertEqual(aggregate([]), [])
+
+    def test_range_to_cidrs(self):
+        for start, end in [(0, 0xFFFFFFFF), (1, 254), (0x0A000001, 0x0A0000FE), (5, 5)]:
+            expected = [(int(network.network_address), network.prefixlen)
+                        for network in summarize_address_range(IPv4Address(start), IPv4Address(end))]
+            self.assertEqual(range_to_cidrs(start, end), expected)
+
+    def test_find_overlaps(self):
+        ip_list = ['10.0.0.0/8', '10.1.0.0/16', '192.168.0.0/24', '10.1.2.3/32', '10.0.0.0/8', '172.16.0.0/12']
+        self.assertEqual(find_overlaps(ip_list), [(1, 'contained', 0), (3, 'contained', 1), (4, 'duplicate', 0)])
+
+    def test_write_csv(self):
+        ip_list = ['10.0.0.0/25', '10.0.0.128/25', '10.0.0.0/24 ']
+        with tempfile.TemporaryDirectory() as tmp:
+            summary = os.path.join(tmp, 'summary.csv')
+            overlaps = os.path.join(tmp, 'overlaps.csv')
+            self.assertEqual(write_aggregate_csv(ip_list, summary), 1)
+            self.assertEqual(write_overlaps_csv(ip_list, overlaps), 2)
+            with open(summary, newline='') as file:
+                rows = list(csv.reader(file))
+            self.assertEqual(rows[1], ['10.0.0.0/24', '255.255.255.0', '10.0.0.0', '10.0.1.0', '10.0.0.255',
+                                       '10.0.0.1', '10.0.0.254', '254'])
+            with open(overlaps, newline='') as file:
+                rows = list(csv.reader(file))
+            self.assertEqual(rows[0][-2:], ['Overlap', 'Covered By'])
+            self.assertEqual([row[0] for row in rows[1:]], ['10.0.0.0/25', '10.0.0.128/25'])
+            self.assertEqual(rows[1][-2:], ['contained', '10.0.0.0/24 '])
+
+
+if __name__ == '__main__':
+    unittest.main()
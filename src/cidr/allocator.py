@@ -0,0 +1,289 @@
+'''By Ray Bernard ray.bernard@outlook.com
+     MIT License '''
+from heapq import heapify, heappop, heappush
+from ipaddress import ip_address, ip_network
+import json
+
+from .network_calculator import _format_address
+from .parser import parse_cidr, parse_cidr6
+
+
+class SubnetAllocator:
+    """
+    A buddy-system allocator that carves subnets out of a parent network.
+
+    Free space is kept as one free list per prefix length. Allocating splits
+    the smallest free block that fits into buddies, and freeing merges a
+    block with its buddy for as long as the buddy is free too. Both walk at
+    most one free list per prefix length, so they stay O(log n) however many
+    subnets are live. Blocks are handed out lowest address first.
+    """
+
+    def __init__(self, parent):
+        """
+        Constructor of the SubnetAllocator class
+
+        Parameters:
+            parent (str): The IPv4 or IPv6 network to allocate from, with CIDR notation.
+
+        Returns:
+            None
+        """
+        self.parent = ip_network(parent.strip(), strict=False)
+        self._bits = self.parent.max_prefixlen
+        self._base = int(self.parent.network_address)
+        self._prefix = self.parent.prefixlen
+        self._version = self.parent.version
+
+        # Each free list is a set for membership and a heap for the lowest
+        # address; entries removed from the set are skipped when popped
+        self._free = [set() for _ in range(self._bits + 1)]
+        self._heaps = [[] for _ in range(self._bits + 1)]
+        self._allocated = {}
+        self._push(self._base, self._prefix)
+
+    def __len__(self):
+        return len(self._allocated)
+
+    def __contains__(self, ip_cidr):
+        network, prefix_len = self._parse(ip_cidr)
+        return self._allocated.get(network) == prefix_len
+
+    def _push(self, network, prefix_len):
+        self._free[prefix_len].add(network)
+        heap = self._heaps[prefix_len]
+        heappush(heap, network)
+        if len(heap) > 64 and len(heap) > 4 * len(self._free[prefix_len]):
+            heap[:] = self._free[prefix_len]
+            heapify(heap)
+
+    def _pop(self, prefix_len):
+        free = self._free[prefix_len]
+        heap = self._heaps[prefix_len]
+        while heap:
+            network = heappop(heap)
+            if network in free:
+                free.remove(network)
+                return network
+        return None
+
+    def _parse(self, ip_cidr):
+        network, prefix_len = parse_cidr6(ip_cidr) if self._version == 6 else parse_cidr(ip_cidr)
+        if network & ((1 << (self._bits - prefix_len)) - 1):
+            raise ValueError(f"{ip_cidr} has host bits set")
+        if prefix_len < self._prefix or network >> (self._bits - self._prefix) != self._base >> (self._bits - self._prefix):
+            raise ValueError(f"{ip_cidr} is not inside {self.parent}")
+        return network, prefix_len
+
+    def _format(self, network, prefix_len):
+        if self._version == 4:
+            return f"{_format_address(network)}/{prefix_len}"
+        return f"{ip_address(network)}/{prefix_len}"
+
+    def prefix_for_hosts(self, hosts):
+        """
+        Returns the longest prefix length whose network holds the given number of usable hosts.
+
+        Usable hosts are counted like Network_Calculator.get_total_ips.
+
+        Parameters:
+            hosts (int): The number of usable addresses needed.
+
+        Returns:
+            int: The prefix length.
+        """
+        if hosts < 1:
+            raise ValueError("At least one host is needed.")
+        bits = self._bits
+        for prefix_len in range(bits, -1, -1):
+            size = 1 << (bits - prefix_len)
+            if bits == 32:
+                usable = size - 2 if prefix_len < 31 else size
+            else:
+                usable = size - 1 if prefix_len < 127 else size
+            if usable >= hosts:
+                return prefix_len
+        raise ValueError(f"{hosts} hosts do not fit in any IPv{self._version} network.")
+
+    def allocate(self, prefix_len):
+        """
+        Allocates the lowest free subnet of the given prefix length.
+
+        Parameters:
+            prefix_len (int): The prefix length of the subnet.
+
+        Returns:
+            str: The allocated subnet with CIDR notation.
+        """
+        if not self._prefix <= prefix_len <= self._bits:
+            raise ValueError(f"/{prefix_len} cannot be allocated from {self.parent}")
+        for level in range(prefix_len, self._prefix - 1, -1):
+            network = self._pop(level)
+            if network is not None:
+                break
+        else:
+            raise ValueError(f"No free /{prefix_len} left in {self.parent}")
+
+        # Split down to the requested size, freeing the upper buddy at each level
+        for level in range(level + 1, prefix_len + 1):
+            self._push(network + (1 << (self._bits - level)), level)
+        self._allocated[network] = prefix_len
+        return self._format(network, prefix_len)
+
+    def allocate_hosts(self, hosts):
+        """
+        Allocates the smallest free subnet with at least the given number of usable hosts.
+
+        Parameters:
+            hosts (int): The number of usable addresses needed.
+
+        Returns:
+            str: The allocated subnet with CIDR notation.
+        """
+        return self.allocate(max(self.prefix_for_hosts(hosts), self._prefix))
+
+    def reserve(self, ip_cidr):
+        """
+        Allocates a specific subnet, for example one already in use elsewhere.
+
+        Parameters:
+            ip_cidr (str): The subnet with CIDR notation. Host bits must be clear.
+
+        Returns:
+            str: The reserved subnet with CIDR notation.
+        """
+        network, prefix_len = self._parse(ip_cidr)
+        bits = self._bits
+        for level in range(prefix_len, self._prefix - 1, -1):
+            block = network & ~((1 << (bits - level)) - 1)
+            if block in self._free[level]:
+                break
+        else:
+            raise ValueError(f"{ip_cidr} overlaps an allocated subnet")
+
+        # Split the free block around the reserved one
+        self._free[level].remove(block)
+        for level in range(level + 1, prefix_len + 1):
+            size = 1 << (bits - level)
+            half = network & ~(size - 1)
+            self._push(half ^ size, level)
+        self._allocated[network] = prefix_len
+        return self._format(network, prefix_len)
+
+    def free(self, ip_cidr):
+        """
+        Returns an allocated subnet to the free space, merging it with its free buddies.
+
+        Parameters:
+            ip_cidr (str): The allocated subnet with CIDR notation.
+
+        Returns:
+            None
+        """
+        network, prefix_len = self._parse(ip_cidr)
+        if self._allocated.get(network) != prefix_len:
+            raise ValueError(f"{ip_cidr} is not allocated")
+        del self._allocated[network]
+
+        bits = self._bits
+        while prefix_len > self._prefix:
+            buddy = network ^ (1 << (bits - prefix_len))
+            free = self._free[prefix_len]
+            if buddy not in free:
+                break
+            free.remove(buddy)
+            network &= ~(1 << (bits - prefix_len))
+            prefix_len -= 1
+        self._push(network, prefix_len)
+
+    def allocated(self):
+        """
+        Returns the allocated subnets.
+
+        Parameters:
+            None
+
+        Returns:
+            list: The subnets with CIDR notation, in address order.
+        """
+        return [self._format(network, self._allocated[network]) for network in sorted(self._allocated)]
+
+    def free_blocks(self):
+        """
+        Returns the free space as the largest aligned blocks.
+
+        Parameters:
+            None
+
+        Returns:
+            list: The free blocks with CIDR notation, in address order.
+        """
+        blocks = sorted((network, prefix_len) for prefix_len, free in enumerate(self._free) for network in free)
+        return [self._format(network, prefix_len) for network, prefix_len in blocks]
+
+    def available(self):
+        """
+        Returns the number of unallocated addresses in the parent network.
+
+        Parameters:
+            None
+
+        Returns:
+            int: The free address count.
+        """
+        return sum(len(free) << (self._bits - prefix_len) for prefix_len, free in enumerate(self._free))
+
+    def to_dict(self):
+        """
+        Returns the allocator state as plain data, ready for json.dump.
+
+        Parameters:
+            None
+
+        Returns:
+            dict: The parent network and the allocated subnets.
+        """
+        return {'parent': str(self.parent), 'allocated': self.allocated()}
+
+    @classmethod
+    def from_dict(cls, state):
+        """
+        Rebuilds an allocator from the output of to_dict.
+
+        Parameters:
+            state (dict): The parent network and the allocated subnets.
+
+        Returns:
+            SubnetAllocator: The allocator.
+        """
+        allocator = cls(state['parent'])
+        for ip_cidr in state['allocated']:
+            allocator.reserve(ip_cidr)
+        return allocator
+
+    def save(self, filename):
+        """
+        Writes the allocator state to a JSON file.
+
+        Parameters:
+            filename (str): The name of the file to write to.
+
+        Returns:
+            None
+        """
+        with open(filename, 'w') as file:
+            json.dump(self.to_dict(), file)
+
+    @classmethod
+    def load(cls, filename):
+        """
+        Reads an allocator from a JSON file written by save.
+
+        Parameters:
+            filename (str): The name of the file to read.
+
+        Returns:
+            SubnetAllocator: The allocator.
+        """
+        with open(filename) as file:
+            return cls.from_dict(json.load(file))
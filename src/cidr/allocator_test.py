@@ -0,0 +1,86 @@
+'''By Ray Bernard ray.bernard@outlook.com
+     MIT License '''
+import os
+import random
+import tempfile
+import unittest
+from ipaddress import ip_network
+from cidr.allocator import SubnetAllocator
+
+
+class TestSubnetAllocator(unittest.TestCase):
+    def test_allocates_lowest_address_first(self):
+        allocator = SubnetAllocator('10.0.0.0/22')
+        self.assertEqual(allocator.allocate(24), '10.0.0.0/24')
+        self.assertEqual(allocator.allocate(26), '10.0.1.0/26')
+        self.assertEqual(allocator.allocate(24), '10.0.2.0/24')
+        self.assertEqual(allocator.allocate(25), '10.0.1.128/25')
+        self.assertEqual(allocator.free_blocks(), ['10.0.1.64/26', '10.0.3.0/24'])
+
+    def test_allocate_hosts(self):
+        allocator = SubnetAllocator('192.168.0.0/16')
+        self.assertEqual(allocator.prefix_for_hosts(62), 26)
+        self.assertEqual(allocator.prefix_for_hosts(63), 25)
+        self.assertEqual(allocator.prefix_for_hosts(2), 31)
+        self.assertEqual(allocator.allocate_hosts(500), '192.168.0.0/23')
+
+    def test_free_merges_buddies(self):
+        allocator = SubnetAllocator('10.0.0.0/8')
+        subnets = [allocator.allocate(24) for _ in range(4)]
+        for ip_cidr in subnets:
+            allocator.free(ip_cidr)
+        self.assertEqual(allocator.free_blocks(), ['10.0.0.0/8'])
+        self.assertEqual(len(allocator), 0)
+
+    def test_exhaustion_and_errors(self):
+        allocator = SubnetAllocator('10.0.0.0/30')
+        self.assertEqual([allocator.allocate(31) for _ in range(2)], ['10.0.0.0/31', '10.0.0.2/31'])
+        with self.assertRaises(ValueError):
+            allocator.allocate(32)
+        with self.assertRaises(ValueError):
+            allocator.allocate(29)
+        with self.assertRaises(ValueError):
+            allocator.free('10.0.0.0/32')
+        with self.assertRaises(ValueError):
+            allocator.reserve('10.0.0.2/32')
+
+    def test_random_churn_never_overlaps(self):
+        rng = random.Random(0)
+        allocator = SubnetAllocator('10.0.0.0/16')
+        live = []
+        for _ in range(3000):
+            if live and rng.random() < 0.45:
+                allocator.free(live.pop(rng.randrange(len(live))))
+            else:
+                try:
+                    live.append(allocator.allocate(rng.randint(20, 30)))
+                except ValueError:
+                    pass
+        self.assertEqual(sorted(allocator.allocated()), sorted(live))
+        networks = sorted(ip_network(ip_cidr) for ip_cidr in live + allocator.free_blocks())
+        self.assertEqual(sum(network.num_addresses for network in networks), 1 << 16)
+        for first, second in zip(networks, networks[1:]):
+            self.assertFalse(first.overlaps(second))
+        self.assertEqual(allocator.available(), (1 << 16) - sum(ip_network(c).num_addresses for c in live))
+
+    def test_save_and_load(self):
+        allocator = SubnetAllocator('10.0.0.0/16')
+        for prefix_len in (24, 20, 30, 24):
+            allocator.allocate(prefix_len)
+        allocator.reserve('10.0.128.0/17')
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = os.path.join(tmp, 'allocator.json')
+            allocator.save(filename)
+            loaded = SubnetAllocator.load(filename)
+        self.assertEqual(loaded.allocated(), allocator.allocated())
+        self.assertEqual(loaded.free_blocks(), allocator.free_blocks())
+        self.assertIn('10.0.128.0/17', loaded)
+
+    def test_ipv6_parent(self):
+        allocator = SubnetAllocator('2001:db8::/32')
+        self.assertEqual(allocator.allocate(48), '2001:db8::/48')
+        self.assertEqual(allocator.allocate_hosts(100), '2001:db8:1::/121')
+
+
+if __name__ == '__main__':
+    unittest.main()
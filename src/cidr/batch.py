@@ -0,0 +1,179 @@
+'''By Ray Bernard ray.bernard@outlook.com
+     MIT License '''
+from ipaddress import AddressValueError, NetmaskValueError
+import numpy as np
+from .parser import parse_cidrs
+from .report import HEADERS
+
+
+_OCTETS = [str(i) for i in range(256)]
+_ADDRESS_MAX = 0xFFFFFFFF
+
+
+def format_addresses(values):
+    """
+    Formats an array of 32-bit address integers as dotted-quad strings.
+
+    Parameters:
+        values (array-like): Address integers.
+
+    Returns:
+        list: The dotted-quad strings, in input order.
+    """
+    values = np.asarray(values, dtype=np.uint32)
+    octets = _OCTETS
+    return ['.'.join((octets[a], octets[b], octets[c], octets[d])) for a, b, c, d in zip(
+        (values >> 24).tolist(),
+        ((values >> 16) & 0xFF).tolist(),
+        ((values >> 8) & 0xFF).tolist(),
+        (values & 0xFF).tolist())]
+
+
+def cidr_arrays(ip_list):
+    """
+    Parses CIDR strings into the address and prefix arrays NetworkBatch takes.
+
+    Parameters:
+        ip_list (list): A list of IP addresses with CIDR notation.
+
+    Returns:
+        tuple: uint32 addresses and uint8 prefix lengths, one per CIDR.
+    """
+    ip_list = list(ip_list)
+    parsed = parse_cidrs(ip_list)
+    parsed.raise_for_errors()
+    if len(parsed) != len(ip_list):
+        line_numbers = np.frombuffer(parsed.line_numbers, dtype=np.uint64)
+        missing = np.setdiff1d(np.arange(1, len(ip_list) + 1, dtype=np.uint64), line_numbers)
+        raise ValueError(f"Line {int(missing[0])}: blank CIDR")
+    return np.frombuffer(parsed.addresses, dtype=np.uint32), np.frombuffer(parsed.prefixes, dtype=np.uint8)
+
+
+class NetworkBatch:
+    """
+    Computes the Network_Calculator columns for many networks at once.
+
+    Every column is held as a uint32 NumPy array and is computed with a few
+    vectorized passes instead of one IPv4Network object per CIDR.
+    """
+
+    def __init__(self, addresses, prefixes, cidrs=None):
+        """
+        Constructor of the NetworkBatch class
+
+        Parameters:
+            addresses (array-like): The IP address integers. Host bits may be set.
+            prefixes (array-like): The prefix lengths, 0 to 32.
+            cidrs (list): Optional CIDR text reported in the CIDR column.
+
+        Returns:
+            None
+        """
+        addresses = np.asarray(addresses, dtype=np.int64)
+        prefixes = np.asarray(prefixes, dtype=np.int64)
+        if addresses.shape != prefixes.shape or addresses.ndim != 1:
+            raise ValueError("Addresses and prefixes must be one-dimensional arrays of the same length.")
+        if addresses.size and (addresses.min() < 0 or addresses.max() > _ADDRESS_MAX):
+            raise AddressValueError("Addresses must be between 0 and 2**32 - 1.")
+        if prefixes.size and (prefixes.min() < 0 or prefixes.max() > 32):
+            raise NetmaskValueError("Prefix lengths must be between 0 and 32.")
+
+        self.cidrs = cidrs
+        self.addresses = addresses.astype(np.uint32)
+        self.prefixes = prefixes.astype(np.uint8)
+
+        # int64 leaves headroom for 2**32 and -1 so overflow can be detected
+        size = np.left_shift(np.int64(1), 32 - prefixes)
+        mask = (_ADDRESS_MAX + 1) - size
+        network = addresses & mask
+        broadcast = network + size - 1
+        next_network = network + size
+        first_ip = network + 1
+        last_ip = broadcast - 1
+        total_ips = np.where(prefixes < 31, size - 2, size)
+
+        # The per-object path raises when a column falls outside the address space
+        for column in (next_network, first_ip, last_ip):
+            bad = (column < 0) | (column > _ADDRESS_MAX)
+            if bad.any():
+                row = int(np.argmax(bad))
+                raise AddressValueError(f"{int(column[row])} is not permitted as an IPv4 address "
+                                        f"(row {row}: {self._label(row, network)})")
+
+        self.subnet_mask = mask.astype(np.uint32)
+        self.network_id = network.astype(np.uint32)
+        self.next_network = next_network.astype(np.uint32)
+        self.broadcast_id = broadcast.astype(np.uint32)
+        self.first_ip = first_ip.astype(np.uint32)
+        self.last_ip = last_ip.astype(np.uint32)
+        self.total_ips = total_ips.astype(np.uint32)
+
+    @classmethod
+    def from_cidrs(cls, ip_list):
+        """
+        Builds a batch from a sequence of CIDR strings.
+
+        Parameters:
+            ip_list (list): A list of IP addresses with CIDR notation.
+
+        Returns:
+            NetworkBatch: The computed batch.
+        """
+        ip_list = list(ip_list)
+        return cls(*cidr_arrays(ip_list), ip_list)
+
+    def __len__(self):
+        return len(self.prefixes)
+
+    def _label(self, row, network=None):
+        if self.cidrs is not None:
+            return self.cidrs[row]
+        network = self.network_id if network is None else network
+        return f"{format_addresses(network[row:row + 1])[0]}/{int(self.prefixes[row])}"
+
+    def columns(self):
+        """
+        Returns the computed columns keyed by report header.
+
+        Parameters:
+            None
+
+        Returns:
+            dict: uint32 arrays keyed by 'Subnet Mask', 'Network ID', and so on.
+        """
+        return {
+            'Subnet Mask': self.subnet_mask,
+            'Network ID': self.network_id,
+            'Next Network': self.next_network,
+            'Broadcast ID': self.broadcast_id,
+            'First IP': self.first_ip,
+            'Last IP': self.last_ip,
+            'Total IPs': self.total_ips,
+        }
+
+    def rows(self, columns=None):
+        """
+        Formats the batch as report rows.
+
+        Parameters:
+            columns (list): The report headers to format, in order. None formats all eight.
+
+        Returns:
+            list: One list of strings per network, matching write_to_csv.
+        """
+        if columns is None:
+            columns = HEADERS
+        computed = self.columns()
+        formatted = []
+        for header in columns:
+            if header == 'CIDR':
+                if self.cidrs is not None:
+                    formatted.append(self.cidrs)
+                else:
+                    formatted.append([f"{ip}/{prefix}" for ip, prefix in zip(
+                        format_addresses(self.network_id), self.prefixes.tolist())])
+            elif header == 'Total IPs':
+                formatted.append([str(total) for total in self.total_ips.tolist()])
+            else:
+                formatted.append(format_addresses(computed[header]))
+        return [list(row) for row in zip(*formatted)]
@@ -0,0 +1,208 @@
+'''By Ray Bernard ray.bernard@outlook.com
+     MIT License '''
+from ipaddress import AddressValueError, NetmaskValueError, IPv6Address
+import socket
+import numpy as np
+from .parser import parse_cidrs6
+from .report import HEADERS
+
+
+_ALL_ONES = np.uint64(0xFFFFFFFFFFFFFFFF)
+
+
+def _high_bits(counts):
+    """
+    Returns uint64 words with the top counts bits set, counts from 0 to 64.
+    """
+    shifts = np.minimum(64 - counts, 63).astype(np.uint64)
+    return np.where(counts == 0, np.uint64(0), np.left_shift(_ALL_ONES, shifts))
+
+
+def format_addresses6(high, low):
+    """
+    Formats arrays of 128-bit addresses, split in 64-bit halves, as IPv6 strings.
+
+    The text is the same as str(IPv6Address), so addresses are compressed
+    but never written with an embedded dotted quad.
+
+    Parameters:
+        high (array-like): The high 64 bits of each address.
+        low (array-like): The low 64 bits of each address.
+
+    Returns:
+        list: The IPv6 strings, in input order.
+    """
+    words = np.empty((len(high), 2), dtype='>u8')
+    words[:, 0] = high
+    words[:, 1] = low
+    packed = words.tobytes()
+    ntop = socket.inet_ntop
+    family = socket.AF_INET6
+    texts = [ntop(family, packed[i:i + 16]) for i in range(0, len(packed), 16)]
+
+    # inet_ntop writes ::a.b.c.d and ::ffff:a.b.c.d forms that ipaddress does not
+    low = np.asarray(low, dtype=np.uint64)
+    embedded = (np.asarray(high, dtype=np.uint64) == 0) & np.isin(low >> np.uint64(32), [0, 0xFFFF])
+    for row in np.flatnonzero(embedded).tolist():
+        texts[row] = str(IPv6Address(packed[16 * row:16 * row + 16]))
+    return texts
+
+
+def cidr_arrays6(ip_list):
+    """
+    Parses IPv6 CIDR strings into the arrays NetworkBatch6 takes.
+
+    Parameters:
+        ip_list (list): A list of IPv6 addresses with CIDR notation.
+
+    Returns:
+        tuple: uint64 high halves, uint64 low halves and uint8 prefix lengths.
+    """
+    ip_list = list(ip_list)
+    parsed = parse_cidrs6(ip_list)
+    parsed.raise_for_errors()
+    if len(parsed) != len(ip_list):
+        line_numbers = np.frombuffer(parsed.line_numbers, dtype=np.uint64)
+        missing = np.setdiff1d(np.arange(1, len(ip_list) + 1, dtype=np.uint64), line_numbers)
+        raise ValueError(f"Line {int(missing[0])}: blank CIDR")
+    return (np.frombuffer(parsed.high, dtype=np.uint64), np.frombuffer(parsed.low, dtype=np.uint64),
+            np.frombuffer(parsed.prefixes, dtype=np.uint8))
+
+
+class NetworkBatch6:
+    """
+    Computes the Network_Calculator columns for many IPv6 networks at once.
+
+    Each 128-bit column is held as two uint64 NumPy arrays, the high and the
+    low half, and carries between the halves are handled explicitly.
+    """
+
+    def __init__(self, high, low, prefixes, cidrs=None):
+        """
+        Constructor of the NetworkBatch6 class
+
+        Parameters:
+            high (array-like): The high 64 bits of the addresses.
+            low (array-like): The low 64 bits of the addresses. Host bits may be set.
+            prefixes (array-like): The prefix lengths, 0 to 128.
+            cidrs (list): Optional CIDR text reported in the CIDR column.
+
+        Returns:
+            None
+        """
+        high = np.asarray(high, dtype=np.uint64)
+        low = np.asarray(low, dtype=np.uint64)
+        prefixes = np.asarray(prefixes, dtype=np.int64)
+        if not high.shape == low.shape == prefixes.shape or prefixes.ndim != 1:
+            raise ValueError("Address halves and prefixes must be one-dimensional arrays of the same length.")
+        if prefixes.size and (prefixes.min() < 0 or prefixes.max() > 128):
+            raise NetmaskValueError("Prefix lengths must be between 0 and 128.")
+
+        self.cidrs = cidrs
+        self.high = high
+        self.low = low
+        self.prefixes = prefixes.astype(np.uint8)
+
+        mask_high = _high_bits(np.minimum(prefixes, 64))
+        mask_low = _high_bits(np.clip(prefixes - 64, 0, 64))
+        network_high = high & mask_high
+        network_low = low & mask_low
+        broadcast_high = network_high | ~mask_high
+        broadcast_low = network_low | ~mask_low
+
+        # The next network is the broadcast plus one, carried into the high half
+        carry = broadcast_low == _ALL_ONES
+        overflow = carry & (broadcast_high == _ALL_ONES)
+        if overflow.any():
+            row = int(np.argmax(overflow))
+            raise AddressValueError(f"{1 << 128} (>= 2**128) is not permitted as an IPv6 address "
+                                    f"(row {row}: {self._label(row, network_high, network_low)})")
+        self.next_network_high = broadcast_high + carry.astype(np.uint64)
+        self.next_network_low = broadcast_low + np.uint64(1)
+
+        # Only the Subnet-Router anycast address is reserved, and not on /127 or /128
+        reserved = (prefixes < 127).astype(np.uint64)
+        self.subnet_mask_high = mask_high
+        self.subnet_mask_low = mask_low
+        self.network_id_high = network_high
+        self.network_id_low = network_low
+        self.broadcast_id_high = broadcast_high
+        self.broadcast_id_low = broadcast_low
+        self.first_ip_high = network_high
+        self.first_ip_low = network_low + reserved
+        self.last_ip_high = broadcast_high
+        self.last_ip_low = broadcast_low
+
+        # Host counts are the host mask, plus the reserved address given back on /127 and /128
+        self.total_ips_high = ~mask_high
+        self.total_ips_low = ~mask_low + (np.uint64(1) - reserved)
+
+    @classmethod
+    def from_cidrs(cls, ip_list):
+        """
+        Builds a batch from a sequence of IPv6 CIDR strings.
+
+        Parameters:
+            ip_list (list): A list of IPv6 addresses with CIDR notation.
+
+        Returns:
+            NetworkBatch6: The computed batch.
+        """
+        ip_list = list(ip_list)
+        return cls(*cidr_arrays6(ip_list), ip_list)
+
+    def __len__(self):
+        return len(self.prefixes)
+
+    def _label(self, row, high, low):
+        if self.cidrs is not None:
+            return self.cidrs[row]
+        return f"{format_addresses6(high[row:row + 1], low[row:row + 1])[0]}/{int(self.prefixes[row])}"
+
+    def columns(self):
+        """
+        Returns the computed columns keyed by report header.
+
+        Parameters:
+            None
+
+        Returns:
+            dict: (high, low) pairs of uint64 arrays keyed by 'Subnet Mask', 'Network ID', and so on.
+        """
+        return {
+            'Subnet Mask': (self.subnet_mask_high, self.subnet_mask_low),
+            'Network ID': (self.network_id_high, self.network_id_low),
+            'Next Network': (self.next_network_high, self.next_network_low),
+            'Broadcast ID': (self.broadcast_id_high, self.broadcast_id_low),
+            'First IP': (self.first_ip_high, self.first_ip_low),
+            'Last IP': (self.last_ip_high, self.last_ip_low),
+            'Total IPs': (self.total_ips_high, self.total_ips_low),
+        }
+
+    def rows(self, columns=None):
+        """
+        Formats the batch as report rows.
+
+        Parameters:
+            columns (list): The report headers to format, in order. None formats all eight.
+
+        Returns:
+            list: One list of strings per network, matching write_to_csv.
+        """
+        if columns is None:
+            columns = HEADERS
+        computed = self.columns()
+        formatted = []
+        for header in columns:
+            if header == 'CIDR':
+                if self.cidrs is not None:
+                    formatted.append(self.cidrs)
+                else:
+                    formatted.append([f"{ip}/{prefix}" for ip, prefix in zip(
+                        format_addresses6(self.network_id_high, self.network_id_low), self.prefixes.tolist())])
+            elif header == 'Total IPs':
+                formatted.append([str((high << 64) | low) for high, low in zip(
+                    self.total_ips_high.tolist(), self.total_ips_low.tolist())])
+            else:
+                formatted.append(format_addresses6(*computed[header]))
+        return [list(row) for row in zip(*formatted)]
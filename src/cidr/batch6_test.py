@@ -0,0 +1,59 @@
+'''By Ray Bernard ray.bernard@outlook.com
+     MIT License '''
+import unittest
+from ipaddress import AddressValueError, NetmaskValueError
+from cidr.batch6 import NetworkBatch6, format_addresses6
+from cidr.network_calculator import Network_Calculator
+from cidr.report import compute_rows
+
+
+def object_row(ip_cidr):
+    net_calc = Network_Calculator(ip_cidr)
+    return [ip_cidr, net_calc.get_subnet_mask(), net_calc.get_network_id(), net_calc.get_next_network(),
+            net_calc.get_broadcast_id(), net_calc.get_first_ip(), net_calc.get_last_ip(), str(net_calc.get_total_ips())]
+
+
+class TestNetworkBatch6(unittest.TestCase):
+    def setUp(self):
+        self.ip_list = ['2001:db8::1/64', '2001:db8:0:1::/48 ', 'fe80::1:2:3:4/10', '::1/128', '::/1',
+                        '2001:db8::/127', '2001:db8::5/126', '::ffff:10.0.0.1/120', 'ffff::/64']
+
+    def test_rows_match_per_object_path(self):
+        rows = NetworkBatch6.from_cidrs(self.ip_list).rows()
+        self.assertEqual(rows, [object_row(ip_cidr) for ip_cidr in self.ip_list])
+
+    def test_usable_addresses(self):
+        row = NetworkBatch6.from_cidrs(['2001:db8::/64']).rows()[0]
+        self.assertEqual(row[5:], ['2001:db8::1', '2001:db8::ffff:ffff:ffff:ffff', str(2 ** 64 - 1)])
+        self.assertEqual(NetworkBatch6.from_cidrs(['2001:db8::/127']).rows()[0][5:], ['2001:db8::', '2001:db8::1', '2'])
+        self.assertEqual(NetworkBatch6.from_cidrs(['2001:db8::7/128']).rows()[0][5:], ['2001:db8::7', '2001:db8::7', '1'])
+
+    def test_carry_into_high_half(self):
+        batch = NetworkBatch6([0x20010DB800000000], [0xFFFFFFFFFFFFFFFF], [64])
+        self.assertEqual(int(batch.next_network_high[0]), 0x20010DB800000001)
+        self.assertEqual(int(batch.next_network_low[0]), 0)
+
+    def test_next_network_overflow_raises_like_per_object_path(self):
+        with self.assertRaises(AddressValueError):
+            Network_Calculator('::/0').get_next_network()
+        with self.assertRaises(AddressValueError):
+            NetworkBatch6.from_cidrs(['::/0'])
+
+    def test_invalid_prefix(self):
+        with self.assertRaises(ValueError):
+            NetworkBatch6.from_cidrs(['2001:db8::/129'])
+        with self.assertRaises(NetmaskValueError):
+            NetworkBatch6([0], [0], [129])
+
+    def test_format_addresses6(self):
+        self.assertEqual(format_addresses6([0, 0, 0x20010DB800000000, 0], [0, 1, 1, 0xFFFF01020304]),
+                         ['::', '::1', '2001:db8::1', '::ffff:102:304'])
+
+    def test_mixed_versions_keep_input_order(self):
+        ip_list = ['10.0.0.0/8', '2001:db8::1/64', '192.168.1.10/26', '::1/128']
+        self.assertEqual(compute_rows(ip_list, batch=True), [object_row(ip_cidr) for ip_cidr in ip_list])
+        self.assertEqual(compute_rows(ip_list, batch=False), compute_rows(ip_list, batch=True))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+'''By Ray Bernard ray.bernard@outlook.com
+     MIT License '''
+import csv
+import os
+import tempfile
+import unittest
+from ipaddress import AddressValueError, NetmaskValueError
+from cidr.batch import NetworkBatch, format_addresses
+from cidr.network_calculator import Network_Calculator
+
+
+def object_row(ip_cidr):
+    net_calc = Network_Calculator(ip_cidr)
+    return [ip_cidr, net_calc.get_subnet_mask(), net_calc.get_network_id(), net_calc.get_next_network(),
+            net_calc.get_broadcast_id(), net_calc.get_first_ip(), net_calc.get_last_ip(), str(net_calc.get_total_ips())]
+
+
+class TestNetworkBatch(unittest.TestCase):
+    def setUp(self):
+        self.ip_list = ['198.51.100.0/22 ', '192.168.1.10/26', '172.16.0.5/16', '10.0.0.0/8',
+                        '10.1.2.3/31', '10.1.2.3/32', '254.0.0.0/8']
+
+    def test_rows_match_per_object_path(self):
+        rows = NetworkBatch.from_cidrs(self.ip_list).rows()
+        self.assertEqual(rows, [object_row(ip_cidr) for ip_cidr in self.ip_list])
+
+    def test_columns_are_uint32(self):
+        batch = NetworkBatch([0xC0A8010A], [26])
+        for name, column in batch.columns().items():
+            self.assertEqual(column.dtype.name, 'uint32', name)
+        self.assertEqual(int(batch.network_id[0]), 0xC0A80100)
+        self.assertEqual(int(batch.total_ips[0]), 62)
+
+    def test_rows_without_cidr_text(self):
+        self.assertEqual(NetworkBatch([0xC0A8010A], [26]).rows()[0][0], '192.168.1.0/26')
+
+    def test_next_network_overflow_raises_like_per_object_path(self):
+        with self.assertRaises(AddressValueError):
+            Network_Calculator('1.2.3.4/0').get_next_network()
+        with self.assertRaises(AddressValueError):
+            NetworkBatch.from_cidrs(['1.2.3.4/0'])
+
+    def test_invalid_prefix(self):
+        with self.assertRaises(ValueError):
+            NetworkBatch.from_cidrs(['10.0.0.0/33'])
+        with self.assertRaises(NetmaskValueError):
+            NetworkBatch([0], [33])
+
+    def test_blank_cidr(self):
+        with self.assertRaises(ValueError):
+            NetworkBatch.from_cidrs(['10.0.0.0/8', ' '])
+
+    def test_format_addresses(self):
+        self.assertEqual(format_addresses([0, 0xFFFFFFFF, 0x0A000001]), ['0.0.0.0', '255.255.255.255', '10.0.0.1'])
+
+    def test_write_to_csv_batch(self):
+        ip_list = ['198.51.100.0/22 ', '192.168.1.10/26', '172.16.0.5/16']
+        with tempfile.TemporaryDirectory() as tmp:
+            batch_file = os.path.join(tmp, 'batch.csv')
+            object_file = os.path.join(tmp, 'object.csv')
+            Network_Calculator.write_to_csv(ip_list, batch_file, batch=True)
+            Network_Calculator.write_to_csv(ip_list, object_file)
+            with open(batch_file, newline='') as a, open(object_file, newline='') as b:
+                self.assertEqual(list(csv.reader(a)), list(csv.reader(b)))
+
+
+if __name__ == '__main__':
+    unittest.main()
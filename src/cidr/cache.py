@@ -0,0 +1,129 @@
+'''By Ray Bernard ray.bernard@outlook.com
+     MIT License '''
+from collections import OrderedDict
+from ipaddress import IPv6Address
+
+from .network_calculator import Compact_Network_Calculator, Network_Calculator
+from .parser import parse_cidr, parse_cidr6
+
+
+class NetworkCache:
+    """
+    A bounded LRU cache of computed report fields.
+
+    Entries are keyed on the normalized (network, prefix) pair, so
+    '10.1.2.3/24' and '10.1.2.200/24' share one entry. IPv6 networks are
+    cached too, under keys that cannot collide with IPv4 ones. When the cache is full
+    the least recently used entry is evicted. Hit, miss and eviction counters
+    are kept for tuning.
+    """
+
+    def __init__(self, maxsize=65536):
+        """
+        Constructor of the NetworkCache class
+
+        Parameters:
+            maxsize (int): The maximum number of networks kept.
+
+        Returns:
+            None
+        """
+        if maxsize < 1:
+            raise ValueError("Cache size must be at least 1.")
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def fields(self, ip_cidr):
+        """
+        Returns the computed report fields for a CIDR.
+
+        Parameters:
+            ip_cidr (str): The IP address with CIDR notation.
+
+        Returns:
+            list: Subnet mask, network ID, next network, broadcast ID, first IP,
+            last IP and total IPs, all as strings. Do not modify it.
+        """
+        if ':' in ip_cidr:
+            address, prefix_len = parse_cidr6(ip_cidr)
+            key = (address & ((1 << 128) - (1 << (128 - prefix_len))), prefix_len, 6)
+        else:
+            address, prefix_len = parse_cidr(ip_cidr)
+            key = (address & (0xFFFFFFFF ^ ((1 << (32 - prefix_len)) - 1)), prefix_len)
+        entries = self._entries
+        fields = entries.get(key)
+        if fields is not None:
+            self.hits += 1
+            entries.move_to_end(key)
+            return fields
+
+        self.misses += 1
+        if len(key) == 3:
+            net_calc = Network_Calculator(f"{IPv6Address(key[0])}/{prefix_len}")
+        else:
+            net_calc = Compact_Network_Calculator.from_network(*key)
+        fields = [
+            net_calc.get_subnet_mask(),
+            net_calc.get_network_id(),
+            net_calc.get_next_network(),
+            net_calc.get_broadcast_id(),
+            net_calc.get_first_ip(),
+            net_calc.get_last_ip(),
+            str(net_calc.get_total_ips())
+        ]
+        entries[key] = fields
+        if len(entries) > self.maxsize:
+            entries.popitem(last=False)
+            self.evictions += 1
+        return fields
+
+    def row(self, ip_cidr):
+        """
+        Returns the full report row for a CIDR, as written by write_to_csv.
+
+        Parameters:
+            ip_cidr (str): The IP address with CIDR notation.
+
+        Returns:
+            list: The eight report columns as strings.
+        """
+        return [ip_cidr] + self.fields(ip_cidr)
+
+    def clear(self):
+        """
+        Empties the cache and resets the counters.
+
+        Parameters:
+            None
+
+        Returns:
+            None
+        """
+        self._entries.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        """
+        Returns the cache counters, ready to forward to a metrics system.
+
+        Parameters:
+            None
+
+        Returns:
+            dict: hits, misses, evictions, size, maxsize and hit_rate.
+        """
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'size': len(self._entries),
+            'maxsize': self.maxsize,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
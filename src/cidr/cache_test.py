@@ -0,0 +1,74 @@
+'''By Ray Bernard ray.bernard@outlook.com
+     MIT License '''
+import contextlib
+import csv
+import os
+import tempfile
+import unittest
+from cidr.cache import NetworkCache
+from cidr.network_calculator import Network_Calculator
+from cidr.report import compute_rows
+
+
+class TestNetworkCache(unittest.TestCase):
+    def test_rows_match_uncached_path(self):
+        ip_list = ['198.51.100.0/22 ', '192.168.1.10/26', '172.16.0.5/16', '10.1.2.3/31', '10.1.2.3/32']
+        self.assertEqual(compute_rows(ip_list, cache=NetworkCache()), compute_rows(ip_list, batch=False))
+
+    def test_normalized_key(self):
+        cache = NetworkCache()
+        cache.fields('10.1.2.3/24')
+        cache.fields('10.1.2.200/24')
+        cache.fields('10.1.2.3/25')
+        self.assertEqual(cache.stats()['hits'], 1)
+        self.assertEqual(cache.stats()['misses'], 2)
+        self.assertEqual(len(cache), 2)
+
+    def test_lru_eviction(self):
+        cache = NetworkCache(maxsize=2)
+        cache.fields('10.0.0.0/8')
+        cache.fields('11.0.0.0/8')
+        cache.fields('10.0.0.0/8')
+        cache.fields('12.0.0.0/8')
+        cache.fields('10.0.0.0/8')
+        cache.fields('11.0.0.0/8')
+        stats = cache.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['evictions'], stats['size']), (2, 4, 2, 2))
+        cache.clear()
+        self.assertEqual(cache.stats()['misses'], 0)
+
+    def test_write_to_csv_with_cache(self):
+        ip_list = ['10.0.0.0/8', '192.168.1.10/26'] * 50
+        cache = NetworkCache(maxsize=10)
+        with tempfile.TemporaryDirectory() as tmp:
+            cached = os.path.join(tmp, 'cached.csv')
+            plain = os.path.join(tmp, 'plain.csv')
+            Network_Calculator.write_to_csv(ip_list, cached, cache=cache)
+            Network_Calculator.write_to_csv(ip_list, plain)
+            with open(cached, newline='') as a, open(plain, newline='') as b:
+                self.assertEqual(list(csv.reader(a)), list(csv.reader(b)))
+        self.assertEqual(cache.stats()['hits'], 98)
+
+    def test_cache_takes_precedence_over_batch(self):
+        ip_list = ['10.0.0.0/8', '192.168.1.10/26'] * 5
+        caches = [NetworkCache() for _ in range(3)]
+        compute_rows(ip_list, batch=True, cache=caches[0])
+        with tempfile.TemporaryDirectory() as tmp:
+            Network_Calculator.write_to_csv(ip_list, os.path.join(tmp, 'network.csv'), batch=True, cache=caches[1])
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            Network_Calculator.print_network_info(ip_list, batch=True, cache=caches[2])
+        self.assertEqual([cache.stats()['hits'] for cache in caches], [8, 8, 8])
+
+    def test_ipv6_networks(self):
+        ip_list = ['2001:db8::1/64', '2001:db8::2/64', '::/1', '0.0.0.0/1', '::/8']
+        cache = NetworkCache()
+        self.assertEqual(compute_rows(ip_list, cache=cache), compute_rows(ip_list, batch=False))
+        self.assertEqual(cache.stats()['hits'], 1)
+
+    def test_invalid_size(self):
+        with self.assertRaises(ValueError):
+            NetworkCache(0)
+
+
+if __name__ == '__main__':
+    unittest.main()
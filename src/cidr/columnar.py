@@ -0,0 +1,307 @@
+'''By Ray Bernard ray.bernard@outlook.com
+     MIT License '''
+import csv
+import io
+import mmap
+import struct
+import numpy as np
+
+from .batch import NetworkBatch, format_addresses
+from .parser import parse_cidrs
+from .report import HEADERS, WRITE_BUFFER_SIZE
+
+
+# File layout, all little-endian:
+#   header: magic b'NCRB', uint16 version, uint16 flags, uint64 row count
+#   eight uint32 columns of row-count values, in ADDRESS_COLUMNS order
+#   one uint8 column of prefix lengths
+#   with FLAG_TEXT: zero padding to a multiple of 8 bytes, row count + 1
+#   uint64 offsets into the text, then the UTF-8 CIDR text of every row
+# Version 1 files have no flags and no text; they are still read.
+MAGIC = b'NCRB'
+VERSION = 2
+FLAG_TEXT = 1
+HEADER = struct.Struct('<4sHHQ')
+ADDRESS_COLUMNS = ['address', 'subnet_mask', 'network_id', 'next_network', 'broadcast_id', 'first_ip', 'last_ip', 'total_ips']
+
+_REPORT_COLUMNS = ['subnet_mask', 'network_id', 'next_network', 'broadcast_id', 'first_ip', 'last_ip', 'total_ips']
+_CHUNK_ROWS = 1 << 18
+
+
+def _fixed_size(rows):
+    return HEADER.size + rows * (4 * len(ADDRESS_COLUMNS) + 1)
+
+
+def _text_column(cidrs):
+    """
+    Encodes CIDR strings as the offsets and bytes of the text section.
+    """
+    encoded = [cidr.encode('utf-8') for cidr in cidrs]
+    offsets = np.zeros(len(encoded) + 1, dtype='<u8')
+    np.cumsum([len(cidr) for cidr in encoded], out=offsets[1:])
+    return offsets, b''.join(encoded)
+
+
+def _write_columnar(batch, filename, text=None):
+    with open(filename, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, VERSION, 0 if text is None else FLAG_TEXT, len(batch)))
+        for name in ADDRESS_COLUMNS:
+            file.write(getattr(batch, name if name != 'address' else 'addresses').astype('<u4').tobytes())
+        file.write(batch.prefixes.astype(np.uint8).tobytes())
+        if text is not None:
+            offsets, data = text
+            file.write(bytes(-_fixed_size(len(batch)) % 8))
+            file.write(offsets.astype('<u8').tobytes())
+            file.write(data)
+    return len(batch)
+
+
+def write_columnar(batch, filename, cidrs=None):
+    """
+    Writes a NetworkBatch to a packed binary columnar report.
+
+    Parameters:
+        batch (NetworkBatch): The computed networks.
+        filename (str): The name of the file to write to.
+        cidrs (list): The CIDR text of each row, stored as written so the CSV
+            comes back unchanged. None stores no text, and the CIDR column
+            is rebuilt as address/prefix.
+
+    Returns:
+        int: The number of rows written.
+    """
+    if cidrs is not None and len(cidrs) != len(batch):
+        raise ValueError("There must be one CIDR string per row.")
+    return _write_columnar(batch, filename, None if cidrs is None else _text_column(cidrs))
+
+
+class ColumnarReport:
+    """
+    A binary columnar network report opened with mmap.
+
+    Every column is a NumPy view on the mapped file, so opening a report
+    costs the same whatever its size and nothing is parsed or copied.
+    Reports with stored CIDR text also have text_offsets, a uint64 view of
+    row count + 1 byte offsets, and text, a memoryview of the UTF-8 bytes;
+    both are None otherwise.
+    """
+
+    def __init__(self, filename):
+        """
+        Constructor of the ColumnarReport class
+
+        Parameters:
+            filename (str): The name of the report file to open.
+
+        Returns:
+            None
+        """
+        with open(filename, 'rb') as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._mmap) < HEADER.size:
+            raise ValueError(f"{filename} is too short to be a columnar report")
+        magic, version, flags, rows = HEADER.unpack_from(self._mmap)
+        if magic != MAGIC:
+            raise ValueError(f"{filename} is not a columnar report")
+        if version not in (1, VERSION):
+            raise ValueError(f"Unsupported columnar report version {version}")
+        size = _fixed_size(rows)
+        text_start = size + -size % 8
+        if flags & FLAG_TEXT:
+            size = text_start + 8 * (rows + 1)
+            if len(self._mmap) >= size:
+                size += int.from_bytes(self._mmap[size - 8:size], 'little')
+        if len(self._mmap) != size:
+            raise ValueError(f"{filename} is truncated")
+
+        self.rows = rows
+        offset = HEADER.size
+        for name in ADDRESS_COLUMNS:
+            setattr(self, name, np.frombuffer(self._mmap, dtype='<u4', count=rows, offset=offset))
+            offset += 4 * rows
+        self.prefix = np.frombuffer(self._mmap, dtype=np.uint8, count=rows, offset=offset)
+        self.text_offsets = self.text = None
+        if flags & FLAG_TEXT:
+            self.text_offsets = np.frombuffer(self._mmap, dtype='<u8', count=rows + 1, offset=text_start)
+            self.text = memoryview(self._mmap)[text_start + 8 * (rows + 1):]
+
+    def __len__(self):
+        return self.rows
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """
+        Releases the mapping. Column arrays must not be used afterwards.
+
+        Parameters:
+            None
+
+        Returns:
+            None
+        """
+        for name in ADDRESS_COLUMNS + ['prefix', 'text_offsets']:
+            self.__dict__.pop(name, None)
+        if self.__dict__.get('text') is not None:
+            self.__dict__.pop('text').release()
+        try:
+            self._mmap.close()
+        except BufferError:
+            # A caller still holds a view; the mapping is freed with it
+            pass
+
+    def columns(self):
+        """
+        Returns the report columns keyed by the write_to_csv headers.
+
+        Parameters:
+            None
+
+        Returns:
+            dict: uint32 arrays keyed by 'Subnet Mask', 'Network ID', and so on.
+        """
+        return dict(zip(HEADERS[1:], (getattr(self, name) for name in _REPORT_COLUMNS)))
+
+    def iter_rows(self, chunk_rows=_CHUNK_ROWS):
+        """
+        Formats the report as write_to_csv rows, a chunk at a time.
+
+        The CIDR column is the stored text when the report has it, so a
+        converted CSV comes back unchanged; otherwise it is rebuilt as
+        address/prefix.
+
+        Parameters:
+            chunk_rows (int): The number of rows formatted per pass.
+
+        Returns:
+            generator: Lists of eight strings.
+        """
+        for start in range(0, self.rows, chunk_rows):
+            stop = min(start + chunk_rows, self.rows)
+            if self.text is None:
+                cidrs = [f"{ip}/{prefix}" for ip, prefix in zip(format_addresses(self.address[start:stop]),
+                                                                 self.prefix[start:stop].tolist())]
+            else:
+                offsets = self.text_offsets[start:stop + 1].tolist()
+                data = self.text[offsets[0]:offsets[-1]].tobytes()
+                cidrs = [data[first:last].decode('utf-8') for first, last in
+                         zip([offset - offsets[0] for offset in offsets[:-1]],
+                             [offset - offsets[0] for offset in offsets[1:]])]
+            columns = [format_addresses(getattr(self, name)[start:stop]) for name in _REPORT_COLUMNS[:-1]]
+            totals = [str(total) for total in self.total_ips[start:stop].tolist()]
+            for row in zip(cidrs, *columns, totals):
+                yield list(row)
+
+
+def read_columnar(filename):
+    """
+    Opens a binary columnar report without copying it into memory.
+
+    Parameters:
+        filename (str): The name of the report file.
+
+    Returns:
+        ColumnarReport: The mapped report.
+    """
+    return ColumnarReport(filename)
+
+
+def cidr_file_to_columnar(input_filename, filename):
+    """
+    Computes a columnar report from a file of CIDRs, one per line.
+
+    The input is read through mmap rather than line by line. Each row keeps
+    its line, without the line ending, as its CIDR text.
+
+    Parameters:
+        input_filename (str): The CIDR file.
+        filename (str): The name of the report file to write.
+
+    Returns:
+        int: The number of rows written.
+    """
+    with open(input_filename, 'rb') as file:
+        if not file.seek(0, 2):
+            parsed = parse_cidrs(b'')
+            text = _text_column([])
+        else:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                parsed = parse_cidrs(mapped)
+                text = _line_text(mapped, np.frombuffer(parsed.line_numbers, dtype=np.uint64))
+    parsed.raise_for_errors()
+    batch = NetworkBatch(np.frombuffer(parsed.addresses, dtype=np.uint32), np.frombuffer(parsed.prefixes, dtype=np.uint8))
+    return _write_columnar(batch, filename, text)
+
+
+def _line_text(buffer, line_numbers):
+    """
+    Gathers the given 1-based lines of a buffer, without line endings, as the offsets and bytes of the text section.
+    """
+    data = np.frombuffer(buffer, dtype=np.uint8)
+    newlines = np.flatnonzero(data == ord('\n'))
+    line_starts = np.concatenate([[0], newlines + 1])
+    line_ends = np.append(newlines, data.size)
+    index = line_numbers.astype(np.int64) - 1
+    starts, ends = line_starts[index], line_ends[index]
+    # Drop the carriage return of CRLF endings
+    ends = ends - ((ends > starts) & (data[np.maximum(ends - 1, 0)] == ord('\r')))
+    lengths = ends - starts
+    offsets = np.zeros(index.size + 1, dtype='<u8')
+    np.cumsum(lengths, out=offsets[1:])
+    # Each output byte reads from its line's start plus its position within the line
+    gather = np.repeat(starts - offsets[:-1].astype(np.int64), lengths) + np.arange(int(offsets[-1]))
+    return offsets, data[gather].tobytes()
+
+
+def csv_to_columnar(csv_filename, filename):
+    """
+    Converts a CSV written by write_to_csv into a columnar report.
+
+    The CIDR column is stored as written, so columnar_to_csv gives back the same CSV.
+
+    Parameters:
+        csv_filename (str): The CSV report.
+        filename (str): The name of the report file to write.
+
+    Returns:
+        int: The number of rows written.
+    """
+    with open(csv_filename, newline='') as file:
+        reader = csv.reader(file)
+        header = next(reader, None)
+        if header != HEADERS:
+            raise ValueError(f"{csv_filename} does not have the write_to_csv columns")
+        ip_list = [row[0] for row in reader if row]
+    parsed = parse_cidrs(ip_list)
+    parsed.raise_for_errors()
+    batch = NetworkBatch(np.frombuffer(parsed.addresses, dtype=np.uint32), np.frombuffer(parsed.prefixes, dtype=np.uint8))
+    return write_columnar(batch, filename, ip_list)
+
+
+def columnar_to_csv(filename, csv_filename):
+    """
+    Converts a columnar report into the write_to_csv CSV layout.
+
+    Parameters:
+        filename (str): The columnar report.
+        csv_filename (str): The name of the CSV file to write.
+
+    Returns:
+        int: The number of rows written.
+    """
+    with read_columnar(filename) as report, open(csv_filename, 'w', newline='', buffering=WRITE_BUFFER_SIZE) as file:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(HEADERS)
+        for index, row in enumerate(report.iter_rows(), 1):
+            writer.writerow(row)
+            if index % _CHUNK_ROWS == 0:
+                file.write(buffer.getvalue())
+                buffer.seek(0)
+                buffer.truncate()
+        file.write(buffer.getvalue())
+        return len(report)
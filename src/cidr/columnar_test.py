@@ -0,0 +1,77 @@
+'''By Ray Bernard ray.bernard@outlook.com
+     MIT License '''
+import csv
+import os
+import tempfile
+import unittest
+from cidr.batch import NetworkBatch
+from cidr.columnar import (ColumnarReport, cidr_file_to_columnar, columnar_to_csv, csv_to_columnar,
+                           read_columnar, write_columnar)
+from cidr.network_calculator import Network_Calculator
+
+
+class TestColumnar(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.ip_list = ['198.51.100.0/22', '192.168.1.10/26', '172.16.0.5/16', '10.1.2.3/32']
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.tmp.name, name)
+
+    def read_csv(self, filename):
+        with open(filename, newline='') as file:
+            return list(csv.reader(file))
+
+    def test_round_trip(self):
+        batch = NetworkBatch.from_cidrs(self.ip_list)
+        self.assertEqual(write_columnar(batch, self.path('report.bin')), 4)
+        self.assertEqual(os.path.getsize(self.path('report.bin')), 16 + 4 * (8 * 4 + 1))
+        with read_columnar(self.path('report.bin')) as report:
+            self.assertEqual(len(report), 4)
+            self.assertEqual(report.network_id.tolist(), batch.network_id.tolist())
+            self.assertEqual(report.prefix.tolist(), [22, 26, 16, 32])
+            self.assertEqual(report.columns()['Total IPs'].tolist(), [1022, 62, 65534, 1])
+            self.assertEqual(list(report.iter_rows(chunk_rows=3)), batch.rows())
+
+    def test_csv_conversion_round_trip(self):
+        Network_Calculator.write_to_csv(self.ip_list, self.path('network.csv'))
+        self.assertEqual(csv_to_columnar(self.path('network.csv'), self.path('report.bin')), 4)
+        self.assertEqual(columnar_to_csv(self.path('report.bin'), self.path('back.csv')), 4)
+        self.assertEqual(self.read_csv(self.path('back.csv')), self.read_csv(self.path('network.csv')))
+
+    def test_csv_round_trip_keeps_cidr_text(self):
+        ip_list = ['198.51.100.0/22 ', '192.168.1.10/26', '172.16.0.5/16', '10.1.2.3/32']
+        Network_Calculator.write_to_csv(ip_list, self.path('network.csv'), batch=False)
+        csv_to_columnar(self.path('network.csv'), self.path('report.bin'))
+        with read_columnar(self.path('report.bin')) as report:
+            self.assertEqual(list(report.iter_rows(chunk_rows=3))[0][0], '198.51.100.0/22 ')
+        columnar_to_csv(self.path('report.bin'), self.path('back.csv'))
+        self.assertEqual(self.read_csv(self.path('back.csv')), self.read_csv(self.path('network.csv')))
+
+    def test_cidr_file_through_mmap(self):
+        with open(self.path('cidrs.txt'), 'w', newline='') as file:
+            file.write('198.51.100.0/22 \r\n\n192.168.1.10/26\n172.16.0.5/16\n10.1.2.3/32')
+        self.assertEqual(cidr_file_to_columnar(self.path('cidrs.txt'), self.path('report.bin')), 4)
+        with read_columnar(self.path('report.bin')) as report:
+            self.assertEqual(report.address.tolist()[1], 0xC0A8010A)
+            self.assertEqual([row[0] for row in report.iter_rows()],
+                             ['198.51.100.0/22 ', '192.168.1.10/26', '172.16.0.5/16', '10.1.2.3/32'])
+
+    def test_rejects_other_files(self):
+        with open(self.path('bad.bin'), 'wb') as file:
+            file.write(b'not a report at all')
+        with self.assertRaises(ValueError):
+            ColumnarReport(self.path('bad.bin'))
+
+        write_columnar(NetworkBatch.from_cidrs(self.ip_list), self.path('report.bin'), self.ip_list)
+        with open(self.path('report.bin'), 'rb+') as file:
+            file.truncate(os.path.getsize(self.path('report.bin')) - 1)
+        with self.assertRaises(ValueError):
+            ColumnarReport(self.path('report.bin'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,244 @@
+'''By Ray Bernard ray.bernard@outlook.com
+     MIT License '''
+import csv
+import numpy as np
+
+from .aggregate import _masks, parse_networks
+from .batch import format_addresses
+
+
+UTILIZATION_HEADERS = ['CIDR', 'Hits', 'Active Hosts', 'Total IPs', 'Utilization (%)']
+DEFAULT_CHUNK_ADDRESSES = 1 << 22
+
+
+class FlowJoin:
+    """
+    Attributes IPv4 addresses to the most specific of a set of subnets and counts them.
+
+    The subnets, which may nest, are flattened once into sorted, disjoint
+    address segments, each labelled with the most specific subnet covering
+    it. Attributing an address is then a single binary search over the
+    segment starts, however deeply the subnets nest. Addresses are added a
+    chunk at a time: each chunk is sorted, searched and counted with a few
+    vectorized passes, and distinct hosts are tracked in a bitmap with one
+    bit per covered address, so memory depends on the chunk size and the
+    covered address space, never on the number of addresses added.
+
+    An address inside nested subnets counts only for the most specific one.
+    Every address counts as a hit, but only the usable addresses, first IP
+    to last IP as in the network report, count as active hosts, so
+    utilization never exceeds 100%.
+    """
+
+    def __init__(self, ip_list, count_distinct=True):
+        """
+        Constructor of the FlowJoin class
+
+        Parameters:
+            ip_list (list): A list of IPv4 addresses with CIDR notation. Host
+                bits are ignored and duplicates are counted once.
+            count_distinct (bool): Track distinct hosts. The bitmap takes one
+                bit per address covered by the subnets, 2 MB for a /8.
+
+        Returns:
+            None
+        """
+        networks, prefixes = parse_networks(ip_list)
+        keys = np.unique(networks * 64 + prefixes)
+        self.networks = keys // 64
+        self.prefixes = keys % 64
+        sizes = np.left_shift(np.int64(1), 32 - self.prefixes)
+        self.total_ips = np.where(self.prefixes < 31, sizes - 2, sizes)
+        self.hits = np.zeros(keys.size, dtype=np.int64)
+        self.active_hosts = np.zeros(keys.size, dtype=np.int64) if count_distinct else None
+        self.unmatched = 0
+
+        # Every subnet start and every address after a subnet end may change
+        # the most specific subnet, so they split the address space into segments
+        ends = self.networks + sizes
+        starts = np.unique(np.concatenate([[0], self.networks, ends[ends < 1 << 32]]))
+        labels = np.full(starts.size, -1, dtype=np.int64)
+        # Label each segment start with the longest prefix containing it, most specific first
+        for prefix_len in np.unique(self.prefixes)[::-1].tolist():
+            holders = np.flatnonzero(self.prefixes == prefix_len)
+            pending = np.flatnonzero(labels < 0)
+            candidates = starts[pending] & _masks(np.array([prefix_len]))[0]
+            position = np.minimum(np.searchsorted(self.networks[holders], candidates), holders.size - 1)
+            hit = self.networks[holders[position]] == candidates
+            labels[pending[hit]] = holders[position[hit]]
+
+        # Neighbouring segments of the same subnet are merged so the search table is as small as it can be
+        keep = np.ones(starts.size, dtype=bool)
+        keep[1:] = labels[1:] != labels[:-1]
+        starts, labels = starts[keep], labels[keep]
+        lengths = np.diff(np.append(starts, 1 << 32))
+        self._starts = starts.astype(np.uint32)
+        self._labels = labels
+        # Each covered segment owns a run of bits in the bitmap, after the segments before it
+        covered = np.where(labels >= 0, lengths, 0)
+        # Bit numbers stay below 2**32, so they are worked out in uint32, where the wraparound cancels out
+        self._bit_offsets = ((np.cumsum(covered) - covered - starts) % (1 << 32)).astype(np.uint32)
+        self._bitmap = np.zeros((int(covered.sum()) + 7) // 8, dtype=np.uint8) if count_distinct else None
+
+        # The bits of the network and broadcast addresses below /31, where the subnet itself owns them
+        below_31 = np.flatnonzero(self.prefixes < 31)
+        owners = np.concatenate([below_31, below_31])
+        reserved = np.concatenate([self.networks[below_31], ends[below_31] - 1]).astype(np.uint32)
+        segments = np.searchsorted(self._starts, reserved, side='right') - 1
+        own = self._labels[segments] == owners
+        self._reserved_owners = owners[own]
+        self._reserved_bits = reserved[own] + self._bit_offsets[segments[own]]
+
+    def __len__(self):
+        return self.networks.size
+
+    def subnets(self):
+        """
+        Returns the subnets in address order, the order of every result array.
+
+        Parameters:
+            None
+
+        Returns:
+            list: Normalized CIDR strings.
+        """
+        return [f"{network}/{prefix}" for network, prefix in zip(format_addresses(self.networks),
+                                                                  self.prefixes.tolist())]
+
+    def assign(self, addresses):
+        """
+        Returns the most specific subnet of every address, without counting it.
+
+        Parameters:
+            addresses (array-like): IPv4 address integers.
+
+        Returns:
+            numpy.ndarray: int64 indexes into subnets(), -1 where no subnet contains the address.
+        """
+        addresses = np.asarray(addresses, dtype=np.uint32)
+        return self._labels[np.searchsorted(self._starts, addresses, side='right') - 1]
+
+    def add(self, addresses, chunk_size=DEFAULT_CHUNK_ADDRESSES):
+        """
+        Counts a batch of addresses against the subnets.
+
+        Parameters:
+            addresses (array-like): IPv4 address integers, for example a
+                NumPy memmap of a flow log column.
+            chunk_size (int): The number of addresses handled per pass.
+
+        Returns:
+            FlowJoin: self, so calls can be chained.
+        """
+        if chunk_size < 1:
+            raise ValueError("Chunk size must be at least 1.")
+        addresses = np.asarray(addresses)
+        for first in range(0, addresses.size, chunk_size):
+            self._add_chunk(np.sort(addresses[first:first + chunk_size].astype(np.uint32, copy=False)))
+        return self
+
+    def _add_chunk(self, addresses):
+        # The chunk is sorted, so each segment is a slice of it; finding where
+        # the few segments start costs less than searching every address
+        per_segment = np.diff(np.searchsorted(addresses, self._starts), append=addresses.size)
+        counts = np.bincount(self._labels + 1, weights=per_segment, minlength=self.hits.size + 1).astype(np.int64)
+        self.unmatched += int(counts[0])
+        self.hits += counts[1:]
+        if self._bitmap is None:
+            return
+
+        first = np.ones(addresses.size, dtype=bool)
+        first[1:] = addresses[1:] != addresses[:-1]
+        addresses = addresses[first]
+        per_segment = np.diff(np.searchsorted(addresses, self._starts), append=addresses.size)
+        covered = self._labels >= 0
+        labels = np.repeat(self._labels[covered], per_segment[covered])
+        bits = addresses[np.repeat(covered, per_segment)] + np.repeat(self._bit_offsets[covered], per_segment[covered])
+        index = bits >> np.uint32(3)
+        flag = np.left_shift(np.uint8(1), (bits & np.uint32(7)).astype(np.uint8))
+        new = (self._bitmap[index] & flag) == 0
+        self.active_hosts += np.bincount(labels[new], minlength=self.hits.size)
+        reserved_before = self._reserved_seen()
+        # The bits come out sorted, so the flags of each byte are or-ed together in one reduceat
+        index, flag = index[new], flag[new]
+        if index.size:
+            byte_starts = np.flatnonzero(np.concatenate([[True], index[1:] != index[:-1]]))
+            self._bitmap[index[byte_starts]] |= np.bitwise_or.reduceat(flag, byte_starts)
+        # Network and broadcast addresses were counted above but are not hosts, so they are taken back off
+        turned_on = self._reserved_seen() & ~reserved_before
+        self.active_hosts -= np.bincount(self._reserved_owners[turned_on], minlength=self.hits.size)
+
+    def _reserved_seen(self):
+        bits = self._reserved_bits
+        return (self._bitmap[bits >> np.uint32(3)] >> (bits & np.uint32(7)).astype(np.uint8)) & 1 == 1
+
+    def utilization(self):
+        """
+        Returns the active hosts of each subnet as a percentage of get_total_ips(), at most 100.
+
+        Parameters:
+            None
+
+        Returns:
+            numpy.ndarray: float64 percentages in address order.
+        """
+        if self.active_hosts is None:
+            raise ValueError("Distinct hosts were not counted; construct with count_distinct=True.")
+        return self.active_hosts * 100 / np.maximum(self.total_ips, 1)
+
+    def rows(self):
+        """
+        Formats the results, one row per subnet.
+
+        Parameters:
+            None
+
+        Returns:
+            list: CIDR, hits, active hosts, total IPs and utilization strings, in address order.
+        """
+        columns = [self.subnets(), self.hits.tolist()]
+        if self.active_hosts is None:
+            columns += [[''] * len(self), self.total_ips.tolist(), [''] * len(self)]
+        else:
+            columns += [self.active_hosts.tolist(), self.total_ips.tolist(),
+                        [f"{value:.2f}" for value in self.utilization().tolist()]]
+        return [[str(value) for value in row] for row in zip(*columns)]
+
+    def write_to_csv(self, filename):
+        """
+        Writes the per-subnet results to a CSV file.
+
+        Parameters:
+            filename (str): The name of the CSV file to write to.
+
+        Returns:
+            int: The number of subnets written.
+        """
+        rows = self.rows()
+        with open(filename, 'w', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(UTILIZATION_HEADERS)
+            writer.writerows(rows)
+        return len(rows)
+
+
+def join_flows(ip_list, addresses, chunk_size=DEFAULT_CHUNK_ADDRESSES, count_distinct=True):
+    """
+    Attributes addresses to their most specific subnet and counts hits and active hosts.
+
+    Parameters:
+        ip_list (list): A list of IPv4 addresses with CIDR notation, possibly nested.
+        addresses: An array of IPv4 address integers, or an iterable of such
+            arrays, for example one per flow log file.
+        chunk_size (int): The number of addresses handled per pass.
+        count_distinct (bool): Track distinct hosts per subnet.
+
+    Returns:
+        FlowJoin: The counts, in the address order of subnets().
+    """
+    join = FlowJoin(ip_list, count_distinct)
+    if isinstance(addresses, np.ndarray):
+        addresses = [addresses]
+    for batch in addresses:
+        join.add(batch, chunk_size)
+    return join
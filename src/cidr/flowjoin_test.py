@@ -0,0 +1,111 @@
+'''By Ray Bernard ray.bernard@outlook.com
+     MIT License '''
+import csv
+import os
+import random
+import tempfile
+import unittest
+from ipaddress import IPv4Address, IPv4Network
+import numpy as np
+from cidr.flowjoin import UTILIZATION_HEADERS, FlowJoin, join_flows
+from cidr.network_calculator import Network_Calculator
+
+
+def naive_join(ip_list, addresses):
+    networks = sorted({IPv4Network(ip_cidr, strict=False) for ip_cidr in ip_list},
+                      key=lambda network: (int(network.network_address), network.prefixlen))
+    hits = dict.fromkeys(networks, 0)
+    hosts = {network: set() for network in networks}
+    unmatched = 0
+    for address in addresses:
+        best = None
+        for network in networks:
+            if IPv4Address(address) in network and (best is None or network.prefixlen > best.prefixlen):
+                best = network
+        if best is None:
+            unmatched += 1
+        else:
+            hits[best] += 1
+            if best.prefixlen >= 31 or address not in (int(best.network_address), int(best.broadcast_address)):
+                hosts[best].add(address)
+    return [str(network) for network in networks], hits, hosts, unmatched
+
+
+class TestFlowJoin(unittest.TestCase):
+    def setUp(self):
+        self.ip_list = ['10.0.0.0/8', '10.1.0.0/16', '10.1.2.0/24', '10.1.2.128/25', '192.168.0.5/24',
+                        '192.168.0.5/32', '172.16.0.0/31', '10.1.0.0/16']
+        rng = np.random.default_rng(1)
+        self.addresses = np.concatenate([
+            rng.integers(0x0A000000, 0x0A020000, 3000), rng.integers(0xC0A80000, 0xC0A80100, 300),
+            rng.integers(0, 1 << 32, 200), [0xAC100000, 0xAC100001, 0xAC100001, 0xC0A80005]]).astype(np.uint32)
+
+    def test_matches_naive_join(self):
+        join = join_flows(self.ip_list, self.addresses, chunk_size=500)
+        subnets, hits, hosts, unmatched = naive_join(self.ip_list, self.addresses.tolist())
+        self.assertEqual(join.subnets(), subnets)
+        self.assertEqual(join.hits.tolist(), [hits[IPv4Network(subnet)] for subnet in subnets])
+        self.assertEqual(join.active_hosts.tolist(), [len(hosts[IPv4Network(subnet)]) for subnet in subnets])
+        self.assertEqual(join.unmatched, unmatched)
+        self.assertEqual(join.total_ips.tolist(), [Network_Calculator(subnet).get_total_ips() for subnet in subnets])
+
+    def test_chunks_and_batches_agree(self):
+        whole = join_flows(self.ip_list, self.addresses)
+        pieces = join_flows(self.ip_list, np.array_split(self.addresses, 7), chunk_size=97)
+        self.assertEqual(pieces.hits.tolist(), whole.hits.tolist())
+        self.assertEqual(pieces.active_hosts.tolist(), whole.active_hosts.tolist())
+        self.assertEqual(pieces.unmatched, whole.unmatched)
+
+    def test_assign(self):
+        join = FlowJoin(self.ip_list)
+        subnets = join.subnets()
+        labels = join.assign([0x0A010285, 0x0A010205, 0x0A050505, 0x08080808])
+        self.assertEqual([subnets[label] if label >= 0 else None for label in labels.tolist()],
+                         ['10.1.2.128/25', '10.1.2.0/24', '10.0.0.0/8', None])
+
+    def test_random_nested_subnets(self):
+        rng = random.Random(3)
+        ip_list = [f"10.{rng.randrange(2)}.{rng.randrange(4)}.{rng.randrange(256)}/{rng.randint(14, 32)}"
+                   for _ in range(60)]
+        addresses = np.random.default_rng(3).integers(0x0A000000, 0x0A020400, 2000).astype(np.uint32)
+        join = join_flows(ip_list, addresses, chunk_size=333)
+        subnets, hits, hosts, unmatched = naive_join(ip_list, addresses.tolist())
+        self.assertEqual(join.hits.tolist(), [hits[IPv4Network(subnet)] for subnet in subnets])
+        self.assertEqual(join.active_hosts.tolist(), [len(hosts[IPv4Network(subnet)]) for subnet in subnets])
+        self.assertEqual(join.unmatched, unmatched)
+
+    def test_whole_address_space(self):
+        join = join_flows(['0.0.0.0/0', '255.255.255.255/32'], np.array([0, 1, 1, 0xFFFFFFFF, 0xFFFFFFFE]))
+        self.assertEqual(join.hits.tolist(), [4, 1])
+        self.assertEqual(join.active_hosts.tolist(), [2, 1])
+        self.assertEqual(join.unmatched, 0)
+
+    def test_utilization_and_csv(self):
+        join = join_flows(['192.168.1.0/30', '192.168.2.0/24'], np.array([0xC0A80101, 0xC0A80102, 0xC0A80101]))
+        self.assertEqual(join.utilization().tolist(), [100.0, 0.0])
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = os.path.join(tmp, 'utilization.csv')
+            self.assertEqual(join.write_to_csv(filename), 2)
+            with open(filename, newline='') as file:
+                self.assertEqual(list(csv.reader(file)), [
+                    UTILIZATION_HEADERS,
+                    ['192.168.1.0/30', '3', '2', '2', '100.00'],
+                    ['192.168.2.0/24', '0', '0', '254', '0.00']])
+
+        # Network and broadcast addresses are hits but not hosts
+        join = join_flows(['192.168.1.0/30', '10.0.0.0/31', '10.0.0.0/24'], np.arange(0xC0A80100, 0xC0A80104))
+        self.assertEqual(join.rows()[2], ['192.168.1.0/30', '4', '2', '2', '100.00'])
+        subnets = ['10.0.0.0/8', '10.1.0.0/16', '10.1.2.0/24', '10.1.2.128/25', '10.1.2.4/30', '10.1.2.6/31']
+        join = join_flows(subnets, np.arange(0x0A010000, 0x0A010400))
+        self.assertTrue((join.utilization() <= 100).all(), join.rows())
+        # 10.1.2.4/30 keeps .4 and .5 once its nested /31 takes .6 and .7, and .4 is its network address
+        self.assertEqual(join.utilization().tolist()[3:], [50.0, 100.0, 100.0])
+
+        hits_only = join_flows(['192.168.1.0/30'], np.array([0xC0A80101]), count_distinct=False)
+        self.assertEqual(hits_only.rows(), [['192.168.1.0/30', '1', '', '2', '']])
+        with self.assertRaises(ValueError):
+            hits_only.utilization()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,190 @@
+'''By Ray Bernard ray.bernard@outlook.com
+     MIT License '''
+from ipaddress import IPv6Address
+import random
+import sys
+
+from .network_calculator import _format_address
+
+
+DEFAULT_CHUNK_HOSTS = 65536
+
+
+def _sample_indexes(rng, total, count):
+    """
+    Returns count distinct int64 indexes below total, in random order, drawn with a NumPy generator.
+    """
+    import numpy as np
+    if 2 * count > total:
+        return rng.permutation(total)[:count]
+    # Keeping the first copy of each index from a stream of uniform draws is
+    # the same as rejecting repeats one at a time, so the sample is uniform
+    picked = np.empty(0, dtype=np.int64)
+    while len(picked) < count:
+        draws = rng.integers(0, total, size=count - len(picked) + count // 16 + 16)
+        picked = np.concatenate([picked, draws])
+        _, first = np.unique(picked, return_index=True)
+        picked = picked[np.sort(first)]
+    return picked[:count]
+
+
+class HostRange:
+    """
+    The usable hosts of a network, enumerated lazily.
+
+    Only the first address, the stop and the step are stored, in a Python
+    range, so a /8 or an IPv6 /64 costs the same as a /30. Hosts can be
+    indexed, sliced, walked one at a time or a chunk at a time, and sampled
+    without replacement, and none of this builds the full list.
+
+    The hosts are the get_total_ips() addresses from get_first_ip() to
+    get_last_ip(). /127 and /128 IPv6 networks have no reserved addresses.
+    Neither do /31 and /32 IPv4 networks (RFC 3021), so every address is a
+    host and the range starts at the network address, although
+    get_first_ip() and get_last_ip() still skip a network and a broadcast
+    address for them.
+    """
+
+    def __init__(self, start, stop, step=1, version=4):
+        """
+        Constructor of the HostRange class
+
+        Parameters:
+            start (int): The first host address integer.
+            stop (int): The address integer after the last host.
+            step (int): The distance between hosts.
+            version (int): 4 or 6.
+
+        Returns:
+            None
+        """
+        if version not in (4, 6):
+            raise ValueError(f"Unknown IP version {version!r}")
+        self.version = version
+        self._range = range(start, stop, step)
+
+    @classmethod
+    def _from_range(cls, addresses, version):
+        hosts = cls.__new__(cls)
+        hosts.version = version
+        hosts._range = addresses
+        return hosts
+
+    def _format(self, value):
+        if self.version == 4:
+            return _format_address(value)
+        return str(IPv6Address(value))
+
+    def num_hosts(self):
+        """
+        Returns the number of hosts, which may be more than len() allows for IPv6.
+
+        Parameters:
+            None
+
+        Returns:
+            int: The number of hosts.
+        """
+        addresses = self._range
+        if addresses.step > 0:
+            return max(0, (addresses.stop - addresses.start + addresses.step - 1) // addresses.step)
+        return max(0, (addresses.start - addresses.stop - addresses.step - 1) // -addresses.step)
+
+    def __len__(self):
+        return len(self._range)
+
+    def __bool__(self):
+        return self.num_hosts() > 0
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._from_range(self._range[index], self.version)
+        return self._format(self._range[index])
+
+    def __iter__(self):
+        format_address = self._format
+        for value in self._range:
+            yield format_address(value)
+
+    def __repr__(self):
+        addresses = self._range
+        return f"HostRange({addresses.start}, {addresses.stop}, {addresses.step}, version={self.version})"
+
+    def chunks(self, chunk_size=DEFAULT_CHUNK_HOSTS, as_array=False):
+        """
+        Yields the hosts a chunk at a time.
+
+        Parameters:
+            chunk_size (int): The maximum number of hosts per chunk.
+            as_array (bool): Yield NumPy uint32 arrays of address integers
+                instead of lists of strings. IPv4 only.
+
+        Returns:
+            generator: Lists of address strings, or uint32 arrays.
+        """
+        if chunk_size < 1:
+            raise ValueError("Chunk size must be at least 1.")
+        addresses = self._range
+        step = addresses.step
+        if as_array:
+            if self.version != 4:
+                raise ValueError("Array chunks hold 32-bit addresses, so they are IPv4 only.")
+            import numpy as np
+            if step < 0:
+                for start in range(addresses.start, addresses.stop, chunk_size * step):
+                    stop = max(start + chunk_size * step, addresses.stop)
+                    yield np.arange(start, stop, step, dtype=np.int64).astype(np.uint32)
+                return
+            # Each chunk is one vector add onto offsets built once, so no Python int is made per host
+            offsets = np.arange(min(chunk_size, len(addresses)), dtype=np.uint32) * np.uint32(step)
+            for start in range(addresses.start, addresses.stop, chunk_size * step):
+                count = min(chunk_size, (addresses.stop - start + step - 1) // step)
+                yield offsets[:count] + np.uint32(start)
+            return
+        format_address = self._format
+        for start in range(addresses.start, addresses.stop, chunk_size * step):
+            stop = start + chunk_size * step
+            stop = min(stop, addresses.stop) if step > 0 else max(stop, addresses.stop)
+            yield [format_address(value) for value in range(start, stop, step)]
+
+    def sample(self, count, seed=None, as_array=False):
+        """
+        Picks hosts uniformly at random, without replacement.
+
+        Memory use depends on count, not on the size of the network. Array
+        samples are drawn with NumPy's generator, so the same seed picks
+        different hosts than the string sample.
+
+        Parameters:
+            count (int): The number of hosts to pick.
+            seed (int): The random seed, so samples are repeatable.
+            as_array (bool): Return a NumPy uint32 array of address integers. IPv4 only.
+
+        Returns:
+            list: The address strings, in random order, or a uint32 array.
+        """
+        total = self.num_hosts()
+        if not 0 <= count <= total:
+            raise ValueError(f"Cannot sample {count} of {total} hosts.")
+        if as_array and self.version != 4:
+            raise ValueError("Array samples hold 32-bit addresses, so they are IPv4 only.")
+        addresses = self._range
+        if as_array:
+            import numpy as np
+            indexes = _sample_indexes(np.random.default_rng(seed), total, count)
+            return (addresses.start + addresses.step * indexes).astype(np.uint32)
+
+        rng = random.Random(seed)
+        if total <= sys.maxsize:
+            indexes = rng.sample(range(total), count)
+        else:
+            # random.sample needs len(), so draw indexes until count distinct ones are seen
+            chosen = set()
+            indexes = []
+            while len(indexes) < count:
+                index = rng.randrange(total)
+                if index not in chosen:
+                    chosen.add(index)
+                    indexes.append(index)
+        format_address = self._format
+        return [format_address(addresses[index]) for index in indexes]
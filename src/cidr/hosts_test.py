@@ -0,0 +1,81 @@
+'''By Ray Bernard ray.bernard@outlook.com
+     MIT License '''
+import unittest
+from ipaddress import ip_network
+import numpy as np
+from cidr.hosts import HostRange
+from cidr.network_calculator import Compact_Network_Calculator, Network_Calculator
+
+
+class TestHostRange(unittest.TestCase):
+    def test_matches_first_last_and_total(self):
+        for ip_cidr in ['192.168.1.0/24', '10.1.2.3/29', '10.0.0.0/8', '2001:db8::/120']:
+            net_calc = Network_Calculator(ip_cidr)
+            hosts = net_calc.hosts()
+            self.assertEqual(len(hosts), net_calc.get_total_ips())
+            self.assertEqual(hosts[0], net_calc.get_first_ip())
+            self.assertEqual(hosts[-1], net_calc.get_last_ip())
+        self.assertEqual(list(Network_Calculator('192.168.1.0/28').hosts()),
+                         [str(host) for host in ip_network('192.168.1.0/28').hosts()])
+        self.assertEqual(list(Compact_Network_Calculator('10.0.0.4/31').hosts()), ['10.0.0.4', '10.0.0.5'])
+        self.assertEqual(list(Network_Calculator('10.0.0.4/32').hosts()), ['10.0.0.4'])
+        self.assertEqual(list(Network_Calculator('2001:db8::/127').hosts()), ['2001:db8::', '2001:db8::1'])
+
+    def test_point_to_point_networks(self):
+        # RFC 3021: a /31 or /32 has no network or broadcast address, so every address is a host,
+        # while get_first_ip() and get_last_ip() keep their arithmetic
+        for calculator in (Network_Calculator, Compact_Network_Calculator):
+            net_calc = calculator('10.0.0.0/31')
+            self.assertEqual(list(net_calc.hosts()), ['10.0.0.0', '10.0.0.1'])
+            self.assertEqual((net_calc.get_first_ip(), net_calc.get_last_ip()), ('10.0.0.1', '10.0.0.0'))
+            net_calc = calculator('10.0.0.1/32')
+            self.assertEqual(list(net_calc.hosts()), ['10.0.0.1'])
+            self.assertEqual((net_calc.get_first_ip(), net_calc.get_last_ip()), ('10.0.0.2', '10.0.0.0'))
+        net_calc = Network_Calculator('2001:db8::5/128')
+        self.assertEqual(list(net_calc.hosts()), [net_calc.get_first_ip()])
+
+    def test_slicing(self):
+        hosts = Network_Calculator('10.0.0.0/8').hosts()
+        sliced = hosts[1000:2000:100]
+        self.assertIsInstance(sliced, HostRange)
+        self.assertEqual(list(sliced), [f"10.0.{(1001 + i * 100) >> 8}.{(1001 + i * 100) & 0xFF}" for i in range(10)])
+        self.assertEqual(list(hosts[:-4:-1]), ['10.255.255.254', '10.255.255.253', '10.255.255.252'])
+        self.assertFalse(hosts[5:5])
+        with self.assertRaises(IndexError):
+            hosts[len(hosts)]
+
+    def test_chunks(self):
+        hosts = Network_Calculator('172.16.0.0/20').hosts()
+        chunks = list(hosts.chunks(1000))
+        self.assertEqual([len(chunk) for chunk in chunks], [1000, 1000, 1000, 1000, 94])
+        self.assertEqual(sum(chunks, []), list(hosts))
+
+        for view in (hosts, hosts[::7], hosts[::-3]):
+            arrays = list(view.chunks(500, as_array=True))
+            self.assertTrue(all(array.dtype == np.uint32 for array in arrays))
+            self.assertEqual(np.concatenate(arrays).tolist(), list(view._range))
+        with self.assertRaises(ValueError):
+            next(Network_Calculator('2001:db8::/64').hosts().chunks(as_array=True))
+
+    def test_sample(self):
+        hosts = Network_Calculator('10.0.0.0/8').hosts()
+        picked = hosts.sample(1000, seed=1)
+        self.assertEqual(picked, hosts.sample(1000, seed=1))
+        self.assertEqual(len(set(picked)), 1000)
+        self.assertTrue(all(host.startswith('10.') for host in picked))
+
+        array = hosts.sample(100000, seed=2, as_array=True)
+        self.assertEqual(len(np.unique(array)), 100000)
+        self.assertTrue(array.min() >= 0x0A000001 and array.max() <= 0x0AFFFFFE)
+        self.assertEqual(sorted(Network_Calculator('10.0.0.0/29').hosts().sample(6, as_array=True).tolist()),
+                         list(range(0x0A000001, 0x0A000007)))
+        with self.assertRaises(ValueError):
+            hosts[:10].sample(11)
+
+        huge = Network_Calculator('2001:db8::/32').hosts()
+        self.assertEqual(huge.num_hosts(), (1 << 96) - 1)
+        self.assertEqual(len(set(huge.sample(50, seed=3))), 50)
+
+
+if __name__ == '__main__':
+    unittest.main()
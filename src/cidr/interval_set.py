@@ -0,0 +1,270 @@
+'''By Ray Bernard ray.bernard@outlook.com
+     MIT License '''
+import numpy as np
+
+from .aggregate import cidr_intervals, merge_intervals
+from .parser import parse_cidr
+from .ranges import ranges_to_cidrs
+
+
+class IPv4IntervalSet:
+    """
+    An immutable set of IPv4 addresses held as sorted, disjoint intervals.
+
+    The intervals live in two read-only int64 arrays of inclusive start and
+    end addresses, merged so that no two overlap or touch. Set operations
+    work on the interval boundaries with vectorized passes, so comparing two
+    inventories of hundreds of thousands of prefixes takes milliseconds.
+    len() is the number of intervals; num_addresses() counts addresses.
+    """
+
+    def __init__(self, starts=(), ends=()):
+        """
+        Constructor of the IPv4IntervalSet class
+
+        Parameters:
+            starts (array-like): Inclusive interval start addresses, in any order.
+            ends (array-like): Inclusive interval end addresses.
+
+        Returns:
+            None
+        """
+        starts = np.asarray(starts, dtype=np.int64)
+        ends = np.asarray(ends, dtype=np.int64)
+        if starts.shape != ends.shape or starts.ndim != 1:
+            raise ValueError("Starts and ends must be one-dimensional arrays of the same length.")
+        if starts.size and (starts.min() < 0 or ends.max() > 0xFFFFFFFF or (ends < starts).any()):
+            raise ValueError("Intervals must lie between 0 and 2**32 - 1 and end after they start.")
+        self._set_intervals(*merge_intervals(starts, ends))
+
+    def _set_intervals(self, starts, ends):
+        self.starts = starts
+        self.ends = ends
+        self.starts.flags.writeable = False
+        self.ends.flags.writeable = False
+
+    @classmethod
+    def _from_merged(cls, starts, ends):
+        interval_set = cls.__new__(cls)
+        interval_set._set_intervals(starts, ends)
+        return interval_set
+
+    @classmethod
+    def from_cidrs(cls, ip_list):
+        """
+        Builds a set from a list of CIDRs. Host bits are ignored.
+
+        Parameters:
+            ip_list (list): A list of IP addresses with CIDR notation.
+
+        Returns:
+            IPv4IntervalSet: The addresses covered by the CIDRs.
+        """
+        return cls(*cidr_intervals(ip_list))
+
+    def _boundaries(self):
+        # Half-open boundaries: an address is inside when an odd number are <= it
+        boundaries = np.empty(2 * self.starts.size, dtype=np.int64)
+        boundaries[0::2] = self.starts
+        boundaries[1::2] = self.ends + 1
+        return boundaries
+
+    def _combine(self, other, operation):
+        if not isinstance(other, IPv4IntervalSet):
+            return NotImplemented
+        ours = self._boundaries()
+        theirs = other._boundaries()
+
+        # Both boundary lists are sorted, so the stable sort is a linear merge of two runs
+        points = np.concatenate((ours, theirs))
+        order = np.argsort(points, kind='stable')
+        points = points[order]
+        steps = np.zeros((2, points.size), dtype=np.int8)
+        steps[0, :ours.size] = np.resize(np.array([1, -1], dtype=np.int8), ours.size)
+        steps[1, ours.size:] = np.resize(np.array([1, -1], dtype=np.int8), theirs.size)
+        coverage = np.cumsum(steps[:, order], axis=1, dtype=np.int8)
+
+        # Membership after a point is read from the last of its duplicates
+        last = np.ones(points.size, dtype=bool)
+        last[:-1] = points[1:] != points[:-1]
+        points = points[last]
+        inside = operation(coverage[0, last] > 0, coverage[1, last] > 0)
+
+        # Keep only the points where membership changes
+        changes = np.empty(points.size, dtype=bool)
+        if points.size:
+            changes[0] = inside[0]
+            changes[1:] = inside[1:] != inside[:-1]
+        edges = points[changes]
+        return self._from_merged(edges[0::2], edges[1::2] - 1)
+
+    def union(self, other):
+        """
+        Returns the addresses in either set.
+
+        Parameters:
+            other (IPv4IntervalSet): The other set.
+
+        Returns:
+            IPv4IntervalSet: The union.
+        """
+        return self._combine(other, np.logical_or)
+
+    def intersection(self, other):
+        """
+        Returns the addresses in both sets.
+
+        Parameters:
+            other (IPv4IntervalSet): The other set.
+
+        Returns:
+            IPv4IntervalSet: The intersection.
+        """
+        return self._combine(other, np.logical_and)
+
+    def difference(self, other):
+        """
+        Returns the addresses in this set but not in the other.
+
+        Parameters:
+            other (IPv4IntervalSet): The other set.
+
+        Returns:
+            IPv4IntervalSet: The difference.
+        """
+        return self._combine(other, lambda ours, theirs: ours & ~theirs)
+
+    def symmetric_difference(self, other):
+        """
+        Returns the addresses in exactly one of the sets.
+
+        Parameters:
+            other (IPv4IntervalSet): The other set.
+
+        Returns:
+            IPv4IntervalSet: The symmetric difference.
+        """
+        return self._combine(other, np.logical_xor)
+
+    __or__ = union
+    __and__ = intersection
+    __sub__ = difference
+    __xor__ = symmetric_difference
+
+    def issubset(self, other):
+        """
+        Tells whether every address of this set is in the other.
+
+        Parameters:
+            other (IPv4IntervalSet): The other set.
+
+        Returns:
+            bool: True when this set is a subset of the other.
+        """
+        if not isinstance(other, IPv4IntervalSet):
+            raise TypeError(f"issubset() needs an IPv4IntervalSet, not {type(other).__name__}")
+        return not self.difference(other)
+
+    def issuperset(self, other):
+        """
+        Tells whether every address of the other set is in this one.
+
+        Parameters:
+            other (IPv4IntervalSet): The other set.
+
+        Returns:
+            bool: True when this set is a superset of the other.
+        """
+        if not isinstance(other, IPv4IntervalSet):
+            raise TypeError(f"issuperset() needs an IPv4IntervalSet, not {type(other).__name__}")
+        return other.issubset(self)
+
+    def __le__(self, other):
+        if not isinstance(other, IPv4IntervalSet):
+            return NotImplemented
+        return self.issubset(other)
+
+    def __ge__(self, other):
+        if not isinstance(other, IPv4IntervalSet):
+            return NotImplemented
+        return self.issuperset(other)
+
+    def contains_addresses(self, addresses):
+        """
+        Tests many addresses for membership at once.
+
+        Parameters:
+            addresses (array-like): IPv4 address integers.
+
+        Returns:
+            numpy.ndarray: A boolean array, True where the address is in the set.
+        """
+        addresses = np.asarray(addresses, dtype=np.int64)
+        if not self.starts.size:
+            return np.zeros(addresses.shape, dtype=bool)
+        position = np.searchsorted(self.starts, addresses, 'right') - 1
+        return (position >= 0) & (addresses <= self.ends[np.maximum(position, 0)])
+
+    def __contains__(self, item):
+        """
+        Tells whether an address integer, an address string or a whole CIDR is in the set.
+        """
+        if isinstance(item, IPv4IntervalSet):
+            return item.issubset(self)
+        if isinstance(item, str):
+            if '/' in item:
+                address, prefix_len = parse_cidr(item)
+                start = address & (0xFFFFFFFF ^ ((1 << (32 - prefix_len)) - 1))
+                end = start + (1 << (32 - prefix_len)) - 1
+            else:
+                start = end = parse_cidr(item + '/32')[0]
+        else:
+            start = end = int(item)
+        position = int(np.searchsorted(self.starts, start, 'right')) - 1
+        return position >= 0 and end <= int(self.ends[position])
+
+    def num_addresses(self):
+        """
+        Returns the number of addresses in the set.
+
+        Parameters:
+            None
+
+        Returns:
+            int: The address count.
+        """
+        return int((self.ends - self.starts + 1).sum())
+
+    def to_cidrs(self):
+        """
+        Converts the set to the minimal list of CIDRs covering it exactly.
+
+        The result can be passed straight to the report writers.
+
+        Parameters:
+            None
+
+        Returns:
+            list: CIDR strings, in address order.
+        """
+        return ranges_to_cidrs(self.starts, self.ends)
+
+    def __len__(self):
+        return self.starts.size
+
+    def __bool__(self):
+        return bool(self.starts.size)
+
+    def __eq__(self, other):
+        if not isinstance(other, IPv4IntervalSet):
+            return NotImplemented
+        return np.array_equal(self.starts, other.starts) and np.array_equal(self.ends, other.ends)
+
+    def __hash__(self):
+        return hash((self.starts.tobytes(), self.ends.tobytes()))
+
+    def __iter__(self):
+        return zip(self.starts.tolist(), self.ends.tolist())
+
+    def __repr__(self):
+        return f"IPv4IntervalSet({len(self)} intervals, {self.num_addresses()} addresses)"
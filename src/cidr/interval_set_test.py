@@ -0,0 +1,82 @@
+'''By Ray Bernard ray.bernard@outlook.com
+     MIT License '''
+import random
+import unittest
+from ipaddress import IPv4Network, collapse_addresses
+from cidr.interval_set import IPv4IntervalSet
+
+
+def random_cidrs(rng, count):
+    return [f"10.{rng.randrange(4)}.{rng.randrange(256)}.{rng.randrange(256)}/{rng.randint(22, 32)}" for _ in range(count)]
+
+
+def address_set(ip_list):
+    return {address for ip_cidr in ip_list for address in range(
+        int(IPv4Network(ip_cidr, strict=False).network_address),
+        int(IPv4Network(ip_cidr, strict=False).broadcast_address) + 1)}
+
+
+class TestIPv4IntervalSet(unittest.TestCase):
+    def setUp(self):
+        self.ipam = IPv4IntervalSet.from_cidrs(['10.0.0.0/24', '10.0.1.0/24', '192.168.0.0/16'])
+        self.firewall = IPv4IntervalSet.from_cidrs(['10.0.0.128/25', '192.168.10.0/24', '172.16.0.0/12'])
+
+    def test_set_algebra(self):
+        self.assertEqual((self.ipam - self.firewall).to_cidrs(),
+                         ['10.0.0.0/25', '10.0.1.0/24', '192.168.0.0/21', '192.168.8.0/23',
+                          '192.168.11.0/24', '192.168.12.0/22', '192.168.16.0/20', '192.168.32.0/19',
+                          '192.168.64.0/18', '192.168.128.0/17'])
+        self.assertEqual((self.ipam & self.firewall).to_cidrs(), ['10.0.0.128/25', '192.168.10.0/24'])
+        self.assertEqual((self.ipam | self.firewall).num_addresses(), 512 + 65536 + (1 << 20))
+        self.assertEqual((self.ipam ^ self.firewall), (self.ipam | self.firewall) - (self.ipam & self.firewall))
+
+    def test_matches_python_sets(self):
+        rng = random.Random(0)
+        for _ in range(20):
+            first, second = random_cidrs(rng, 30), random_cidrs(rng, 30)
+            a, b = IPv4IntervalSet.from_cidrs(first), IPv4IntervalSet.from_cidrs(second)
+            expected_a, expected_b = address_set(first), address_set(second)
+            for result, expected in ((a | b, expected_a | expected_b), (a & b, expected_a & expected_b),
+                                     (a - b, expected_a - expected_b), (a ^ b, expected_a ^ expected_b)):
+                self.assertEqual(result.num_addresses(), len(expected))
+                self.assertEqual(address_set(result.to_cidrs()), expected)
+
+    def test_to_cidrs_is_minimal(self):
+        ip_list = random_cidrs(random.Random(1), 200)
+        expected = [str(network) for network in collapse_addresses(IPv4Network(c, strict=False) for c in ip_list)]
+        self.assertEqual(IPv4IntervalSet.from_cidrs(ip_list).to_cidrs(), expected)
+
+    def test_containment(self):
+        self.assertIn('10.0.1.5', self.ipam)
+        self.assertIn('10.0.0.0/23', self.ipam)
+        self.assertNotIn('10.0.0.0/22', self.ipam)
+        self.assertIn(0x0A000001, self.ipam)
+        self.assertIn(IPv4IntervalSet.from_cidrs(['192.168.1.0/24']), self.ipam)
+        self.assertTrue(IPv4IntervalSet.from_cidrs(['10.0.0.0/24']) <= self.ipam)
+        self.assertFalse(self.firewall.issubset(self.ipam))
+        self.assertTrue(self.ipam.issuperset(IPv4IntervalSet()))
+        self.assertEqual(self.ipam.contains_addresses([0x0A000001, 0x0A000201, 0xC0A80000]).tolist(), [True, False, True])
+
+    def test_comparison_needs_interval_set(self):
+        for operation in (self.ipam.issubset, self.ipam.issuperset, lambda other: self.ipam <= other,
+                          lambda other: self.ipam >= other, lambda other: self.ipam | other):
+            with self.assertRaises(TypeError):
+                operation(['10.0.0.0/8'])
+
+    def test_empty_and_full(self):
+        empty = IPv4IntervalSet()
+        everything = IPv4IntervalSet.from_cidrs(['0.0.0.0/0'])
+        self.assertFalse(empty)
+        self.assertEqual(empty.to_cidrs(), [])
+        self.assertEqual((everything - empty).to_cidrs(), ['0.0.0.0/0'])
+        self.assertEqual(everything.num_addresses(), 1 << 32)
+        self.assertFalse(everything - everything)
+        self.assertEqual(empty.contains_addresses([1]).tolist(), [False])
+
+    def test_immutable(self):
+        with self.assertRaises(ValueError):
+            self.ipam.starts[0] = 1
+
+
+if __name__ == '__main__':
+    unittest.main()
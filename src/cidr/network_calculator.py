@@ -1,7 +1,28 @@
 '''By Ray Bernard ray.bernard@outlook.com
      MIT License '''
-from ipaddress import IPv4Network, IPv4Address
-import csv 
+from ipaddress import IPv4Address, AddressValueError, NetmaskValueError, ip_network
+import csv
+import sys
+
+
+_OCTETS = [str(i) for i in range(256)]
+_HEADERS = ['CIDR', 'Subnet Mask', 'Network ID', 'Next Network', 'Broadcast ID', 'First IP', 'Last IP', 'Total IPs']
+
+
+def _format_address(value):
+    """
+    Formats a 32-bit integer as a dotted-quad string.
+
+    Parameters:
+        value (int): The address integer.
+
+    Returns:
+        str: The dotted-quad address.
+    """
+    if not 0 <= value <= 0xFFFFFFFF:
+        raise AddressValueError(f"{value} is not permitted as an IPv4 address")
+    octets = _OCTETS
+    return '.'.join((octets[value >> 24], octets[(value >> 16) & 0xFF], octets[(value >> 8) & 0xFF], octets[value & 0xFF]))
 
 
 
@@ -11,7 +32,7 @@ class Network_Calculator:
         Constructor of the NetworkCalculator class
 
         Parameters:
-            ip_cidr (str): The IP address with CIDR notation.
+            ip_cidr (str): The IPv4 or IPv6 address with CIDR notation.
 
         Returns:
             None
@@ -20,8 +41,8 @@ class Network_Calculator:
         self.ip, self.cidr = ip_cidr.split('/')
         self.cidr = int(self.cidr)
 
-        # Creating IPv4 Network object
-        self.network = IPv4Network(f"{self.ip}/{self.cidr}", strict=False)
+        # Creating IPv4Network or IPv6Network object
+        self.network = ip_network(f"{self.ip}/{self.cidr}", strict=False)
 
     def get_subnet_mask(self):
         """
@@ -57,7 +78,7 @@ class Network_Calculator:
         Returns:
             str: The network ID of the next network.
         """
-        return str(IPv4Address(self.network.network_address + (1 << (32 - self.cidr))))
+        return str(self.network.network_address + (1 << (self.network.max_prefixlen - self.cidr)))
 
     def get_broadcast_id(self):
         """
@@ -75,25 +96,34 @@ class Network_Calculator:
         """
         Returns the first usable IP for the network.
 
+        IPv6 networks skip only the Subnet-Router anycast address, and /127
+        and /128 networks have no reserved address at all.
+
         Parameters:
             None
 
         Returns:
             str: The first usable IP address of the network.
         """
-        return str(IPv4Address(self.network.network_address + 1))
+        if self.network.version == 6 and self.cidr >= 127:
+            return str(self.network.network_address)
+        return str(self.network.network_address + 1)
 
     def get_last_ip(self):
         """
         Returns the last usable IP for the network.
 
+        IPv6 has no broadcast address, so this is the last address of the network.
+
         Parameters:
             None
 
         Returns:
             str: The last usable IP address of the network.
         """
-        return str(IPv4Address(self.network.broadcast_address - 1))
+        if self.network.version == 6:
+            return str(self.network.broadcast_address)
+        return str(self.network.broadcast_address - 1)
 
     def get_total_ips(self):
         """
@@ -105,63 +135,326 @@ class Network_Calculator:
         Returns:
             int: The total number of usable IP addresses in the network.
         """
+        if self.network.version == 6:
+            return (1 << (128 - self.cidr)) - 1 if self.cidr < 127 else (1 << (128 - self.cidr))
         return (1 << (32 - self.cidr)) - 2 if self.cidr < 31 else (1 << (32 - self.cidr))
 
-    def print_network_info(ip_list):
+    def hosts(self):
+        """
+        Returns the usable hosts of the network, enumerated lazily.
+
+        Nothing is built up front, so this is safe for a /8 or an IPv6 /64.
+        Index, slice, iterate, call chunks() or sample() on the result.
+
+        Parameters:
+            None
+
+        Returns:
+            HostRange: The get_total_ips() hosts, from get_first_ip() to get_last_ip(). An IPv4 /31
+            or /32 reserves no addresses (RFC 3021), so all of its addresses are hosts, even though
+            get_first_ip() and get_last_ip() still skip a network and a broadcast address there.
+        """
+        from .hosts import HostRange
+        network = int(self.network.network_address)
+        reserved = self.cidr < (127 if self.network.version == 6 else 31)
+        start = network + reserved
+        return HostRange(start, start + self.get_total_ips(), version=self.network.version)
+
+    def print_network_info(ip_list, batch=False, cache=None, instrument=None, columns=None):
         """
         Prints information about a list of networks.
 
         Parameters:
             ip_list (list): A list of IP addresses with CIDR notation.
+            batch (bool): Compute all rows at once with the NumPy batch engine.
+            cache (NetworkCache): Reuse the fields of networks already seen. Takes precedence over batch.
+            instrument (Instrumentation): Records per-stage timings and counters.
+            columns (list): Print only these columns, e.g. ['Network ID', 'Total IPs'].
 
         Returns:
             None
         """
-        print("{:<15} {:<15} {:<15} {:<15} {:<15} {:<15} {:<15} {:<15}".format('CIDR', 'Subnet Mask', 'Network ID', 'Next Network', 'Broadcast ID', 'First IP', 'Last IP', 'Total IPs'))
-
-        for ip_cidr in ip_list:
-            net_calc = Network_Calculator(ip_cidr)
-
-            print("{:<15} {:<15} {:<15} {:<15} {:<15} {:<15} {:<15} {:<15}".format(
-                ip_cidr,
-                net_calc.get_subnet_mask(),
-                net_calc.get_network_id(),
-                net_calc.get_next_network(),
-                net_calc.get_broadcast_id(),
-                net_calc.get_first_ip(),
-                net_calc.get_last_ip(),
-                str(net_calc.get_total_ips())
-            ))
-        
-    def write_to_csv(ip_list, filename):
+        if not __package__:
+            _check_standalone(batch, cache, instrument, columns)
+            line = "{:<15} {:<15} {:<15} {:<15} {:<15} {:<15} {:<15} {:<15}\n"
+            rows = _standalone_rows(ip_list)
+            sys.stdout.write(''.join([line.format(*_HEADERS)] + [line.format(*row) for row in rows]))
+            return
+
+        from .report import write_rows
+        from .sinks import TableSink
+        rows = _list_rows(ip_list, batch, cache, instrument, columns)
+        write_rows(rows, TableSink(sys.stdout), columns, instrument)
+
+    def write_to_csv(ip_list, filename, batch=False, cache=None, instrument=None, columns=None):
         """
         Writes information about a list of networks to a CSV file.
 
         Parameters:
             ip_list (list): A list of IP addresses with CIDR notation.
             filename (str): The name of the CSV file to write to.
+            batch (bool): Compute all rows at once with the NumPy batch engine.
+            cache (NetworkCache): Reuse the fields of networks already seen. Takes precedence over batch.
+            instrument (Instrumentation): Records per-stage timings and counters.
+            columns (list): Write only these columns, e.g. ['Network ID', 'Total IPs'].
 
         Returns:
             None
             """
-        with open(filename, 'w', newline='') as file:
-            writer = csv.writer(file)
-            writer.writerow(['CIDR', 'Subnet Mask', 'Network ID', 'Next Network', 'Broadcast ID', 'First IP', 'Last IP', 'Total IPs'])
+        if not __package__:
+            _check_standalone(batch, cache, instrument, columns)
+            rows = _standalone_rows(ip_list)
+            with open(filename, 'w', newline='') as file:
+                writer = csv.writer(file)
+                writer.writerow(_HEADERS)
+                writer.writerows(rows)
+            return
+
+        from .report import write_rows
+        from .sinks import CsvSink
+        rows = _list_rows(ip_list, batch, cache, instrument, columns)
+        write_rows(rows, CsvSink(filename), columns, instrument)
+
+    def stream_network_info(ip_cidrs, file=None, chunk_size=65536, progress=None, cache=None, instrument=None,
+                            columns=None):
+        """
+        Prints information about any iterable of networks, such as a file or sys.stdin.
+
+        Rows are computed and written a chunk at a time, so memory use stays flat.
+
+        Parameters:
+            ip_cidrs (iterable): IP addresses with CIDR notation, one per item or line.
+            file: The text stream to print to. Defaults to sys.stdout.
+            chunk_size (int): The number of networks computed per pass.
+            progress (callable): Called with the running row count after each chunk.
+            cache (NetworkCache): Reuse the fields of networks already seen.
+            instrument (Instrumentation): Records per-stage timings and counters.
+            columns (list): Only these columns, e.g. ['Network ID', 'Total IPs'].
+
+        Returns:
+            int: The number of rows printed.
+        """
+        from .report import stream_network_info
+        return stream_network_info(ip_cidrs, file, chunk_size, progress, cache=cache, instrument=instrument,
+                                   columns=columns)
+
+    def stream_to_csv(ip_cidrs, filename, chunk_size=65536, progress=None, cache=None, instrument=None,
+                      columns=None):
+        """
+        Writes information about any iterable of networks to a CSV file.
+
+        Rows are computed and written a chunk at a time, so memory use stays flat.
+
+        Parameters:
+            ip_cidrs (iterable): IP addresses with CIDR notation, one per item or line.
+            filename: The name of the CSV file to write to, or an open text file.
+            chunk_size (int): The number of networks computed per pass.
+            progress (callable): Called with the running row count after each chunk.
+            cache (NetworkCache): Reuse the fields of networks already seen.
+            instrument (Instrumentation): Records per-stage timings and counters.
+            columns (list): Only these columns, e.g. ['Network ID', 'Total IPs'].
+
+        Returns:
+            int: The number of rows written.
+        """
+        from .report import stream_to_csv
+        return stream_to_csv(ip_cidrs, filename, chunk_size, progress, cache=cache, instrument=instrument,
+                             columns=columns)
+
+
+class Compact_Network_Calculator:
+    """
+    A memory-compact Network_Calculator.
+
+    Only the 32-bit network integer and the prefix length are stored, in
+    __slots__. Dotted-quad strings are formatted when a getter is called.
+    """
+    __slots__ = ('network_int', 'cidr')
+
+    def __init__(self, ip_cidr):
+        """
+        Constructor of the Compact_Network_Calculator class
+
+        Parameters:
+            ip_cidr (str): The IP address with CIDR notation.
+
+        Returns:
+            None
+        """
+        ip, cidr = ip_cidr.split('/')
+        cidr = int(cidr)
+        if not 0 <= cidr <= 32:
+            raise NetmaskValueError(f"{cidr!r} is not a valid netmask")
+
+        self.cidr = cidr
+        self.network_int = int(IPv4Address(ip)) & (0xFFFFFFFF ^ ((1 << (32 - cidr)) - 1))
+
+    @classmethod
+    def from_network(cls, network_int, cidr):
+        """
+        Builds a Compact_Network_Calculator from integers, without parsing text.
+
+        Parameters:
+            network_int (int): The network address integer. Host bits are cleared.
+            cidr (int): The prefix length.
+
+        Returns:
+            Compact_Network_Calculator: The network.
+        """
+        if not 0 <= cidr <= 32:
+            raise NetmaskValueError(f"{cidr!r} is not a valid netmask")
+        net_calc = cls.__new__(cls)
+        net_calc.cidr = cidr
+        net_calc.network_int = network_int & (0xFFFFFFFF ^ ((1 << (32 - cidr)) - 1))
+        return net_calc
+
+    def get_subnet_mask(self):
+        """
+        Returns the subnet mask for the network.
+
+        Parameters:
+            None
+
+        Returns:
+            str: The subnet mask of the network.
+        """
+        return _format_address(0xFFFFFFFF ^ ((1 << (32 - self.cidr)) - 1))
+
+    def get_network_id(self):
+        """
+        Returns the network ID for the network.
+
+        Parameters:
+            None
+
+        Returns:
+            str: The network ID of the network.
+        """
+        return _format_address(self.network_int)
+
+    def get_next_network(self):
+        """
+        Returns the network ID of the next network.
+
+        Parameters:
+            None
+
+        Returns:
+            str: The network ID of the next network.
+        """
+        return _format_address(self.network_int + (1 << (32 - self.cidr)))
+
+    def get_broadcast_id(self):
+        """
+        Returns the broadcast ID for the network.
+
+        Parameters:
+            None
+
+        Returns:
+            str: The broadcast ID of the network.
+        """
+        return _format_address(self.network_int + (1 << (32 - self.cidr)) - 1)
+
+    def get_first_ip(self):
+        """
+        Returns the first usable IP for the network.
+
+        Parameters:
+            None
 
-            for ip_cidr in ip_list:
-                net_calc = Network_Calculator(ip_cidr)
+        Returns:
+            str: The first usable IP address of the network.
+        """
+        return _format_address(self.network_int + 1)
+
+    def get_last_ip(self):
+        """
+        Returns the last usable IP for the network.
 
-                writer.writerow([
-                    ip_cidr,
-                    net_calc.get_subnet_mask(),
-                    net_calc.get_network_id(),
-                    net_calc.get_next_network(),
-                    net_calc.get_broadcast_id(),
-                    net_calc.get_first_ip(),
-                    net_calc.get_last_ip(),
-                    str(net_calc.get_total_ips())
-                ])
+        Parameters:
+            None
 
+        Returns:
+            str: The last usable IP address of the network.
+        """
+        return _format_address(self.network_int + (1 << (32 - self.cidr)) - 2)
+
+    def get_total_ips(self):
+        """
+        Returns the total number of usable IP for the network.
+
+        Parameters:
+            None
+
+        Returns:
+            int: The total number of usable IP addresses in the network.
+        """
+        return (1 << (32 - self.cidr)) - 2 if self.cidr < 31 else (1 << (32 - self.cidr))
+
+    def hosts(self):
+        """
+        Returns the usable hosts of the network, enumerated lazily.
+
+        Parameters:
+            None
+
+        Returns:
+            HostRange: The get_total_ips() hosts, from get_first_ip() to get_last_ip(), except
+            that every address of a /31 or /32 is a host (RFC 3021), network address first.
+        """
+        from .hosts import HostRange
+        start = self.network_int + (self.cidr < 31)
+        return HostRange(start, start + self.get_total_ips())
+
+
+def _check_standalone(batch, cache, instrument, columns):
+    """
+    Rejects the report options that need the rest of the cidr package.
+
+    Loaded on its own, for example with `from network_calculator import
+    Network_Calculator` from inside the cidr directory, the module has no
+    package to import the report writers from, so only the plain report
+    is available.
+    """
+    if batch or cache is not None or instrument is not None or columns is not None:
+        raise ImportError("batch, cache, instrument and columns need the cidr package; "
+                          "import cidr.network_calculator instead")
+
+
+def _standalone_rows(ip_list):
+    """
+    Computes the full report rows with one Network_Calculator per network, without the rest of the package.
+    """
+    rows = []
+    for ip_cidr in ip_list:
+        net_calc = Network_Calculator(ip_cidr)
+        rows.append([
+            ip_cidr,
+            net_calc.get_subnet_mask(),
+            net_calc.get_network_id(),
+            net_calc.get_next_network(),
+            net_calc.get_broadcast_id(),
+            net_calc.get_first_ip(),
+            net_calc.get_last_ip(),
+            str(net_calc.get_total_ips())
+        ])
+    return rows
+
+
+def _list_rows(ip_list, batch, cache, instrument, columns):
+    """
+    Computes the rows of print_network_info and write_to_csv.
+
+    Every entry of the list is a network, so a blank one is an error, with
+    or without instrumentation. The cache takes precedence over batch, and
+    without either each network gets its own Network_Calculator.
+    """
+    from .report import _no_stage, _object_rows, compute_rows, select_columns
+    if cache is not None or batch:
+        return compute_rows(ip_list, batch=True, cache=cache, instrument=instrument, columns=columns)
+    stage = instrument.stage if instrument is not None else _no_stage
+    return _object_rows(ip_list, Network_Calculator, stage, select_columns(columns))
 
 
     
@@ -173,4 +466,5 @@ class Network_Calculator:
 #     Network_Calculator.print_network_info(ip_list)
 
 #     # Call the function with the list of CIDR IP addresses and the filename
-#     Network_Calculator.write_to_csv(ip_list, 'network.csv')
\ No newline at end of file
+#     Network_Calculator.write_to_csv(ip_list, 'network.csv')
+
@@ -1,8 +1,13 @@
 '''By Ray Bernard ray.bernard@outlook.com
      MIT License '''
+import contextlib
+import csv
+import io
+import os
+import tempfile
 import unittest
 from ipaddress import IPv4Network, IPv4Address
-from network_calculator import Network_Calculator
+from network_calculator import Network_Calculator, Compact_Network_Calculator
 
 
 class TestNetworkCalculator(unittest.TestCase):
@@ -30,5 +35,58 @@ class TestNetworkCalculator(unittest.TestCase):
     def test_get_total_ips(self):
         self.assertEqual(self.net_calc.get_total_ips(), 254)
 
+class TestTopLevelImport(unittest.TestCase):
+    # This module imports network_calculator on its own, the way the README does, without the cidr package
+    def test_print_network_info(self):
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            Network_Calculator.print_network_info(['10.0.0.0/30'])
+        lines = output.getvalue().splitlines()
+        self.assertEqual(lines[0].split(), ['CIDR', 'Subnet', 'Mask', 'Network', 'ID', 'Next', 'Network', 'Broadcast',
+                                            'ID', 'First', 'IP', 'Last', 'IP', 'Total', 'IPs'])
+        self.assertEqual(lines[1].split(), ['10.0.0.0/30', '255.255.255.252', '10.0.0.0', '10.0.0.4', '10.0.0.3',
+                                            '10.0.0.1', '10.0.0.2', '2'])
+
+    def test_write_to_csv(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = os.path.join(tmp, 'network.csv')
+            Network_Calculator.write_to_csv(['10.0.0.0/30', '192.168.1.10/26'], filename)
+            with open(filename, newline='') as file:
+                rows = list(csv.reader(file))
+        self.assertEqual(rows[0][0], 'CIDR')
+        self.assertEqual(rows[2], ['192.168.1.10/26', '255.255.255.192', '192.168.1.0', '192.168.1.64',
+                                   '192.168.1.63', '192.168.1.1', '192.168.1.62', '62'])
+
+    def test_package_options(self):
+        if Network_Calculator.__module__ == 'network_calculator':
+            with self.assertRaises(ImportError):
+                Network_Calculator.write_to_csv(['10.0.0.0/30'], os.devnull, batch=True)
+
+
+class TestCompactNetworkCalculator(unittest.TestCase):
+    getters = ['get_subnet_mask', 'get_network_id', 'get_next_network', 'get_broadcast_id',
+               'get_first_ip', 'get_last_ip', 'get_total_ips']
+
+    def test_matches_network_calculator(self):
+        for ip_cidr in ['198.51.100.0/22 ', '192.168.1.10/26', '172.16.0.5/16', '10.0.0.0/8',
+                        '10.1.2.3/31', '10.1.2.3/32', '0.0.0.0/1']:
+            net_calc = Network_Calculator(ip_cidr)
+            compact = Compact_Network_Calculator(ip_cidr)
+            for getter in self.getters:
+                self.assertEqual(getattr(compact, getter)(), getattr(net_calc, getter)(), (ip_cidr, getter))
+
+    def test_stores_integers_only(self):
+        compact = Compact_Network_Calculator('192.168.1.10/26')
+        self.assertEqual((compact.network_int, compact.cidr), (0xC0A80100, 26))
+        self.assertFalse(hasattr(compact, '__dict__'))
+
+    def test_next_network_overflow(self):
+        with self.assertRaises(ValueError):
+            Compact_Network_Calculator('255.255.255.0/24').get_next_network()
+
+    def test_invalid_input(self):
+        for ip_cidr in ['192.168.1.0/33', '192.168.1.0', '192.168.1/24', '256.1.1.1/8']:
+            with self.assertRaises(ValueError):
+                Compact_Network_Calculator(ip_cidr)
+
 if __name__ == '__main__':
     unittest.main()
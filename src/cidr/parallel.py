@@ -0,0 +1,110 @@
+'''By Ray Bernard ray.bernard@outlook.com
+     MIT License '''
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+import csv
+import io
+import os
+
+from .report import HEADERS, WRITE_BUFFER_SIZE, compute_rows
+
+
+DEFAULT_SHARD_BYTES = 32 << 20
+
+
+def shard_file(filename, shard_bytes=DEFAULT_SHARD_BYTES):
+    """
+    Splits a file into byte ranges that start and end on line boundaries.
+
+    Parameters:
+        filename (str): The name of the file to split.
+        shard_bytes (int): The target size of each shard.
+
+    Returns:
+        list: (start, end) byte offsets covering the whole file, in order.
+    """
+    size = os.path.getsize(filename)
+    shards = []
+    with open(filename, 'rb') as file:
+        start = 0
+        while start < size:
+            end = start + shard_bytes
+            if end >= size:
+                end = size
+            else:
+                # Move the cut to just after the next newline
+                file.seek(end - 1)
+                file.readline()
+                end = file.tell()
+            shards.append((start, end))
+            start = end
+    return shards
+
+
+def render_shard(filename, start, end, batch=None):
+    """
+    Computes the report rows for one shard of a CIDR file and renders them as CSV text.
+
+    Parameters:
+        filename (str): The name of the CIDR file, one CIDR per line.
+        start (int): The byte offset where the shard starts.
+        end (int): The byte offset where the shard ends.
+        batch (bool): Use the NumPy batch engine. None uses it when NumPy is installed.
+
+    Returns:
+        tuple: The CSV text and the number of rows in it.
+    """
+    with open(filename, 'rb') as file:
+        file.seek(start)
+        data = file.read(end - start)
+    lines = [line.rstrip('\r') for line in data.decode('utf-8').split('\n')]
+    ip_list = [line for line in lines if line.strip()]
+    rows = compute_rows(ip_list, batch) if ip_list else []
+
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue(), len(rows)
+
+
+def write_to_csv_parallel(input_filename, filename, workers=None, shard_bytes=DEFAULT_SHARD_BYTES, batch=None, progress=None):
+    """
+    Writes the network report for a large CIDR file using a pool of processes.
+
+    The input is split into byte-range shards on line boundaries. Each worker
+    computes and renders one shard, and the results are written in input
+    order, so the CSV is the same as a single-process write_to_csv. At most
+    two shards per worker are in flight to keep memory bounded.
+
+    Parameters:
+        input_filename (str): The CIDR file, one CIDR per line.
+        filename (str): The name of the CSV file to write to.
+        workers (int): The number of worker processes. Defaults to the CPU count.
+        shard_bytes (int): The target size of each shard in bytes.
+        batch (bool): Use the NumPy batch engine. None uses it when NumPy is installed.
+        progress (callable): Called with the running row count after each shard.
+
+    Returns:
+        int: The number of rows written, not counting the header.
+    """
+    workers = workers or os.cpu_count() or 1
+    shards = shard_file(input_filename, shard_bytes)
+
+    count = 0
+    with open(filename, 'w', newline='', buffering=WRITE_BUFFER_SIZE) as file:
+        csv.writer(file).writerow(HEADERS)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            shards = iter(shards)
+            pending = deque(executor.submit(render_shard, input_filename, start, end, batch)
+                            for start, end in islice(shards, 2 * workers))
+            while pending:
+                text, rows = pending.popleft().result()
+                file.write(text)
+                count += rows
+                if progress is not None:
+                    progress(count)
+                # Replace the finished shard so at most 2 * workers stay in flight
+                shard = next(shards, None)
+                if shard is not None:
+                    pending.append(executor.submit(render_shard, input_filename, *shard, batch))
+    return count
@@ -0,0 +1,44 @@
+'''By Ray Bernard ray.bernard@outlook.com
+     MIT License '''
+import os
+import tempfile
+import unittest
+from cidr.parallel import shard_file, write_to_csv_parallel
+from cidr.report import stream_to_csv
+
+
+class TestParallel(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.source = os.path.join(self.tmp.name, 'cidrs.txt')
+        ip_list = [f"10.{i // 256}.{i % 256}.7/{16 + i % 17}" for i in range(500)]
+        with open(self.source, 'w') as file:
+            file.write('\n'.join(ip_list[:250]) + '\n\n' + '\n'.join(ip_list[250:]))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_shards_cover_file_on_line_boundaries(self):
+        shards = shard_file(self.source, 100)
+        with open(self.source, 'rb') as file:
+            data = file.read()
+        self.assertEqual(shards[0][0], 0)
+        self.assertEqual(shards[-1][1], len(data))
+        for (_, end), (start, _) in zip(shards, shards[1:]):
+            self.assertEqual(end, start)
+            self.assertEqual(data[end - 1:end], b'\n')
+
+    def test_matches_single_process_output(self):
+        expected = os.path.join(self.tmp.name, 'expected.csv')
+        output = os.path.join(self.tmp.name, 'parallel.csv')
+        with open(self.source) as file:
+            stream_to_csv(file, expected)
+        progress = []
+        self.assertEqual(write_to_csv_parallel(self.source, output, workers=2, shard_bytes=512, progress=progress.append), 500)
+        self.assertEqual(progress[-1], 500)
+        with open(expected, 'rb') as a, open(output, 'rb') as b:
+            self.assertEqual(a.read(), b.read())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,512 @@
+'''By Ray Bernard ray.bernard@outlook.com
+     MIT License '''
+from array import array
+from collections import namedtuple
+from functools import partial
+from itertools import islice
+import gc
+import socket
+import sys
+
+try:
+    import numpy as np
+except ImportError:  # The pure-Python path is used without NumPy
+    np = None
+
+
+ParseError = namedtuple('ParseError', ['line_number', 'text', 'message'])
+
+_PREFIXES = {str(i): i for i in range(33)}
+_LONGEST_CIDR = len('255.255.255.255/32')
+_DEFAULT_CHUNK_SIZE = 1 << 20
+_STRIP_PASSES = 4
+_inet_pton4 = partial(socket.inet_pton, socket.AF_INET)
+_PREFIXES6 = {str(i): i for i in range(129)}
+_inet_pton6 = partial(socket.inet_pton, socket.AF_INET6)
+
+
+def parse_cidr(text):
+    """
+    Strictly parses one CIDR string. Surrounding whitespace is ignored.
+
+    Parameters:
+        text (str): The IP address with CIDR notation, for example '192.168.1.10/26'.
+
+    Returns:
+        tuple: The address integer (host bits kept) and the prefix length.
+    """
+    ip, sep, prefix = text.strip().partition('/')
+    if not sep:
+        raise ValueError(f"Missing '/' in {text!r}")
+    prefix_len = _PREFIXES.get(prefix)
+    if prefix_len is None:
+        raise ValueError(f"Invalid prefix length {prefix!r} in {text!r}")
+    try:
+        packed = _inet_pton4(ip)
+    except (OSError, ValueError):
+        raise ValueError(f"Invalid IPv4 address {ip!r} in {text!r}") from None
+    return int.from_bytes(packed, 'big'), prefix_len
+
+
+class _ParseResultBase:
+    """
+    What the IPv4 and IPv6 parse results share: prefixes, line numbers and errors.
+    """
+
+    def __init__(self):
+        self.prefixes = array('B')
+        self.line_numbers = array('Q')
+        self.errors = []
+        self.lines = 0
+
+    def __len__(self):
+        return len(self.prefixes)
+
+    def raise_for_errors(self):
+        """
+        Raises a ValueError describing the first bad line, if there is one.
+
+        Parameters:
+            None
+
+        Returns:
+            None
+        """
+        if self.errors:
+            error = self.errors[0]
+            raise ValueError(f"Line {error.line_number}: {error.message} ({len(self.errors)} bad line(s) in total)")
+
+
+class ParseResult(_ParseResultBase):
+    """
+    The (address, prefix) pairs parsed from a batch of CIDR lines.
+
+    addresses is an array('I'), prefixes an array('B') and line_numbers an
+    array('Q') holding the 1-based input line of each pair, so they can be
+    wrapped by NumPy without copying. Blank lines are skipped. Lines that fail
+    validation are collected in errors as ParseError tuples.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.addresses = array('I')
+
+    def pairs(self):
+        """
+        Returns the parsed (address, prefix) pairs.
+
+        Parameters:
+            None
+
+        Returns:
+            list: A list of (address int, prefix) tuples.
+        """
+        return list(zip(self.addresses, self.prefixes))
+
+    def _extend(self, addresses, prefixes, line_numbers):
+        self.addresses.extend(addresses)
+        self.prefixes.extend(prefixes)
+        self.line_numbers.extend(line_numbers)
+
+
+def _retry_line(result, text, line_number):
+    """
+    Parses one line with parse_cidr, recording an error if it is invalid.
+
+    Returns:
+        tuple: The (address, prefix) pair, or None for blank and bad lines.
+    """
+    if not text.strip():
+        return None
+    try:
+        return parse_cidr(text)
+    except ValueError as error:
+        result.errors.append(ParseError(line_number, text, str(error)))
+        return None
+
+
+def _parse_lines_python(result, lines, first_line):
+    """
+    Parses a list of text lines without NumPy.
+    """
+    first_error = len(result.errors)
+    ips = []
+    prefixes = []
+    line_numbers = []
+    for line_number, line in enumerate(lines, first_line):
+        ip, sep, prefix = line.strip().partition('/')
+        if not sep and not ip:
+            continue
+        prefix_len = _PREFIXES.get(prefix)
+        if prefix_len is None or '\0' in ip:
+            _retry_line(result, line, line_number)
+            continue
+        ips.append(ip)
+        prefixes.append(prefix_len)
+        line_numbers.append(line_number)
+
+    try:
+        packed = b''.join(map(_inet_pton4, ips))
+    except OSError:
+        # At least one bad address, fall back to checking them one by one
+        good = []
+        for ip, prefix_len, line_number in zip(ips, prefixes, line_numbers):
+            try:
+                good.append((_inet_pton4(ip), prefix_len, line_number))
+            except OSError:
+                _retry_line(result, lines[line_number - first_line], line_number)
+        packed = b''.join(item[0] for item in good)
+        prefixes = [item[1] for item in good]
+        line_numbers = [item[2] for item in good]
+
+    addresses = array('I')
+    addresses.frombytes(packed)
+    if sys.byteorder == 'little':
+        addresses.byteswap()
+    result._extend(addresses, prefixes, line_numbers)
+    result.errors[first_error:] = sorted(result.errors[first_error:])
+
+
+def _parse_buffer_numpy(result, data, first_line):
+    """
+    Parses a bytes buffer of newline-separated CIDRs with vectorized NumPy passes.
+
+    A valid line, once stripped, holds only digits and exactly four other
+    characters: three dots and a slash. Their positions give the five field
+    boundaries, and each field is at most three digits long, so the octets and
+    the prefix are decoded with a handful of whole-array operations. Lines that
+    fail any check are re-parsed with parse_cidr to report why.
+    """
+    buffer = np.frombuffer(data, dtype=np.uint8)
+    if not buffer.size:
+        return
+
+    newlines = np.flatnonzero(buffer == 10)
+    starts = np.concatenate(([0], newlines + 1))
+    ends = np.concatenate((newlines, [buffer.size]))
+    if starts[-1] == buffer.size:
+        starts, ends = starts[:-1], ends[:-1]
+    line_numbers = np.arange(first_line, first_line + starts.size, dtype=np.uint64)
+
+    # Strip surrounding whitespace (space, tab, carriage return). Lines with
+    # long runs of it are left for parse_cidr rather than looping here.
+    space = (buffer == 32) | (buffer == 9) | (buffer == 13)
+    first = starts.copy()
+    last = ends - 1
+    for _ in range(_STRIP_PASSES):
+        move = (first <= last) & np.take(space, first, mode='clip')
+        if not move.any():
+            break
+        first += move
+    for _ in range(_STRIP_PASSES):
+        move = (first <= last) & np.take(space, last, mode='clip')
+        if not move.any():
+            break
+        last -= move
+    present = first <= last
+    first, last, starts, ends, line_numbers = first[present], last[present], starts[present], ends[present], line_numbers[present]
+    leftover = space[first] | space[last]
+
+    # Positions of every non-digit byte; a valid line holds exactly four
+    nondigits = np.flatnonzero((buffer - np.uint8(48)) > 9)
+    lower = np.searchsorted(nondigits, first)
+    bad = leftover | ((np.searchsorted(nondigits, last, side='right') - lower) != 4)
+    if nondigits.size < 4:
+        bad[:] = True
+        lower[:] = 0
+        nondigits = np.zeros(4, dtype=np.int64)
+    lower = np.minimum(np.where(bad, 0, lower), nondigits.size - 4)
+    separators = [nondigits[lower + i] for i in range(4)]
+    bad |= (buffer[separators[0]] != 46) | (buffer[separators[1]] != 46) | (buffer[separators[2]] != 46) | (buffer[separators[3]] != 47)
+
+    fields = [(first, separators[0]), (separators[0] + 1, separators[1]), (separators[1] + 1, separators[2]),
+              (separators[2] + 1, separators[3]), (separators[3] + 1, last + 1)]
+    address = np.zeros(first.size, dtype=np.uint32)
+    for index, (begin, end) in enumerate(fields):
+        length = end - begin
+        longest = 3 if index < 4 else 2
+        bad |= (length < 1) | (length > longest)
+        bad |= (length > 1) & (np.take(buffer, begin, mode='clip') == 48)
+
+        # Out-of-field bytes are zeroed so they add nothing to the value
+        value = np.take(buffer, end - 1, mode='clip').astype(np.int16) - 48
+        value += np.where(length >= 2, np.take(buffer, end - 2, mode='clip').astype(np.int16) - 48, 0) * 10
+        if index < 4:
+            value += np.where(length >= 3, np.take(buffer, end - 3, mode='clip').astype(np.int16) - 48, 0) * 100
+            bad |= value > 255
+            address = (address << 8) | (value & 0xFF).astype(np.uint32)
+        else:
+            bad |= value > 32
+            prefix = value
+
+    good = ~bad
+    addresses = address[good]
+    prefixes = prefix[good].astype(np.uint8)
+    good_lines = line_numbers[good]
+
+    recovered = []
+    for start, end, line_number in zip(starts[bad].tolist(), ends[bad].tolist(), line_numbers[bad].tolist()):
+        pair = _retry_line(result, bytes(buffer[start:end]).decode('utf-8', 'replace'), line_number)
+        if pair is not None:
+            recovered.append((pair[0], pair[1], line_number))
+    if recovered:
+        # Put lines that needed the slow path back in input order
+        addresses = np.concatenate((addresses, np.array([item[0] for item in recovered], dtype=np.uint32)))
+        prefixes = np.concatenate((prefixes, np.array([item[1] for item in recovered], dtype=np.uint8)))
+        good_lines = np.concatenate((good_lines, np.array([item[2] for item in recovered], dtype=np.uint64)))
+        order = np.argsort(good_lines, kind='stable')
+        addresses, prefixes, good_lines = addresses[order], prefixes[order], good_lines[order]
+
+    result._extend(_as_array('I', addresses), _as_array('B', prefixes), _as_array('Q', good_lines))
+
+
+def _as_array(typecode, values):
+    converted = array(typecode)
+    converted.frombytes(values.tobytes())
+    return converted
+
+
+def _parse_chunk(result, data, first_line):
+    """
+    Parses one chunk of newline-separated bytes, returning the number of lines it held.
+    """
+    if np is not None:
+        _parse_buffer_numpy(result, data, first_line)
+    else:
+        _parse_lines_python(result, bytes(data).decode('utf-8', 'replace').split('\n'), first_line)
+    lines = data.count(b'\n')
+    if len(data) and data[-1:] != b'\n':
+        lines += 1
+    return lines
+
+
+def _buffer_chunks(data, chunk_size):
+    """
+    Splits a buffer into chunks that end on a line boundary.
+    """
+    view = memoryview(data).cast('B')
+    start = 0
+    while start < len(view):
+        end = min(start + chunk_size, len(view))
+        if end < len(view):
+            newline = data.rfind(b'\n', start, end)
+            if newline < start:
+                newline = data.find(b'\n', end)
+            end = len(view) if newline < 0 else newline + 1
+        yield bytes(view[start:end])
+        start = end
+
+
+def _file_chunks(file, chunk_size):
+    """
+    Reads a text or binary file object in chunks that end on a line boundary.
+    """
+    remainder = b''
+    while True:
+        chunk = file.read(chunk_size)
+        if not chunk:
+            break
+        if isinstance(chunk, str):
+            chunk = chunk.encode('utf-8')
+        chunk = remainder + chunk
+        newline = chunk.rfind(b'\n')
+        if newline < 0:
+            remainder = chunk
+            continue
+        remainder = chunk[newline + 1:]
+        yield chunk[:newline + 1]
+    if remainder:
+        yield remainder
+
+
+def _iterable_chunks(lines, chunk_lines):
+    """
+    Joins an iterable of str or bytes lines into newline-separated chunks.
+    """
+    lines = iter(lines)
+    while True:
+        batch = list(islice(lines, chunk_lines))
+        if not batch:
+            break
+        if isinstance(batch[0], str):
+            text = '\n'.join(batch)
+            if text.count('\n') != len(batch) - 1:
+                # Embedded newlines would shift line numbers, so keep one item per line
+                text = '\n'.join(line.rstrip('\n').replace('\n', ' ') for line in batch)
+            yield text.encode('utf-8') + b'\n'
+        else:
+            data = b'\n'.join(line.rstrip(b'\n').replace(b'\n', b' ') for line in batch)
+            yield data + b'\n'
+
+
+def _source_chunks(source, chunk_size):
+    """
+    Turns any supported source into newline-separated byte chunks.
+    """
+    if isinstance(source, str):
+        source = source.encode('utf-8')
+    if isinstance(source, (bytes, bytearray, memoryview)) or hasattr(source, 'rfind'):
+        return _buffer_chunks(source, chunk_size)
+    if hasattr(source, 'read'):
+        return _file_chunks(source, chunk_size)
+    return _iterable_chunks(source, max(1, chunk_size // 16))
+
+
+def _parse_chunks(result, chunks, parse_chunk):
+    # Parsing allocates many short-lived objects, the cycle collector only slows it down
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for chunk in chunks:
+            result.lines += parse_chunk(result, chunk, result.lines + 1)
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return result
+
+
+def parse_cidrs(source, chunk_size=_DEFAULT_CHUNK_SIZE):
+    """
+    Parses a large batch of CIDR lines into (address int, prefix) pairs.
+
+    Lines are validated strictly: four decimal octets without leading zeros
+    and a prefix length from 0 to 32. Whitespace around a line is ignored and
+    blank lines are skipped. Bad lines do not stop the parse, they are
+    reported in the result's errors with their line number.
+
+    Parameters:
+        source: A bytes-like buffer (bytes, bytearray, memoryview, mmap), a str
+            holding the whole text, a text or binary file object, or an
+            iterable of str or bytes lines such as a list.
+        chunk_size (int): Bytes (or lines, for iterables) parsed per pass.
+
+    Returns:
+        ParseResult: The parsed arrays and the per-line errors.
+    """
+    return _parse_chunks(ParseResult(), _source_chunks(source, chunk_size), _parse_chunk)
+
+
+def parse_file(filename, chunk_size=_DEFAULT_CHUNK_SIZE):
+    """
+    Parses a file of CIDR lines.
+
+    Parameters:
+        filename (str): The name of the file to read.
+        chunk_size (int): Bytes parsed per pass.
+
+    Returns:
+        ParseResult: The parsed arrays and the per-line errors.
+    """
+    with open(filename, 'rb') as file:
+        return parse_cidrs(file, chunk_size)
+
+
+def parse_cidr6(text):
+    """
+    Strictly parses one IPv6 CIDR string. Surrounding whitespace is ignored.
+
+    Parameters:
+        text (str): The IPv6 address with CIDR notation, for example '2001:db8::1/64'.
+
+    Returns:
+        tuple: The 128-bit address integer (host bits kept) and the prefix length.
+    """
+    ip, sep, prefix = text.strip().partition('/')
+    if not sep:
+        raise ValueError(f"Missing '/' in {text!r}")
+    prefix_len = _PREFIXES6.get(prefix)
+    if prefix_len is None:
+        raise ValueError(f"Invalid prefix length {prefix!r} in {text!r}")
+    try:
+        packed = _inet_pton6(ip)
+    except (OSError, ValueError):
+        raise ValueError(f"Invalid IPv6 address {ip!r} in {text!r}") from None
+    return int.from_bytes(packed, 'big'), prefix_len
+
+
+class ParseResult6(_ParseResultBase):
+    """
+    The (address, prefix) pairs parsed from a batch of IPv6 CIDR lines.
+
+    Each 128-bit address is split into high and low 64-bit halves, held in
+    two array('Q') columns. prefixes, line_numbers and errors are as in
+    ParseResult.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.high = array('Q')
+        self.low = array('Q')
+
+    def pairs(self):
+        """
+        Returns the parsed (address, prefix) pairs.
+
+        Parameters:
+            None
+
+        Returns:
+            list: A list of (128-bit address int, prefix) tuples.
+        """
+        return [((high << 64) | low, prefix) for high, low, prefix in zip(self.high, self.low, self.prefixes)]
+
+
+def _parse_chunk6(result, data, first_line):
+    """
+    Parses one chunk of newline-separated IPv6 CIDR bytes, returning the number of lines it held.
+    """
+    lines = bytes(data).decode('utf-8', 'replace').split('\n')
+    if lines and not lines[-1]:
+        lines.pop()
+    packed = []
+    prefixes = []
+    line_numbers = []
+    for line_number, line in enumerate(lines, first_line):
+        ip, sep, prefix = line.strip().partition('/')
+        if not sep and not ip:
+            continue
+        prefix_len = _PREFIXES6.get(prefix)
+        try:
+            if prefix_len is None:
+                raise ValueError
+            packed.append(_inet_pton6(ip))
+        except (OSError, ValueError):
+            _retry_line6(result, line, line_number)
+            continue
+        prefixes.append(prefix_len)
+        line_numbers.append(line_number)
+
+    # Big-endian 16-byte addresses read as pairs of 64-bit words give (high, low)
+    words = array('Q')
+    words.frombytes(b''.join(packed))
+    if sys.byteorder == 'little':
+        words.byteswap()
+    result.high.extend(words[0::2])
+    result.low.extend(words[1::2])
+    result.prefixes.extend(prefixes)
+    result.line_numbers.extend(line_numbers)
+    return len(lines)
+
+
+def _retry_line6(result, text, line_number):
+    try:
+        parse_cidr6(text)
+    except ValueError as error:
+        result.errors.append(ParseError(line_number, text, str(error)))
+
+
+def parse_cidrs6(source, chunk_size=_DEFAULT_CHUNK_SIZE):
+    """
+    Parses a large batch of IPv6 CIDR lines into (high, low, prefix) columns.
+
+    Accepts the same sources as parse_cidrs and reports bad lines the same way.
+
+    Parameters:
+        source: A bytes-like buffer, a str holding the whole text, a text or
+            binary file object, or an iterable of str or bytes lines.
+        chunk_size (int): Bytes (or lines, for iterables) parsed per pass.
+
+    Returns:
+        ParseResult6: The parsed arrays and the per-line errors.
+    """
+    return _parse_chunks(ParseResult6(), _source_chunks(source, chunk_size), _parse_chunk6)
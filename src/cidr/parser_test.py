@@ -0,0 +1,85 @@
+'''By Ray Bernard ray.bernard@outlook.com
+     MIT License '''
+import io
+import os
+import tempfile
+import unittest
+from cidr import parser
+from cidr.parser import ParseResult, parse_cidr, parse_cidr6, parse_cidrs, parse_cidrs6, parse_file
+
+
+class TestParser(unittest.TestCase):
+    def setUp(self):
+        self.lines = ['198.51.100.0/22 ', '192.168.1.10/26', '', 'bad', '172.16.0.5/16',
+                      '01.2.3.4/8', '10.0.0.0/33', '  10.0.0.1/32\r', '1.2.3.4 /8', '0.0.0.0/0']
+
+    def check(self, result):
+        self.assertEqual(result.pairs(), [(0xC6336400, 22), (0xC0A8010A, 26), (0xAC100005, 16),
+                                          (0x0A000001, 32), (0, 0)])
+        self.assertEqual(list(result.line_numbers), [1, 2, 5, 8, 10])
+        self.assertEqual([error.line_number for error in result.errors], [4, 6, 7, 9])
+        self.assertEqual(result.lines, 10)
+
+    def test_parse_cidr(self):
+        self.assertEqual(parse_cidr('198.51.100.0/22 '), (0xC6336400, 22))
+        for text in ['1.2.3.4', '1.2.3/8', '1.2.3.4/08', '256.0.0.0/8', '1.2.3.4/-1']:
+            with self.assertRaises(ValueError):
+                parse_cidr(text)
+
+    def test_list(self):
+        self.check(parse_cidrs(self.lines))
+
+    def test_bytes_buffer(self):
+        self.check(parse_cidrs('\n'.join(self.lines).encode()))
+
+    def test_small_chunks(self):
+        self.check(parse_cidrs('\n'.join(self.lines).encode(), chunk_size=8))
+
+    def test_text_and_binary_files(self):
+        text = '\n'.join(self.lines) + '\n'
+        self.check(parse_cidrs(io.StringIO(text)))
+        self.check(parse_cidrs(io.BytesIO(text.encode()), chunk_size=16))
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = os.path.join(tmp, 'cidrs.txt')
+            with open(filename, 'w') as file:
+                file.write(text)
+            self.check(parse_file(filename))
+
+    def test_pure_python_path(self):
+        numpy = parser.np
+        parser.np = None
+        try:
+            self.check(parse_cidrs(self.lines))
+        finally:
+            parser.np = numpy
+
+    def test_raise_for_errors(self):
+        with self.assertRaisesRegex(ValueError, 'Line 4'):
+            parse_cidrs(self.lines).raise_for_errors()
+
+
+class TestParser6(unittest.TestCase):
+    def setUp(self):
+        self.lines = ['2001:db8::1/64', '', '::/0 ', 'bad', '2001:db8::/129', '  fe80::1/10\r', '::1 /128',
+                      '::ffff:10.0.0.1/128', '10.0.0.0/8']
+
+    def test_parse_cidr6(self):
+        self.assertEqual(parse_cidr6(' 2001:db8::1/64 '), ((0x20010DB8 << 96) | 1, 64))
+        for text in ['2001:db8::1', '2001:db8::1/129', '2001:db8::1/064', '2001:db8:::1/64', '10.0.0.0/8']:
+            with self.assertRaises(ValueError):
+                parse_cidr6(text)
+
+    def test_parse_cidrs6(self):
+        for result in (parse_cidrs6(self.lines), parse_cidrs6('\n'.join(self.lines).encode(), chunk_size=8)):
+            self.assertEqual(result.pairs(), [((0x20010DB8 << 96) | 1, 64), (0, 0), ((0xFE80 << 112) | 1, 10),
+                                              ((0xFFFF << 32) | 0x0A000001, 128)])
+            self.assertEqual(list(result.high), [0x20010DB800000000, 0, 0xFE80000000000000, 0])
+            self.assertEqual(list(result.line_numbers), [1, 3, 6, 8])
+            self.assertEqual([error.line_number for error in result.errors], [4, 5, 7, 9])
+            self.assertEqual(len(result), 4)
+            self.assertNotIsInstance(result, ParseResult)
+            self.assertFalse(hasattr(result, 'addresses'))
+
+
+if __name__ == '__main__':
+    unittest.main()
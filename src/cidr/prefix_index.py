@@ -0,0 +1,172 @@
+'''By Ray Bernard ray.bernard@outlook.com
+     MIT License '''
+import socket
+
+from .parser import parse_cidr
+
+
+def _mask(prefix_len):
+    return 0xFFFFFFFF ^ ((1 << (32 - prefix_len)) - 1)
+
+
+def _address_to_int(address):
+    if isinstance(address, int):
+        if not 0 <= address <= 0xFFFFFFFF:
+            raise ValueError(f"{address} is not a valid IPv4 address")
+        return address
+    try:
+        return int.from_bytes(socket.inet_pton(socket.AF_INET, str(address).strip()), 'big')
+    except (OSError, ValueError):
+        raise ValueError(f"Invalid IPv4 address {address!r}") from None
+
+
+class PrefixIndex:
+    """
+    A longest-prefix-match index over a set of CIDRs.
+
+    Prefixes are kept in one hash table per prefix length, so insert and
+    delete are O(1) and a lookup probes at most one table per length in use,
+    longest first. Bulk lookups build a sorted array per length once and
+    resolve a whole NumPy array of addresses with binary searches.
+    """
+
+    def __init__(self, ip_list=()):
+        """
+        Constructor of the PrefixIndex class
+
+        Parameters:
+            ip_list (list): A list of IP addresses with CIDR notation to index.
+
+        Returns:
+            None
+        """
+        self._tables = {}
+        self._lengths = []
+        self._sorted = None
+        for ip_cidr in ip_list:
+            self.insert(ip_cidr)
+
+    def __len__(self):
+        return sum(len(table) for table in self._tables.values())
+
+    def __contains__(self, ip_cidr):
+        network, prefix_len = self._key(ip_cidr)
+        return network in self._tables.get(prefix_len, ())
+
+    def _key(self, ip_cidr):
+        address, prefix_len = parse_cidr(ip_cidr)
+        return address & _mask(prefix_len), prefix_len
+
+    def insert(self, ip_cidr, value=None):
+        """
+        Adds a prefix to the index, replacing the value of an existing one.
+
+        Parameters:
+            ip_cidr (str): The IP address with CIDR notation. Host bits are ignored.
+            value: Returned by lookups that match this prefix. Defaults to the normalized CIDR.
+
+        Returns:
+            None
+        """
+        network, prefix_len = self._key(ip_cidr)
+        if value is None:
+            value = f"{socket.inet_ntoa(network.to_bytes(4, 'big'))}/{prefix_len}"
+        table = self._tables.get(prefix_len)
+        if table is None:
+            table = self._tables[prefix_len] = {}
+            self._lengths = sorted(self._tables, reverse=True)
+        table[network] = value
+        self._sorted = None
+
+    def delete(self, ip_cidr):
+        """
+        Removes a prefix from the index.
+
+        Parameters:
+            ip_cidr (str): The IP address with CIDR notation. Host bits are ignored.
+
+        Returns:
+            The value that was stored for the prefix.
+        """
+        network, prefix_len = self._key(ip_cidr)
+        table = self._tables.get(prefix_len)
+        if table is None or network not in table:
+            raise KeyError(ip_cidr)
+        value = table.pop(network)
+        if not table:
+            del self._tables[prefix_len]
+            self._lengths = sorted(self._tables, reverse=True)
+        self._sorted = None
+        return value
+
+    def lookup(self, address, default=None):
+        """
+        Returns the value of the longest prefix containing an address.
+
+        Parameters:
+            address (str or int): The IPv4 address to look up.
+            default: Returned when no prefix contains the address.
+
+        Returns:
+            The value stored with the matching prefix, or default.
+        """
+        address = _address_to_int(address)
+        for prefix_len in self._lengths:
+            value = self._tables[prefix_len].get(address & _mask(prefix_len), self)
+            if value is not self:
+                return value
+        return default
+
+    def lookup_prefix(self, address):
+        """
+        Returns the longest prefix containing an address as (network int, prefix length).
+
+        Parameters:
+            address (str or int): The IPv4 address to look up.
+
+        Returns:
+            tuple: The network integer and prefix length, or None when nothing matches.
+        """
+        address = _address_to_int(address)
+        for prefix_len in self._lengths:
+            network = address & _mask(prefix_len)
+            if network in self._tables[prefix_len]:
+                return network, prefix_len
+        return None
+
+    def _sorted_tables(self):
+        import numpy as np
+        if self._sorted is None:
+            self._sorted = [(prefix_len, np.sort(np.fromiter(self._tables[prefix_len], dtype=np.uint32,
+                                                             count=len(self._tables[prefix_len]))))
+                            for prefix_len in self._lengths]
+        return self._sorted
+
+    def lookup_many(self, addresses):
+        """
+        Finds the longest matching prefix for every address in an array.
+
+        Parameters:
+            addresses (array-like): IPv4 address integers.
+
+        Returns:
+            tuple: Two NumPy arrays, the matching network integers (uint32) and
+            prefix lengths (int8, -1 where nothing matched).
+        """
+        import numpy as np
+        addresses = np.asarray(addresses, dtype=np.uint32)
+        networks = np.zeros(addresses.shape, dtype=np.uint32)
+        prefixes = np.full(addresses.shape, -1, dtype=np.int8)
+
+        pending = np.arange(addresses.size)
+        for prefix_len, keys in self._sorted_tables():
+            if not pending.size:
+                break
+            candidates = addresses[pending] & np.uint32(_mask(prefix_len))
+            position = np.minimum(np.searchsorted(keys, candidates), keys.size - 1)
+            hit = keys[position] == candidates
+            matched = pending[hit]
+            networks[matched] = candidates[hit]
+            prefixes[matched] = prefix_len
+            pending = pending[~hit]
+        return networks, prefixes
@@ -0,0 +1,69 @@
+'''By Ray Bernard ray.bernard@outlook.com
+     MIT License '''
+import random
+import unittest
+from ipaddress import IPv4Address, IPv4Network
+import numpy as np
+from cidr.prefix_index import PrefixIndex
+
+
+def naive_lookup(networks, address):
+    best = None
+    for network in networks:
+        if IPv4Address(address) in network and (best is None or network.prefixlen > best.prefixlen):
+            best = network
+    return best
+
+
+class TestPrefixIndex(unittest.TestCase):
+    def setUp(self):
+        self.ip_list = ['0.0.0.0/0', '10.0.0.0/8', '10.1.0.0/16', '10.1.2.0/24', '10.1.2.3/32', '192.168.1.10/26']
+        self.index = PrefixIndex(self.ip_list)
+
+    def test_lookup(self):
+        self.assertEqual(self.index.lookup('10.1.2.3'), '10.1.2.3/32')
+        self.assertEqual(self.index.lookup('10.1.2.4'), '10.1.2.0/24')
+        self.assertEqual(self.index.lookup('10.1.3.4'), '10.1.0.0/16')
+        self.assertEqual(self.index.lookup('10.2.0.0'), '10.0.0.0/8')
+        self.assertEqual(self.index.lookup('192.168.1.63'), '192.168.1.0/26')
+        self.assertEqual(self.index.lookup('8.8.8.8'), '0.0.0.0/0')
+        self.assertEqual(self.index.lookup_prefix(0x0A010204), (0x0A010200, 24))
+
+    def test_insert_and_delete(self):
+        self.index.delete('0.0.0.0/0')
+        self.assertIsNone(self.index.lookup('8.8.8.8'))
+        self.index.insert('8.8.8.0/24', 'google')
+        self.assertEqual(self.index.lookup('8.8.8.8'), 'google')
+        self.assertEqual(self.index.delete('10.1.2.3/32'), '10.1.2.3/32')
+        self.assertEqual(self.index.lookup('10.1.2.3'), '10.1.2.0/24')
+        self.assertNotIn('10.1.2.3/32', self.index)
+        self.assertEqual(len(self.index), 5)
+        with self.assertRaises(KeyError):
+            self.index.delete('10.1.2.3/32')
+
+    def test_lookup_many_matches_naive_scan(self):
+        rng = random.Random(1)
+        ip_list = [f"{rng.choice([10, 172, 192])}.{rng.randrange(4)}.{rng.randrange(256)}.0/{rng.randrange(8, 29)}"
+                   for _ in range(200)]
+        index = PrefixIndex(ip_list)
+        networks = [IPv4Network(ip_cidr, strict=False) for ip_cidr in ip_list]
+        addresses = np.array([int(IPv4Address(f"{rng.choice([10, 172, 192])}.{rng.randrange(4)}.{rng.randrange(256)}.{rng.randrange(256)}"))
+                              for _ in range(500)], dtype=np.uint32)
+        found_networks, found_prefixes = index.lookup_many(addresses)
+        for address, network, prefix_len in zip(addresses.tolist(), found_networks.tolist(), found_prefixes.tolist()):
+            expected = naive_lookup(networks, address)
+            if expected is None:
+                self.assertEqual(prefix_len, -1)
+            else:
+                self.assertEqual((network, prefix_len), (int(expected.network_address), expected.prefixlen))
+
+    def test_lookup_many_sees_updates(self):
+        addresses = np.array([0x08080808], dtype=np.uint32)
+        self.index.delete('0.0.0.0/0')
+        self.assertEqual(self.index.lookup_many(addresses)[1].tolist(), [-1])
+        self.index.insert('8.0.0.0/8')
+        self.assertEqual(self.index.lookup_many(addresses)[1].tolist(), [8])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+'''By Ray Bernard ray.bernard@outlook.com
+     MIT License '''
+import numpy as np
+
+from .batch import _OCTETS, NetworkBatch
+from .report import stream_to_csv
+
+
+_ADDRESS_MAX = 0xFFFFFFFF
+# The last octet and prefix length of a block as one string, indexed by octet * 33 + prefix
+_TAILS = [f"{octet}/{prefix}" for octet in range(256) for prefix in range(33)]
+
+
+def _as_ranges(starts, ends):
+    starts = np.asarray(starts, dtype=np.int64)
+    ends = np.asarray(ends, dtype=np.int64)
+    if starts.shape != ends.shape or starts.ndim != 1:
+        raise ValueError("Starts and ends must be one-dimensional arrays of the same length.")
+    if starts.size and (starts.min() < 0 or ends.max() > _ADDRESS_MAX or (ends < starts).any()):
+        raise ValueError("Ranges must lie between 0 and 2**32 - 1 and end after they start.")
+    return starts, ends
+
+
+def ranges_to_blocks(starts, ends):
+    """
+    Splits inclusive address ranges into the fewest CIDR blocks that cover each exactly.
+
+    Every range gives up one block per round: the largest block aligned at
+    the range's next address that does not run past its end, found from the
+    lowest set bit of the address and the highest set bit of the remaining
+    length. All ranges still open take the round together as a few vector
+    operations, and a range of IPv4 addresses needs at most 62 rounds, so
+    the cost follows the number of blocks, not the number of addresses.
+
+    Parameters:
+        starts (array-like): The first address integer of each range.
+        ends (array-like): The last address integer of each range, inclusive.
+
+    Returns:
+        tuple: uint32 network, uint8 prefix length and int64 range index
+        arrays, one entry per block, ranges in input order and each range's
+        blocks in address order. The same blocks as range_to_cidrs and
+        ipaddress.summarize_address_range.
+    """
+    starts, ends = _as_ranges(starts, ends)
+    networks, prefixes, owners = [], [], []
+    active = np.arange(starts.size)
+    current = starts
+    remaining_ends = ends
+    while active.size:
+        # The lowest set bit is the largest block aligned at the address; 0 is aligned to everything
+        aligned = np.where(current > 0, current & -current, np.int64(1 << 32))
+        # frexp is exact here: lengths are at most 2**32, far below 2**53
+        _, exponent = np.frexp((remaining_ends - current + 1).astype(np.float64))
+        size = np.minimum(aligned, np.left_shift(np.int64(1), exponent.astype(np.int64) - 1))
+        _, size_exponent = np.frexp(size.astype(np.float64))
+        networks.append(current)
+        prefixes.append(33 - size_exponent)
+        owners.append(active)
+
+        current = current + size
+        open_ranges = current <= remaining_ends
+        active = active[open_ranges]
+        current = current[open_ranges]
+        remaining_ends = remaining_ends[open_ranges]
+
+    if not networks:
+        return np.empty(0, dtype=np.uint32), np.empty(0, dtype=np.uint8), np.empty(0, dtype=np.int64)
+    owners = np.concatenate(owners)
+    # Rounds were appended in order, so a stable sort by range keeps each range's blocks in address order
+    order = np.argsort(owners, kind='stable')
+    return (np.concatenate(networks)[order].astype(np.uint32), np.concatenate(prefixes)[order].astype(np.uint8),
+            owners[order])
+
+
+def ranges_to_cidrs(starts, ends):
+    """
+    Converts inclusive address ranges to the minimal list of CIDR strings covering them.
+
+    The result can be passed straight to the report writers.
+
+    Parameters:
+        starts (array-like): The first address integer of each range.
+        ends (array-like): The last address integer of each range, inclusive.
+
+    Returns:
+        list: CIDR strings, ranges in input order and each range's blocks in address order.
+    """
+    networks, prefixes, _ = ranges_to_blocks(starts, ends)
+    octets, tails = _OCTETS, _TAILS
+    return ['.'.join((octets[a], octets[b], octets[c], tails[d])) for a, b, c, d in zip(
+        (networks >> 24).tolist(),
+        ((networks >> 16) & 0xFF).tolist(),
+        ((networks >> 8) & 0xFF).tolist(),
+        ((networks & 0xFF).astype(np.int64) * 33 + prefixes).tolist())]
+
+
+def ranges_to_batch(starts, ends):
+    """
+    Computes the report columns for the CIDR blocks of address ranges, without making CIDR strings to parse.
+
+    Parameters:
+        starts (array-like): The first address integer of each range.
+        ends (array-like): The last address integer of each range, inclusive.
+
+    Returns:
+        tuple: The NetworkBatch of the blocks, and the int64 range index of each block.
+    """
+    networks, prefixes, owners = ranges_to_blocks(starts, ends)
+    return NetworkBatch(networks, prefixes), owners
+
+
+def write_ranges_csv(starts, ends, filename):
+    """
+    Writes the CIDR blocks of address ranges to a CSV file in the write_to_csv layout.
+
+    Parameters:
+        starts (array-like): The first address integer of each range.
+        ends (array-like): The last address integer of each range, inclusive.
+        filename (str): The name of the CSV file to write to.
+
+    Returns:
+        int: The number of CIDR blocks written.
+    """
+    return stream_to_csv(ranges_to_cidrs(starts, ends), filename)
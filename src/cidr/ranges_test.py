@@ -0,0 +1,64 @@
+'''By Ray Bernard ray.bernard@outlook.com
+     MIT License '''
+import csv
+import os
+import tempfile
+import unittest
+from ipaddress import IPv4Address, summarize_address_range
+import numpy as np
+from cidr.aggregate import range_to_cidrs
+from cidr.ranges import ranges_to_batch, ranges_to_blocks, ranges_to_cidrs, write_ranges_csv
+from cidr.report import HEADERS, compute_rows
+
+
+def stdlib_cidrs(starts, ends):
+    return [str(network) for start, end in zip(starts, ends)
+            for network in summarize_address_range(IPv4Address(start), IPv4Address(end))]
+
+
+class TestRanges(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(5)
+        self.starts = rng.integers(0, 1 << 32, 2000)
+        self.ends = np.minimum(self.starts + rng.integers(0, 1 << 24, 2000), 0xFFFFFFFF)
+        self.starts[:5] = [0, 0, 5, 0xFFFFFFFF, 0x0A000001]
+        self.ends[:5] = [0xFFFFFFFF, 0, 5, 0xFFFFFFFF, 0x0A0000FE]
+
+    def test_matches_stdlib(self):
+        self.assertEqual(ranges_to_cidrs(self.starts, self.ends),
+                         stdlib_cidrs(self.starts.tolist(), self.ends.tolist()))
+        self.assertEqual(ranges_to_cidrs([0x0A000001], [0x0A0000FE]),
+                         ['10.0.0.1/32', '10.0.0.2/31', '10.0.0.4/30', '10.0.0.8/29', '10.0.0.16/28',
+                          '10.0.0.32/27', '10.0.0.64/26', '10.0.0.128/26', '10.0.0.192/27', '10.0.0.224/28',
+                          '10.0.0.240/29', '10.0.0.248/30', '10.0.0.252/31', '10.0.0.254/32'])
+
+    def test_blocks_and_owners(self):
+        networks, prefixes, owners = ranges_to_blocks(self.starts, self.ends)
+        expected = [(owner, block) for owner, (start, end) in enumerate(zip(self.starts.tolist(), self.ends.tolist()))
+                    for block in range_to_cidrs(start, end)]
+        self.assertEqual(list(zip(owners.tolist(), zip(networks.tolist(), prefixes.tolist()))), expected)
+        self.assertEqual((networks.dtype, prefixes.dtype, owners.dtype), (np.uint32, np.uint8, np.int64))
+
+        networks, prefixes, owners = ranges_to_blocks([], [])
+        self.assertEqual((networks.size, prefixes.size, owners.size), (0, 0, 0))
+
+    def test_invalid_ranges(self):
+        for starts, ends in [([5], [4]), ([-1], [3]), ([0], [1 << 32]), ([1, 2], [3])]:
+            with self.assertRaises(ValueError):
+                ranges_to_blocks(starts, ends)
+
+    def test_report_writers(self):
+        batch, owners = ranges_to_batch([0xC0A80000, 0x0A000000], [0xC0A801FF, 0x0A000002])
+        cidrs = ['192.168.0.0/23', '10.0.0.0/31', '10.0.0.2/32']
+        self.assertEqual(owners.tolist(), [0, 1, 1])
+        self.assertEqual(batch.rows()[0][1:], compute_rows(cidrs, batch=False)[0][1:])
+
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = os.path.join(tmp, 'ranges.csv')
+            self.assertEqual(write_ranges_csv([0xC0A80000, 0x0A000000], [0xC0A801FF, 0x0A000002], filename), 3)
+            with open(filename, newline='') as file:
+                self.assertEqual(list(csv.reader(file)), [HEADERS] + compute_rows(cidrs, batch=False))
+
+
+if __name__ == '__main__':
+    unittest.main()
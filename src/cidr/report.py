@@ -0,0 +1,305 @@
+'''By Ray Bernard ray.bernard@outlook.com
+     MIT License '''
+from itertools import islice
+import contextlib
+import sys
+
+from .network_calculator import Compact_Network_Calculator, Network_Calculator
+
+
+HEADERS = ['CIDR', 'Subnet Mask', 'Network ID', 'Next Network', 'Broadcast ID', 'First IP', 'Last IP', 'Total IPs']
+FIELDS = [header.lower().replace(' ', '_') for header in HEADERS]
+TABLE_FORMAT = "{:<15} {:<15} {:<15} {:<15} {:<15} {:<15} {:<15} {:<15}"
+
+DEFAULT_CHUNK_ROWS = 65536
+WRITE_BUFFER_SIZE = 1 << 20
+
+_NULL_STAGE = contextlib.nullcontext()
+
+
+def _no_stage(name):
+    # Stands in for Instrumentation.stage when no instrument is given, so nothing is timed
+    return _NULL_STAGE
+
+
+def _numpy_available():
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+# How the per-object path gets each column from the CIDR text and its calculator
+_GETTERS = {
+    'CIDR': lambda ip_cidr, net_calc: ip_cidr,
+    'Subnet Mask': lambda ip_cidr, net_calc: net_calc.get_subnet_mask(),
+    'Network ID': lambda ip_cidr, net_calc: net_calc.get_network_id(),
+    'Next Network': lambda ip_cidr, net_calc: net_calc.get_next_network(),
+    'Broadcast ID': lambda ip_cidr, net_calc: net_calc.get_broadcast_id(),
+    'First IP': lambda ip_cidr, net_calc: net_calc.get_first_ip(),
+    'Last IP': lambda ip_cidr, net_calc: net_calc.get_last_ip(),
+    'Total IPs': lambda ip_cidr, net_calc: str(net_calc.get_total_ips()),
+}
+
+
+def select_columns(columns=None):
+    """
+    Resolves a column selection to report headers.
+
+    Parameters:
+        columns (list): Headers such as 'Network ID' or field names such as
+            'network_id', in the order wanted. None selects every column.
+
+    Returns:
+        list: The selected headers, in the order given.
+    """
+    if columns is None:
+        return list(HEADERS)
+    if isinstance(columns, str):
+        columns = columns.split(',')
+    headers = []
+    for column in columns:
+        name = column.strip().lower().replace(' ', '_').replace('-', '_')
+        if name not in FIELDS:
+            raise ValueError(f"Unknown column {column!r}; choose from {', '.join(FIELDS)}")
+        headers.append(HEADERS[FIELDS.index(name)])
+    if not headers:
+        raise ValueError("Select at least one column.")
+    return headers
+
+
+def compute_rows(ip_list, batch=None, cache=None, instrument=None, columns=None):
+    """
+    Computes report rows for a list of CIDRs. IPv4 and IPv6 CIDRs may be mixed.
+
+    Parameters:
+        ip_list (list): A list of IP addresses with CIDR notation.
+        batch (bool): Use the NumPy batch engine. None uses it when NumPy is installed.
+        cache (NetworkCache): Reuse the fields of networks already seen. Takes precedence over batch.
+        instrument (Instrumentation): Times the parse, compute and format stages.
+        columns (list): The columns to compute, see select_columns. Columns
+            left out are never formatted. None computes all eight.
+
+    Returns:
+        list: One list of strings per CIDR, in the write_to_csv column order
+        or in the order of columns.
+    """
+    stage = instrument.stage if instrument is not None else _no_stage
+    columns = select_columns(columns)
+    everything = columns == HEADERS
+    if cache is not None:
+        with stage('compute'):
+            if everything:
+                return [cache.row(ip_cidr) for ip_cidr in ip_list]
+            indexes = [HEADERS.index(header) for header in columns]
+            rows = [cache.row(ip_cidr) for ip_cidr in ip_list]
+            return [[row[index] for index in indexes] for row in rows]
+    if batch is None:
+        batch = _numpy_available()
+    if batch:
+        return _batch_rows(ip_list, stage, None if everything else columns)
+
+    return _object_rows(ip_list, _compact_calculator, stage, columns)
+
+
+def _compact_calculator(ip_cidr):
+    return Network_Calculator(ip_cidr) if ':' in ip_cidr else Compact_Network_Calculator(ip_cidr)
+
+
+def _object_rows(ip_list, calculator, stage, columns):
+    """
+    Computes rows with one calculator object per CIDR, formatting only the selected columns.
+    """
+    # The per-object calculators compute each field as it is formatted
+    with stage('parse'):
+        calculators = [calculator(ip_cidr) for ip_cidr in ip_list]
+    with stage('format'):
+        if columns != HEADERS:
+            getters = [_GETTERS[header] for header in columns]
+            return [[getter(ip_cidr, net_calc) for getter in getters]
+                    for ip_cidr, net_calc in zip(ip_list, calculators)]
+        return [[
+            ip_cidr,
+            net_calc.get_subnet_mask(),
+            net_calc.get_network_id(),
+            net_calc.get_next_network(),
+            net_calc.get_broadcast_id(),
+            net_calc.get_first_ip(),
+            net_calc.get_last_ip(),
+            str(net_calc.get_total_ips())
+        ] for ip_cidr, net_calc in zip(ip_list, calculators)]
+
+
+def _batch_rows(ip_list, stage=_no_stage, columns=None):
+    """
+    Computes rows with the IPv4 and IPv6 batch engines, keeping the input order.
+    """
+    from .batch import NetworkBatch, cidr_arrays
+    ip_list = list(ip_list)
+    v6_rows = [index for index, ip_cidr in enumerate(ip_list) if ':' in ip_cidr]
+    if not v6_rows:
+        return _engine_rows(NetworkBatch, cidr_arrays, ip_list, stage, columns)
+
+    from .batch6 import NetworkBatch6, cidr_arrays6
+    rows = [None] * len(ip_list)
+    v6_list = [ip_list[index] for index in v6_rows]
+    for index, row in zip(v6_rows, _engine_rows(NetworkBatch6, cidr_arrays6, v6_list, stage, columns)):
+        rows[index] = row
+    v4_rows = [index for index, row in enumerate(rows) if row is None]
+    if v4_rows:
+        v4_list = [ip_list[index] for index in v4_rows]
+        for index, row in zip(v4_rows, _engine_rows(NetworkBatch, cidr_arrays, v4_list, stage, columns)):
+            rows[index] = row
+    return rows
+
+
+def _engine_rows(engine, parse, ip_list, stage, columns=None):
+    with stage('parse'):
+        arrays = parse(ip_list)
+    with stage('compute'):
+        computed = engine(*arrays, ip_list)
+    with stage('format'):
+        return computed.rows(columns)
+
+
+def iter_chunks(ip_cidrs, chunk_size=DEFAULT_CHUNK_ROWS):
+    """
+    Groups an iterable of CIDRs into lists of at most chunk_size entries.
+
+    Line endings are removed and blank lines are skipped, so a file handle
+    or sys.stdin can be passed directly.
+
+    Parameters:
+        ip_cidrs (iterable): CIDR strings, for example an open file.
+        chunk_size (int): The maximum number of CIDRs per chunk.
+
+    Returns:
+        generator: Lists of CIDR strings.
+    """
+    lines = (line.rstrip('\r\n') for line in ip_cidrs)
+    lines = (line for line in lines if line.strip())
+    while True:
+        chunk = list(islice(lines, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def write_report(ip_cidrs, sink, columns=None, chunk_size=DEFAULT_CHUNK_ROWS, progress=None, batch=None, cache=None,
+                 instrument=None):
+    """
+    Writes information about a stream of networks to a sink, one chunk at a time.
+
+    Only the selected columns are computed and formatted. Memory use depends
+    on chunk_size only, not on the length of the input.
+
+    Parameters:
+        ip_cidrs (iterable): CIDR strings, for example an open file or sys.stdin.
+        sink (Sink): Where the rows go, for example CsvSink('network.csv') or JsonlSink(sys.stdout).
+        columns (list): The columns to write, see select_columns. None writes all eight.
+        chunk_size (int): The number of CIDRs computed and written per pass.
+        progress (callable): Called with the running row count after each chunk.
+        batch (bool): Use the NumPy batch engine. None uses it when NumPy is installed.
+        cache (NetworkCache): Reuse the fields of networks already seen.
+        instrument (Instrumentation): Records stage timings and the rows, bytes_written and errors counters.
+
+    Returns:
+        int: The number of rows written, not counting any header.
+    """
+    stage = instrument.stage if instrument is not None else _no_stage
+    columns = select_columns(columns)
+    with stage('write'):
+        written = sink.open(columns)
+    if instrument is not None and written:
+        instrument.count('bytes_written', written)
+    count = 0
+    try:
+        for chunk in iter_chunks(ip_cidrs, chunk_size):
+            rows = compute_rows(chunk, batch, cache, instrument, columns)
+            with stage('write'):
+                written = sink.write(rows)
+            count += len(rows)
+            if instrument is not None:
+                instrument.count('rows', len(rows))
+                instrument.count('bytes_written', written)
+            if progress is not None:
+                progress(count)
+    finally:
+        written = sink.close()
+    if instrument is not None and written:
+        instrument.count('bytes_written', written)
+    return count
+
+
+def write_rows(rows, sink, columns=None, instrument=None):
+    """
+    Writes rows that are already computed to a sink, header first.
+
+    Parameters:
+        rows (list): Lists of strings in the order of columns.
+        sink (Sink): Where the rows go, for example CsvSink('network.csv').
+        columns (list): The columns of the rows, see select_columns. None means all eight.
+        instrument (Instrumentation): Records the write stage and the rows and bytes_written counters.
+
+    Returns:
+        int: The number of rows written, not counting any header.
+    """
+    stage = instrument.stage if instrument is not None else _no_stage
+    with stage('write'):
+        written = sink.open(select_columns(columns))
+        try:
+            written += sink.write(rows)
+        finally:
+            written += sink.close()
+    if instrument is not None:
+        instrument.count('rows', len(rows))
+        instrument.count('bytes_written', written)
+    return len(rows)
+
+
+def stream_network_info(ip_cidrs, file=None, chunk_size=DEFAULT_CHUNK_ROWS, progress=None, batch=None, cache=None,
+                        instrument=None, columns=None):
+    """
+    Prints information about a stream of networks, one chunk at a time.
+
+    Parameters:
+        ip_cidrs (iterable): CIDR strings, for example an open file or sys.stdin.
+        file: The text stream to print to. Defaults to sys.stdout.
+        chunk_size (int): The number of CIDRs computed and written per pass.
+        progress (callable): Called with the running row count after each chunk.
+        batch (bool): Use the NumPy batch engine. None uses it when NumPy is installed.
+        cache (NetworkCache): Reuse the fields of networks already seen.
+        instrument (Instrumentation): Records stage timings and the rows, bytes_written and errors counters.
+        columns (list): The columns to print, see select_columns. None prints all eight.
+
+    Returns:
+        int: The number of rows printed.
+    """
+    from .sinks import TableSink
+    return write_report(ip_cidrs, TableSink(sys.stdout if file is None else file), columns, chunk_size, progress,
+                        batch, cache, instrument)
+
+
+def stream_to_csv(ip_cidrs, filename, chunk_size=DEFAULT_CHUNK_ROWS, progress=None, batch=None, cache=None,
+                  instrument=None, columns=None):
+    """
+    Writes information about a stream of networks to a CSV file, one chunk at a time.
+
+    Memory use depends on chunk_size only, not on the length of the input.
+
+    Parameters:
+        ip_cidrs (iterable): CIDR strings, for example an open file or sys.stdin.
+        filename: The name of the CSV file to write to, or an open text file.
+        chunk_size (int): The number of CIDRs computed and written per pass.
+        progress (callable): Called with the running row count after each chunk.
+        batch (bool): Use the NumPy batch engine. None uses it when NumPy is installed.
+        cache (NetworkCache): Reuse the fields of networks already seen.
+        instrument (Instrumentation): Records stage timings and the rows, bytes_written and errors counters.
+        columns (list): The columns to write, see select_columns. None writes all eight.
+
+    Returns:
+        int: The number of rows written, not counting the header.
+    """
+    from .sinks import CsvSink
+    return write_report(ip_cidrs, CsvSink(filename), columns, chunk_size, progress, batch, cache, instrument)
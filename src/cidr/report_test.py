@@ -0,0 +1,59 @@
+'''By Ray Bernard ray.bernard@outlook.com
+     MIT License '''
+import csv
+import io
+import os
+import tempfile
+import unittest
+from cidr.network_calculator import Network_Calculator
+from cidr.report import compute_rows, iter_chunks, stream_network_info, stream_to_csv
+
+
+class TestReport(unittest.TestCase):
+    def setUp(self):
+        self.ip_list = ['198.51.100.0/22 ', '192.168.1.10/26', '172.16.0.5/16', '10.1.2.3/31', '10.1.2.3/32']
+
+    def read_csv(self, filename):
+        with open(filename, newline='') as file:
+            return list(csv.reader(file))
+
+    def test_compute_rows_paths_agree(self):
+        self.assertEqual(compute_rows(self.ip_list, batch=True), compute_rows(self.ip_list, batch=False))
+
+    def test_iter_chunks(self):
+        lines = io.StringIO('10.0.0.0/8\n\n192.168.0.0/16\r\n172.16.0.0/12\n')
+        self.assertEqual(list(iter_chunks(lines, 2)), [['10.0.0.0/8', '192.168.0.0/16'], ['172.16.0.0/12']])
+
+    def test_stream_to_csv_matches_write_to_csv(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            expected = os.path.join(tmp, 'expected.csv')
+            streamed = os.path.join(tmp, 'streamed.csv')
+            Network_Calculator.write_to_csv(self.ip_list, expected)
+            progress = []
+            count = Network_Calculator.stream_to_csv(iter(self.ip_list), streamed, chunk_size=2, progress=progress.append)
+            self.assertEqual(count, 5)
+            self.assertEqual(progress, [2, 4, 5])
+            self.assertEqual(self.read_csv(streamed), self.read_csv(expected))
+
+    def test_stream_from_file_handle(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            source = os.path.join(tmp, 'cidrs.txt')
+            output = os.path.join(tmp, 'network.csv')
+            with open(source, 'w') as file:
+                file.write('\n'.join(self.ip_list) + '\n')
+            for batch in (True, False):
+                with open(source) as file:
+                    self.assertEqual(stream_to_csv(file, output, chunk_size=3, batch=batch), 5)
+                self.assertEqual(len(self.read_csv(output)), 6)
+
+    def test_stream_network_info(self):
+        out = io.StringIO()
+        self.assertEqual(stream_network_info(self.ip_list, out, chunk_size=2), 5)
+        lines = out.getvalue().splitlines()
+        self.assertEqual(len(lines), 6)
+        self.assertTrue(lines[0].startswith('CIDR'))
+        self.assertTrue(lines[2].startswith('192.168.1.10/26 255.255.255.192'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,226 @@
+'''By Ray Bernard ray.bernard@outlook.com
+     MIT License '''
+import csv
+import io
+import json
+
+from .report import FIELDS, HEADERS, WRITE_BUFFER_SIZE
+
+
+# Every sink takes the selected report headers in open(), then lists of
+# strings in that column order in write(). open(), write() and close()
+# return the number of bytes written, the header included.
+
+
+# JSON keys and Arrow field names, e.g. 'Network ID' -> 'network_id'
+FIELD_NAMES = dict(zip(HEADERS, FIELDS))
+
+
+class Sink:
+    """
+    The base class of the report outputs.
+
+    A sink takes a file name or an open file. Files it opened itself are
+    closed by close(); files passed in are left open.
+    """
+    binary = False
+
+    def __init__(self, file):
+        """
+        Constructor of the Sink class
+
+        Parameters:
+            file: The name of the file to write to, or an open file.
+
+        Returns:
+            None
+        """
+        self.file = file
+        self.columns = None
+        self._owned = None
+
+    def open(self, columns):
+        """
+        Opens the output and writes any header.
+
+        Parameters:
+            columns (list): The report headers of the columns that follow, in order.
+
+        Returns:
+            int: The bytes written for the header.
+        """
+        self.columns = list(columns)
+        if not hasattr(self.file, 'write'):
+            if self.binary:
+                self.file = self._owned = open(self.file, 'wb')
+            else:
+                self.file = self._owned = open(self.file, 'w', newline='', buffering=WRITE_BUFFER_SIZE)
+        return 0
+
+    def _write_text(self, text):
+        """
+        Writes text to the file and returns its size in bytes once encoded.
+        """
+        self.file.write(text)
+        if text.isascii():
+            return len(text)
+        return len(text.encode(getattr(self.file, 'encoding', None) or 'utf-8'))
+
+    def write(self, rows):
+        """
+        Writes a chunk of rows.
+
+        Parameters:
+            rows (list): Lists of strings, one per selected column.
+
+        Returns:
+            int: The bytes written.
+        """
+        raise NotImplementedError
+
+    def close(self):
+        """
+        Writes anything still buffered, and closes the file if the sink opened it.
+
+        Parameters:
+            None
+
+        Returns:
+            int: The bytes written while flushing.
+        """
+        if self._owned is not None:
+            self._owned.close()
+            self._owned = None
+        return 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()
+        return False
+
+
+class CsvSink(Sink):
+    """
+    Writes rows as CSV with a header line, the same as write_to_csv.
+    """
+
+    def open(self, columns):
+        super().open(columns)
+        # Rows are formatted into a buffer and written once per chunk
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer)
+        self._writer.writerow(self.columns)
+        return self._flush()
+
+    def _flush(self):
+        text = self._buffer.getvalue()
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        return self._write_text(text)
+
+    def write(self, rows):
+        self._writer.writerows(rows)
+        return self._flush()
+
+    def close(self):
+        written = self._flush() if self.columns is not None and self._buffer.tell() else 0
+        return written + super().close()
+
+
+class TableSink(Sink):
+    """
+    Writes rows as fixed-width text, the same as print_network_info.
+    """
+
+    def __init__(self, file, width=15):
+        """
+        Constructor of the TableSink class
+
+        Parameters:
+            file: The name of the file to write to, or an open text file.
+            width (int): The minimum width of each column.
+
+        Returns:
+            None
+        """
+        super().__init__(file)
+        self.width = width
+
+    def open(self, columns):
+        super().open(columns)
+        self._format = ' '.join(['{:<%d}' % self.width] * len(self.columns)) + '\n'
+        return self._write_text(self._format.format(*self.columns))
+
+    def write(self, rows):
+        line = self._format
+        return self._write_text(''.join([line.format(*row) for row in rows]))
+
+
+class JsonlSink(Sink):
+    """
+    Writes one JSON object per row, keyed by field name, e.g. 'network_id'.
+
+    Total IPs is written as a number; the other columns are strings.
+    """
+
+    def open(self, columns):
+        super().open(columns)
+        self._keys = [FIELD_NAMES[header] for header in self.columns]
+        self._total = self.columns.index('Total IPs') if 'Total IPs' in self.columns else None
+        return 0
+
+    def write(self, rows):
+        keys = self._keys
+        total = self._total
+        dumps = json.JSONEncoder(separators=(',', ':')).encode
+        lines = []
+        for row in rows:
+            record = dict(zip(keys, row))
+            if total is not None:
+                record[keys[total]] = int(row[total])
+            lines.append(dumps(record))
+        return self._write_text('\n'.join(lines) + '\n' if lines else '')
+
+
+class ArrowSink(Sink):
+    """
+    Writes rows to an Arrow IPC file, one record batch per chunk.
+
+    Columns are named by field name, e.g. 'network_id', and hold strings, the same text
+    as the CSV report, so IPv6 host counts are exact. pyarrow is needed and
+    is imported when the sink is opened.
+    """
+    binary = True
+
+    def open(self, columns):
+        import pyarrow
+        self._pyarrow = pyarrow
+        super().open(columns)
+        self._schema = pyarrow.schema([(FIELD_NAMES[header], pyarrow.string()) for header in self.columns])
+        self._writer = pyarrow.ipc.new_file(self.file, self._schema)
+        return 0
+
+    def write(self, rows):
+        if not rows:
+            return 0
+        pyarrow = self._pyarrow
+        arrays = [pyarrow.array(column, pyarrow.string()) for column in zip(*rows)]
+        batch = pyarrow.RecordBatch.from_arrays(arrays, schema=self._schema)
+        self._writer.write_batch(batch)
+        return batch.nbytes
+
+    def close(self):
+        if self.columns is not None and self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        return super().close()
+
+
+SINKS = {
+    'csv': CsvSink,
+    'table': TableSink,
+    'jsonl': JsonlSink,
+    'arrow': ArrowSink,
+}
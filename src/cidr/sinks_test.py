@@ -0,0 +1,69 @@
+'''By Ray Bernard ray.bernard@outlook.com
+     MIT License '''
+import csv
+import importlib.util
+import io
+import json
+import os
+import tempfile
+import unittest
+from cidr.report import HEADERS, compute_rows, select_columns, write_report
+from cidr.sinks import ArrowSink, CsvSink, JsonlSink, TableSink
+
+
+class TestSinks(unittest.TestCase):
+    def setUp(self):
+        self.ip_list = ['198.51.100.0/22', '192.168.1.10/26', '10.1.2.3/31', '2001:db8::/64']
+
+    def test_select_columns(self):
+        self.assertEqual(select_columns(None), HEADERS)
+        self.assertEqual(select_columns(['total_ips', 'Network ID']), ['Total IPs', 'Network ID'])
+        self.assertEqual(select_columns('cidr, first-ip'), ['CIDR', 'First IP'])
+        with self.assertRaises(ValueError):
+            select_columns(['netmask'])
+        with self.assertRaises(ValueError):
+            select_columns([])
+
+    def test_projection_matches_full_rows(self):
+        full = compute_rows(self.ip_list, batch=False)
+        columns = ['Total IPs', 'Network ID']
+        expected = [[row[7], row[2]] for row in full]
+        for batch in (False, True):
+            self.assertEqual(compute_rows(self.ip_list, batch=batch, columns=columns), expected)
+
+    def test_csv_and_table(self):
+        out = io.StringIO()
+        self.assertEqual(write_report(self.ip_list, CsvSink(out), ['cidr', 'last_ip'], chunk_size=2), 4)
+        rows = list(csv.reader(io.StringIO(out.getvalue())))
+        self.assertEqual(rows[:2], [['CIDR', 'Last IP'], ['198.51.100.0/22', '198.51.103.254']])
+        self.assertEqual(len(rows), 5)
+
+        out = io.StringIO()
+        write_report(self.ip_list, TableSink(out), ['network_id', 'subnet_mask'])
+        lines = out.getvalue().splitlines()
+        self.assertEqual(lines[0], 'Network ID      Subnet Mask    ')
+        self.assertEqual(lines[1], '198.51.100.0    255.255.252.0  ')
+
+    def test_jsonl(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = os.path.join(tmp, 'network.jsonl')
+            write_report(self.ip_list, JsonlSink(filename), ['network_id', 'total_ips'], batch=True)
+            with open(filename) as file:
+                records = [json.loads(line) for line in file]
+        self.assertEqual(records[0], {'network_id': '198.51.100.0', 'total_ips': 1022})
+        self.assertEqual(records[3], {'network_id': '2001:db8::', 'total_ips': (1 << 64) - 1})
+
+    @unittest.skipUnless(importlib.util.find_spec('pyarrow'), 'pyarrow is not installed')
+    def test_arrow(self):
+        import pyarrow
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = os.path.join(tmp, 'network.arrow')
+            write_report(self.ip_list, ArrowSink(filename), ['cidr', 'total_ips'], chunk_size=3)
+            with pyarrow.memory_map(filename) as source:
+                table = pyarrow.ipc.open_file(source).read_all()
+        self.assertEqual(table.column_names, ['cidr', 'total_ips'])
+        self.assertEqual(table.column('total_ips').to_pylist(), ['1022', '62', '2', str((1 << 64) - 1)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,60 @@
 '''By Ray Bernard ray.bernard@outlook.com
      MIT License '''
+from functools import lru_cache
+import contextlib
 import csv
 
+
+HEADERS = ["Media Throughput", "Read/Write Ratio", "Initial Data Size", "Disk Space Required (Read)",
+           "Disk Space Required (Write)", "Bandwidth Required (Read)", "Bandwidth Required (Write)", "Transfer Time"]
+
+_NULL_STAGE = contextlib.nullcontext()
+
+
+def _no_stage(name):
+    # The stage used by the writers below when they are given no instrument
+    return _NULL_STAGE
+
+
+# Feed inventories repeat a handful of unit strings, so each one is parsed once
+@lru_cache(maxsize=4096)
+def convert_to_mbps(media_throughput):
+    """
+    Converts a media throughput such as '10 Gbps' to Mbps.
+    """
+    size, unit = media_throughput.split()
+    size = float(size)
+    if unit.lower() == 'gbps':
+        size *= 1000
+    elif unit.lower() == 'tbps':
+        size *= 1000000
+    return size
+
+
+@lru_cache(maxsize=4096)
+def convert_to_gb(initial_data_size):
+    """
+    Converts a data size such as '1 TB' to GB.
+    """
+    size, unit = initial_data_size.split()
+    size = float(size)
+    if unit.lower() == 'tb':
+        size *= 1024  # 1 TB = 1024 GB
+    elif unit.lower() == 'pb':
+        size *= 1024 * 1024  # 1 PB = 1024 TB = 1024 * 1024 GB
+    return size
+
+
+def convert_seconds_to_time(seconds):
+    """
+    Converts the given time in seconds to a more human-readable format.
+    """
+    hours = int(seconds // 3600)
+    minutes = int((seconds % 3600) // 60)
+    seconds = seconds % 60
+    return f"{hours} hours, {minutes} minutes, {seconds:.2f} seconds"
+
+
 class BandwidthCalculator:
     """
     A class used to calculate the disk space, bandwidth, and transfer time required for different media throughputs and read/write ratios.
@@ -30,25 +83,13 @@ class BandwidthCalculator:
         """
         Converts the media throughput to Mbps.
         """
-        size, unit = media_throughput.split()
-        size = float(size)
-        if unit.lower() == 'gbps':
-            size *= 1000
-        elif unit.lower() == 'tbps':
-            size *= 1000000
-        return size
+        return convert_to_mbps(media_throughput)
 
     def convert_to_gb(self, initial_data_size):
         """
         Converts the initial data size to GB.
         """
-        size, unit = initial_data_size.split()
-        size = float(size)
-        if unit.lower() == 'tb':
-            size *= 1024  # 1 TB = 1024 GB
-        elif unit.lower() == 'pb':
-            size *= 1024 * 1024  # 1 PB = 1024 TB = 1024 * 1024 GB
-        return size
+        return convert_to_gb(initial_data_size)
 
     def calculate(self):
         """
@@ -98,33 +139,44 @@ class BandwidthCalculator:
         """
         Converts the given time in seconds to a more human-readable format.
         """
-        hours = int(seconds // 3600)
-        minutes = int((seconds % 3600) // 60)
-        seconds = seconds % 60
-        return f"{hours} hours, {minutes} minutes, {seconds:.2f} seconds"
+        return convert_seconds_to_time(seconds)
 
-    def write_to_csv(self, filename):
+    def write_to_csv(self, filename, instrument=None):
         """
         Writes the results to a CSV file.
+
+        An Instrumentation passed as instrument records the compute and write stages and the rows and bytes written.
         """
-        row = self.calculate()
-        headers = ["Media Throughput", "Read/Write Ratio", "Initial Data Size", "Disk Space Required (Read)", 
-                   "Disk Space Required (Write)", "Bandwidth Required (Read)", "Bandwidth Required (Write)", "Transfer Time"]
-        with open(filename, 'w', newline='') as file:
-            writer = csv.writer(file)
-            writer.writerow(headers)
-            writer.writerow(row)
+        stage = instrument.stage if instrument is not None else _no_stage
+        with stage('compute'):
+            row = self.calculate()
+        headers = HEADERS
+        with stage('write'):
+            with open(filename, 'w', newline='') as file:
+                writer = csv.writer(file)
+                writer.writerow(headers)
+                writer.writerow(row)
+                size = file.tell()
+        if instrument is not None:
+            instrument.count('rows')
+            instrument.count('bytes_written', size)
 
-    def print_to_console(self):
+    def print_to_console(self, instrument=None):
         """
         Prints the results to the console.
+
+        An Instrumentation passed as instrument records the compute and write stages and the rows printed.
         """
-        row = self.calculate()
-        headers = ["Media Throughput", "Read/Write Ratio", "Initial Data Size", "Disk Space Required (Read)", 
-                   "Disk Space Required (Write)", "Bandwidth Required (Read)", "Bandwidth Required (Write)", "Transfer Time"]
+        stage = instrument.stage if instrument is not None else _no_stage
+        with stage('compute'):
+            row = self.calculate()
+        headers = HEADERS
         
-        print("{:<20} {:<20} {:<20} {:<30} {:<30} {:<25} {:<25} {:<20}".format(*headers))
-        print("{:<20} {:<20} {:<20} {:<30} {:<30} {:<25} {:<25} {:<20}".format(*row))
+        with stage('write'):
+            print("{:<20} {:<20} {:<20} {:<30} {:<30} {:<25} {:<25} {:<20}".format(*headers))
+            print("{:<20} {:<20} {:<20} {:<30} {:<30} {:<25} {:<25} {:<20}".format(*row))
+        if instrument is not None:
+            instrument.count('rows')
 
 # Example usage
 if __name__ == "__main__":
@@ -1,5 +1,8 @@
 '''By Ray Bernard ray.bernard@outlook.com
      MIT License '''
+import os
+import subprocess
+import sys
 import unittest
 from bandwidth_calculator import BandwidthCalculator  # Make sure this matches the file name where the class is defined
 
@@ -12,6 +15,13 @@ class TestBandwidthCalculator(unittest.TestCase):
         expected_result = '4 hours, 39 minutes, 37.22 seconds'
         self.assertEqual(result_formatted, expected_result)
 
+    def test_runs_as_a_script(self):
+        # The script must not need the other packages on the path
+        env = {name: value for name, value in os.environ.items() if name != 'PYTHONPATH'}
+        result = subprocess.run([sys.executable, 'bandwidth_calculator.py'], cwd=os.path.dirname(os.path.abspath(__file__)),
+                                env=env, check=True, stdout=subprocess.PIPE, text=True)
+        self.assertIn('4 hours, 39 minutes, 37.22 seconds', result.stdout)
+
     def test_invalid_ratios(self):
         with self.assertRaises(ValueError):
             BandwidthCalculator('1 Gbps', 60, 50, '1 TB')
@@ -0,0 +1,145 @@
+'''By Ray Bernard ray.bernard@outlook.com
+     MIT License '''
+from functools import lru_cache
+from itertools import islice
+import contextlib
+import csv
+import os
+import sys
+
+from .bandwidth_calculator import HEADERS, BandwidthCalculator, _no_stage
+
+
+DEFAULT_CHUNK_ROWS = 8192
+WRITE_BUFFER_SIZE = 1 << 20
+ERROR_HEADERS = ['File', 'Line', 'Input', 'Error']
+
+
+@lru_cache(maxsize=65536)
+def report_row(media_throughput, read_ratio, write_ratio, initial_data_size):
+    """
+    Returns the calculate() row for one feed, computed once per distinct feed.
+
+    Parameters:
+        media_throughput (str): The throughput, e.g. '10 Gbps'.
+        read_ratio (str): The read percentage.
+        write_ratio (str): The write percentage.
+        initial_data_size (str): The data size, e.g. '1 TB'.
+
+    Returns:
+        tuple: The eight report strings.
+    """
+    calculator = BandwidthCalculator(media_throughput, float(read_ratio), float(write_ratio), initial_data_size)
+    return tuple(calculator.calculate())
+
+
+def is_header(fields):
+    """
+    Tells whether a parsed inventory row is the header row.
+
+    Parameters:
+        fields (list): The CSV fields of the row.
+
+    Returns:
+        bool: True when the first field names the media throughput column.
+    """
+    return bool(fields) and fields[0].strip().lower() in ('media throughput', 'media_throughput')
+
+
+@contextlib.contextmanager
+def _open_text(file, mode):
+    if isinstance(file, (str, os.PathLike)):
+        with open(file, mode, newline='', buffering=WRITE_BUFFER_SIZE if mode == 'w' else -1) as opened:
+            yield opened
+    else:
+        yield file
+
+
+def _source_name(source):
+    if isinstance(source, (str, os.PathLike)):
+        return os.fspath(source)
+    return getattr(source, 'name', '-')
+
+
+def process_inventory(source, output, errors=None, chunk_size=DEFAULT_CHUNK_ROWS, instrument=None):
+    """
+    Streams a feed inventory CSV in and writes one combined bandwidth report out.
+
+    Each input row is media throughput, read %, write % and initial data
+    size; a header row and blank rows are skipped. Rows are read, computed
+    and written a chunk at a time, so memory use depends on chunk_size, not
+    on the size of the inventory. A row that fails to parse or validate is
+    reported and the run goes on.
+
+    Parameters:
+        source: The inventory file name, an open file, or an iterable of lines.
+        output: The report file name, or an open text file.
+        errors: Where invalid rows are reported, as CSV with the file, the
+            line number, the input and the error. A file name or an open
+            text file; None reports them on sys.stderr.
+        chunk_size (int): The number of rows computed and written per pass.
+        instrument (Instrumentation): Records the compute and write stages and the rows and errors counters.
+
+    Returns:
+        dict: The number of rows written and of invalid rows.
+    """
+    return process_inventories([source], output, errors, chunk_size, instrument)
+
+
+def process_inventories(sources, output, errors=None, chunk_size=DEFAULT_CHUNK_ROWS, instrument=None):
+    """
+    Streams several feed inventories, one after the other, into one bandwidth report.
+
+    Each source is read as by process_inventory: its own header row is
+    skipped, and invalid rows are reported with the source's name and their
+    line number within that source.
+
+    Parameters:
+        sources (list): Inventory file names, open files, or iterables of lines.
+        output: The report file name, or an open text file.
+        errors: Where invalid rows are reported, see process_inventory.
+        chunk_size (int): The number of rows computed and written per pass.
+        instrument (Instrumentation): Records the compute and write stages and the rows and errors counters.
+
+    Returns:
+        dict: The number of rows written and of invalid rows, over all sources.
+    """
+    stage = instrument.stage if instrument is not None else _no_stage
+    written = invalid = 0
+    with _open_text(output, 'w') as report, _open_text(sys.stderr if errors is None else errors, 'w') as error_file:
+        writer = csv.writer(report)
+        writer.writerow(HEADERS)
+        error_writer = csv.writer(error_file)
+        for source in sources:
+            name = _source_name(source)
+            with _open_text(source, 'r') as lines:
+                numbered = enumerate(csv.reader(lines), 1)
+                while True:
+                    chunk = list(islice(numbered, chunk_size))
+                    if not chunk:
+                        break
+                    rows = []
+                    bad = []
+                    with stage('compute'):
+                        for line_number, fields in chunk:
+                            if not ''.join(fields).strip() or (line_number == 1 and is_header(fields)):
+                                continue
+                            try:
+                                if len(fields) != 4:
+                                    raise ValueError(f"Expected 4 fields, got {len(fields)}")
+                                rows.append(report_row(*map(str.strip, fields)))
+                            except ValueError as error:
+                                bad.append((name, line_number, ','.join(fields), str(error)))
+                    with stage('write'):
+                        writer.writerows(rows)
+                        if bad:
+                            if not invalid:
+                                error_writer.writerow(ERROR_HEADERS)
+                            error_writer.writerows(bad)
+                    written += len(rows)
+                    invalid += len(bad)
+                    if instrument is not None:
+                        instrument.count('rows', len(rows))
+                        if bad:
+                            instrument.count('errors', len(bad))
+    return {'rows': written, 'errors': invalid}
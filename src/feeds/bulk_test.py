@@ -0,0 +1,53 @@
+'''By Ray Bernard ray.bernard@outlook.com
+     MIT License '''
+import csv
+import io
+import os
+import tempfile
+import unittest
+from feeds.bandwidth_calculator import HEADERS, BandwidthCalculator
+from feeds.bulk import process_inventories, process_inventory
+
+
+class TestProcessInventory(unittest.TestCase):
+    def test_report_matches_calculator(self):
+        inventory = io.StringIO('Media Throughput,Read,Write,Size\n1 Gbps,50,50,1 TB\n\n10 Gbps, 80, 20, 500 GB\n'
+                                '1 Gbps,50,50,1 TB\n')
+        output = io.StringIO()
+        self.assertEqual(process_inventory(inventory, output, chunk_size=2), {'rows': 3, 'errors': 0})
+        rows = list(csv.reader(io.StringIO(output.getvalue())))
+        self.assertEqual(rows[0], HEADERS)
+        self.assertEqual(rows[1], BandwidthCalculator('1 Gbps', 50, 50, '1 TB').calculate())
+        self.assertEqual(rows[2], BandwidthCalculator('10 Gbps', 80, 20, '500 GB').calculate())
+        self.assertEqual(rows[3], rows[1])
+
+    def test_invalid_rows_are_reported(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            source = os.path.join(tmp, 'inventory.csv')
+            output = os.path.join(tmp, 'report.csv')
+            errors = os.path.join(tmp, 'errors.csv')
+            with open(source, 'w') as file:
+                file.write('1 Gbps,50,50,1 TB\n1 Gbps,60,50,1 TB\nfast,50,50,1 TB\n1 Gbps,50,50\n0 Gbps,50,50,1 TB\n'
+                           '10 Gbps,70,30,1 PB\n')
+            self.assertEqual(process_inventory(source, output, errors), {'rows': 2, 'errors': 4})
+            with open(errors, newline='') as file:
+                reported = list(csv.reader(file))
+            with open(output, newline='') as file:
+                self.assertEqual(len(list(csv.reader(file))), 3)
+        self.assertEqual(reported[0], ['File', 'Line', 'Input', 'Error'])
+        self.assertEqual([row[0] for row in reported[1:]], [source] * 4)
+        self.assertEqual([row[1] for row in reported[1:]], ['2', '3', '4', '5'])
+        self.assertEqual(reported[1][3], 'Read and write ratios must add up to 100.')
+
+    def test_several_inventories(self):
+        first = io.StringIO('Media Throughput,Read,Write,Size\n1 Gbps,50,50,1 TB\n')
+        second = io.StringIO('media_throughput,read,write,size\n1 Gbps,60,50,1 TB\n10 Gbps,80,20,500 GB\n')
+        output = io.StringIO()
+        errors = io.StringIO()
+        self.assertEqual(process_inventories([first, second], output, errors), {'rows': 2, 'errors': 1})
+        self.assertEqual(len(list(csv.reader(io.StringIO(output.getvalue())))), 3)
+        self.assertEqual(list(csv.reader(io.StringIO(errors.getvalue())))[1][:2], ['-', '2'])
+
+
+if __name__ == '__main__':
+    unittest.main()
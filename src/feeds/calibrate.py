@@ -0,0 +1,280 @@
+'''By Ray Bernard ray.bernard@outlook.com
+     MIT License '''
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import os
+import socket
+import tempfile
+import threading
+import time
+
+from .bandwidth_calculator import BandwidthCalculator
+
+
+DEFAULT_PROBE_BYTES = 256 << 20
+DEFAULT_BLOCK_BYTES = 8 << 20
+
+
+def _mbps(size, seconds):
+    """
+    Returns a transfer rate in Mbps, with 1 Mbps = 10**6 bits per second like convert_to_mbps.
+    """
+    return size * 8 / 1e6 / seconds if seconds > 0 else float('inf')
+
+
+class Measurement:
+    """
+    The throughput one probe achieved, ready to feed into BandwidthCalculator.
+    """
+
+    def __init__(self, target, read_mbps, write_mbps, size, streams):
+        """
+        Constructor of the Measurement class
+
+        Parameters:
+            target (str): What was probed, for example a directory or 'tcp loopback'.
+            read_mbps (float): The measured read or receive rate.
+            write_mbps (float): The measured write or send rate.
+            size (int): The bytes moved in each direction.
+            streams (int): The number of parallel streams.
+
+        Returns:
+            None
+        """
+        self.target = target
+        self.read_mbps = read_mbps
+        self.write_mbps = write_mbps
+        self.size = size
+        self.streams = streams
+
+    def __repr__(self):
+        return (f"Measurement({self.target!r}, read_mbps={self.read_mbps:.1f}, write_mbps={self.write_mbps:.1f}, "
+                f"size={self.size}, streams={self.streams})")
+
+    def media_throughput(self, read_ratio=50, write_ratio=50):
+        """
+        Returns the effective throughput for a read/write mix as a BandwidthCalculator string.
+
+        Reads and writes take turns on the same device, so the effective rate
+        is the harmonic mix of the two measured rates.
+
+        Parameters:
+            read_ratio (float): The read percentage.
+            write_ratio (float): The write percentage.
+
+        Returns:
+            str: The throughput, e.g. '1843.2 Mbps'.
+        """
+        seconds_per_bit = read_ratio / 100 / self.read_mbps + write_ratio / 100 / self.write_mbps
+        return f"{1 / seconds_per_bit:.1f} Mbps"
+
+    def calculator(self, read_ratio, write_ratio, initial_data_size):
+        """
+        Returns a BandwidthCalculator that uses the measured throughput for this mix.
+
+        Parameters:
+            read_ratio (float): The read percentage.
+            write_ratio (float): The write percentage.
+            initial_data_size (str): The data size, e.g. '1 TB'.
+
+        Returns:
+            BandwidthCalculator: The calibrated calculator.
+        """
+        return BandwidthCalculator(self.media_throughput(read_ratio, write_ratio), read_ratio, write_ratio,
+                                   initial_data_size)
+
+
+def _run_streams(function, streams):
+    """
+    Runs function(stream) on parallel threads and returns the wall time until all are done.
+    """
+    if streams == 1:
+        start = time.perf_counter()
+        function(0)
+        return time.perf_counter() - start
+    with ThreadPoolExecutor(streams) as pool:
+        start = time.perf_counter()
+        for future in [pool.submit(function, stream) for stream in range(streams)]:
+            future.result()
+        return time.perf_counter() - start
+
+
+def _drop_cache(fd):
+    # Ask the kernel to forget the pages so the read comes from the device, where supported
+    if hasattr(os, 'posix_fadvise'):
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+
+
+def probe_disk(path, size=DEFAULT_PROBE_BYTES, block_size=DEFAULT_BLOCK_BYTES, streams=1):
+    """
+    Measures sequential write and read throughput in a directory.
+
+    Each stream writes size bytes to its own scratch file in large blocks
+    and syncs it, the page cache is dropped where the OS allows it, and
+    the file is read back with readinto into one reused buffer. The
+    scratch files are removed afterwards.
+
+    Parameters:
+        path (str): The directory to probe, on the device to measure.
+        size (int): The bytes each stream writes and reads.
+        block_size (int): The bytes per write and read call.
+        streams (int): The number of files written and read in parallel.
+
+    Returns:
+        Measurement: The read and write rates over all streams.
+    """
+    if size < 1 or block_size < 1 or streams < 1:
+        raise ValueError("Size, block size and streams must be at least 1.")
+    block = memoryview(os.urandom(min(block_size, size)))
+    with tempfile.TemporaryDirectory(dir=path, prefix='calibrate-') as scratch:
+        names = [os.path.join(scratch, f"stream{stream}") for stream in range(streams)]
+
+        def write(stream):
+            fd = os.open(names[stream], os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            try:
+                remaining = size
+                while remaining:
+                    remaining -= os.write(fd, block[:remaining])
+                os.fsync(fd)
+                _drop_cache(fd)
+            finally:
+                os.close(fd)
+
+        def read(stream):
+            buffer = bytearray(len(block))
+            with open(names[stream], 'rb', buffering=0) as file:
+                while file.readinto(buffer):
+                    pass
+
+        write_seconds = _run_streams(write, streams)
+        read_seconds = _run_streams(read, streams)
+    total = size * streams
+    return Measurement(path, _mbps(total, read_seconds), _mbps(total, write_seconds), size, streams)
+
+
+def _listener(kind, scratch):
+    if kind == 'tcp':
+        server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        server.bind(('127.0.0.1', 0))
+    elif kind == 'unix':
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(os.path.join(scratch, 'probe.sock'))
+    else:
+        raise ValueError(f"Unknown socket kind {kind!r}; use 'tcp' or 'unix'")
+    return server
+
+
+def probe_socket(kind='tcp', size=DEFAULT_PROBE_BYTES, block_size=DEFAULT_BLOCK_BYTES, streams=1):
+    """
+    Measures loopback socket throughput.
+
+    Each stream sends size bytes from a scratch file with os.sendfile, so
+    the data goes from the page cache to the socket without a copy through
+    Python, and the receiver reads it with recv_into into one reused
+    buffer. Where sendfile is missing, the sender falls back to sendall.
+
+    Parameters:
+        kind (str): 'tcp' for 127.0.0.1 or 'unix' for a Unix domain socket.
+        size (int): The bytes each stream sends.
+        block_size (int): The bytes per send and receive call.
+        streams (int): The number of connections sending in parallel.
+
+    Returns:
+        Measurement: The receive rate as read_mbps and the send rate as write_mbps.
+    """
+    if size < 1 or block_size < 1 or streams < 1:
+        raise ValueError("Size, block size and streams must be at least 1.")
+    block = os.urandom(min(block_size, size))
+    with tempfile.TemporaryDirectory(prefix='calibrate-') as scratch:
+        source = os.path.join(scratch, 'source')
+        with open(source, 'wb') as file:
+            for offset in range(0, size, len(block)):
+                file.write(block[:size - offset])
+        server = _listener(kind, scratch)
+        server.listen(streams)
+        address = server.getsockname()
+        receive_seconds = []
+
+        def receive():
+            try:
+                connection, _ = server.accept()
+            except OSError:
+                return
+            with connection:
+                buffer = bytearray(block_size)
+                start = time.perf_counter()
+                while connection.recv_into(buffer):
+                    pass
+                receive_seconds.append(time.perf_counter() - start)
+
+        def send(stream):
+            with socket.socket(server.family, socket.SOCK_STREAM) as client, open(source, 'rb') as file:
+                client.connect(address)
+                if hasattr(os, 'sendfile'):
+                    offset = 0
+                    while offset < size:
+                        offset += os.sendfile(client.fileno(), file.fileno(), offset, min(block_size, size - offset))
+                else:
+                    data = memoryview(file.read())
+                    for offset in range(0, size, block_size):
+                        client.sendall(data[offset:offset + block_size])
+
+        receivers = [threading.Thread(target=receive) for _ in range(streams)]
+        for receiver in receivers:
+            receiver.start()
+        try:
+            send_seconds = _run_streams(send, streams)
+        except BaseException:
+            # Wake any receiver still waiting in accept
+            server.shutdown(socket.SHUT_RDWR)
+            raise
+        finally:
+            for receiver in receivers:
+                receiver.join()
+            server.close()
+    total = size * streams
+    return Measurement(f"{kind} loopback", _mbps(total, max(receive_seconds)), _mbps(total, send_seconds), size,
+                       streams)
+
+
+_UNITS = {'kb': 1 << 10, 'mb': 1 << 20, 'gb': 1 << 30, 'tb': 1 << 40}
+
+
+def _bytes(text):
+    """
+    Returns a size such as '256 MB' or '1GB' in bytes.
+    """
+    text = text.strip()
+    size, unit = text.split() if ' ' in text else (text[:-2], text[-2:])
+    if unit.lower() not in _UNITS:
+        raise ValueError(f"Unknown size unit in {text!r}")
+    return int(float(size) * _UNITS[unit.lower()])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure real disk and socket throughput for BandwidthCalculator.')
+    parser.add_argument('--path', default='.', help='the directory to probe for disk throughput')
+    parser.add_argument('--size', type=_bytes, default=DEFAULT_PROBE_BYTES, help="bytes per stream, e.g. '1 GB'")
+    parser.add_argument('--block-size', type=_bytes, default=DEFAULT_BLOCK_BYTES, help="bytes per call, e.g. '8 MB'")
+    parser.add_argument('--streams', type=int, default=1, help='parallel streams')
+    parser.add_argument('--ratio', type=float, default=50, help='read percentage for the suggested throughput')
+    parser.add_argument('--data-size', default='1 TB', help='data size for the example transfer time')
+    args = parser.parse_args()
+
+    measurements = [probe_disk(args.path, args.size, args.block_size, args.streams),
+                    probe_socket('tcp', args.size, args.block_size, args.streams)]
+    if hasattr(socket, 'AF_UNIX'):
+        measurements.append(probe_socket('unix', args.size, args.block_size, args.streams))
+
+    print("{:<20} {:>14} {:>14} {:>18} {:>36}".format('Target', 'Read Mbps', 'Write Mbps', 'media_throughput',
+                                                     'Transfer Time'))
+    for measurement in measurements:
+        calculator = measurement.calculator(args.ratio, 100 - args.ratio, args.data_size)
+        print("{:<20} {:>14,.1f} {:>14,.1f} {:>18} {:>36}".format(
+            measurement.target, measurement.read_mbps, measurement.write_mbps,
+            measurement.media_throughput(args.ratio, 100 - args.ratio),
+            calculator.convert_seconds_to_time(calculator.transfer_time())))
+
+
+if __name__ == '__main__':
+    main()
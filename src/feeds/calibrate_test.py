@@ -0,0 +1,42 @@
+'''By Ray Bernard ray.bernard@outlook.com
+     MIT License '''
+import socket
+import tempfile
+import unittest
+from feeds.calibrate import Measurement, _bytes, probe_disk, probe_socket
+
+
+class TestCalibrate(unittest.TestCase):
+    def test_probe_disk(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            measurement = probe_disk(tmp, size=3 << 20, block_size=1 << 20, streams=2)
+        self.assertEqual((measurement.size, measurement.streams), (3 << 20, 2))
+        self.assertGreater(measurement.read_mbps, 0)
+        self.assertGreater(measurement.write_mbps, 0)
+
+    def test_probe_socket(self):
+        kinds = ['tcp', 'unix'] if hasattr(socket, 'AF_UNIX') else ['tcp']
+        for kind in kinds:
+            measurement = probe_socket(kind, size=5 << 20, block_size=1 << 20, streams=2)
+            self.assertEqual(measurement.target, f"{kind} loopback")
+            self.assertGreater(measurement.read_mbps, 0)
+        with self.assertRaises(ValueError):
+            probe_socket('udp', size=1024)
+
+    def test_feeds_bandwidth_calculator(self):
+        measurement = Measurement('disk', read_mbps=3000.0, write_mbps=1000.0, size=1, streams=1)
+        self.assertEqual(measurement.media_throughput(50, 50), '1500.0 Mbps')
+        self.assertEqual(measurement.media_throughput(100, 0), '3000.0 Mbps')
+        calculator = measurement.calculator(50, 50, '1 TB')
+        self.assertEqual(calculator.media_throughput, 1500.0)
+        self.assertEqual(calculator.calculate()[0], '1500.0 Mbps')
+
+    def test_sizes(self):
+        self.assertEqual(_bytes('256 MB'), 256 << 20)
+        self.assertEqual(_bytes('1GB'), 1 << 30)
+        with self.assertRaises(ValueError):
+            _bytes('3 parsecs')
+
+
+if __name__ == '__main__':
+    unittest.main()
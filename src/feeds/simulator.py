@@ -0,0 +1,205 @@
+'''By Ray Bernard ray.bernard@outlook.com
+     MIT License '''
+import csv
+import heapq
+import math
+
+from .bandwidth_calculator import convert_seconds_to_time, convert_to_gb, convert_to_mbps
+
+
+SUMMARY_FORMAT = "{:<15} {:>10} {:>14} {:>14} {:>12} {:>14} {:>14}"
+
+
+def _gbps(capacity):
+    """
+    Returns a link capacity, '10 Gbps' or a number of Mbps, in GB per second.
+    """
+    mbps = convert_to_mbps(capacity) if isinstance(capacity, str) else float(capacity)
+    if mbps <= 0:
+        raise ValueError("Link capacity must be greater than 0.")
+    return mbps / 8 / 1024  # 1 Mbps = 1/8 MBps = 1/8/1024 GBps
+
+
+class SimulationResult:
+    """
+    Completion times and link utilization from simulate().
+    """
+
+    def __init__(self, starts, finishes, links, transfer_links, link_stats):
+        """
+        Constructs the result from the per-transfer lists, in input order, and the per-link statistics.
+        """
+        self.starts = starts
+        self.finishes = finishes
+        self.links = links
+        self.transfer_links = transfer_links
+        self.link_stats = link_stats
+
+    def __len__(self):
+        return len(self.finishes)
+
+    def durations(self):
+        """
+        Returns how long each transfer took, from its start to its completion.
+
+        Parameters:
+            None
+
+        Returns:
+            list: Seconds per transfer, in input order.
+        """
+        return [finish - start for start, finish in zip(self.starts, self.finishes)]
+
+    def makespan(self):
+        """
+        Returns the time the last transfer completed.
+
+        Parameters:
+            None
+
+        Returns:
+            float: Seconds.
+        """
+        return max(self.finishes, default=0.0)
+
+    def write_to_csv(self, filename):
+        """
+        Writes one row per transfer: link, start, completion and duration.
+
+        Parameters:
+            filename (str): The name of the CSV file to write to.
+
+        Returns:
+            None
+        """
+        with open(filename, 'w', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(['Transfer', 'Link', 'Start (s)', 'Completion (s)', 'Duration (s)', 'Duration'])
+            writer.writerows(
+                [index, link, start, finish, finish - start, convert_seconds_to_time(finish - start)]
+                for index, (link, start, finish) in enumerate(zip(self.transfer_links, self.starts, self.finishes)))
+
+    def summary(self):
+        """
+        Formats the per-link statistics as a table.
+
+        Parameters:
+            None
+
+        Returns:
+            str: One line per link.
+        """
+        lines = [SUMMARY_FORMAT.format('Link', 'Transfers', 'Read (GB)', 'Write (GB)', 'Utilization',
+                                       'Busy (s)', 'Last done (s)')]
+        for link, stats in self.link_stats.items():
+            lines.append("{:<15} {:>10,} {:>14,.1f} {:>14,.1f} {:>12.1%} {:>14,.1f} {:>14,.1f}".format(
+                link, stats['transfers'], stats['read_gb'], stats['write_gb'], stats['utilization'],
+                stats['busy_seconds'], stats['last_completion']))
+        return '\n'.join(lines)
+
+
+def _simulate_link(capacity, arrivals, volumes, finishes):
+    """
+    Runs processor sharing on one link and fills in the completion times.
+
+    Every active transfer gets capacity / n. Instead of updating n remaining
+    sizes at each event, a virtual clock advances at the per-transfer rate,
+    and each transfer is stamped with the virtual time at which it is done.
+    The smallest stamp in the heap is always the next to finish.
+
+    Returns the number of seconds the link had at least one active transfer.
+    """
+    active = []
+    virtual = 0.0
+    now = 0.0
+    busy = 0.0
+    position = 0
+    count = len(arrivals)
+    while position < count or active:
+        if active:
+            departure = now + (active[0][0] - virtual) * len(active) / capacity
+        else:
+            departure = math.inf
+        arrival = arrivals[position][0] if position < count else math.inf
+
+        if departure <= arrival:
+            tag, index = heapq.heappop(active)
+            busy += departure - now
+            virtual = tag
+            now = departure
+            finishes[index] = now
+        else:
+            if active:
+                busy += arrival - now
+                virtual += (arrival - now) * capacity / len(active)
+            now = arrival
+            index = arrivals[position][1]
+            heapq.heappush(active, (virtual + volumes[index], index))
+            position += 1
+    return busy
+
+
+def simulate(transfers, links):
+    """
+    Simulates concurrent transfers that share links fairly.
+
+    Every link is shared equally by the transfers active on it, and each
+    transfer's share changes only when a transfer starts or finishes on the
+    same link, so the simulation jumps from event to event with a heap
+    rather than stepping through time. A transfer moves the same volume as
+    in BandwidthCalculator.transfer_time(), so one running alone finishes
+    exactly transfer_time() after it starts. The read/write mix splits the
+    moved volume between the read and write totals of the link.
+
+    Parameters:
+        transfers (iterable): (initial data size, read ratio, start seconds, link name) tuples.
+            The size is '1 TB' or a number of GB, and the read ratio is a percentage.
+        links (dict): Link capacities keyed by link name, '10 Gbps' or a number of Mbps.
+
+    Returns:
+        SimulationResult: Per-transfer completion times and per-link statistics.
+    """
+    capacities = {link: _gbps(capacity) for link, capacity in links.items()}
+    starts = []
+    volumes = []
+    transfer_links = []
+    per_link = {link: [] for link in capacities}
+    read_gb = dict.fromkeys(capacities, 0.0)
+    write_gb = dict.fromkeys(capacities, 0.0)
+    for index, (size, read_ratio, start, link) in enumerate(transfers):
+        size = convert_to_gb(size) if isinstance(size, str) else float(size)
+        if size <= 0:
+            raise ValueError(f"Transfer {index}: initial data size must be greater than 0.")
+        if not 0 <= read_ratio <= 100:
+            raise ValueError(f"Transfer {index}: read ratio must be between 0 and 100.")
+        if start < 0:
+            raise ValueError(f"Transfer {index}: start time must not be negative.")
+        if link not in capacities:
+            raise ValueError(f"Transfer {index}: unknown link {link!r}")
+
+        # transfer_time() moves the data size twice over, once for each pass of the read/write cycle
+        volume = size * 2
+        starts.append(float(start))
+        volumes.append(volume)
+        transfer_links.append(link)
+        per_link[link].append((float(start), index))
+        read_gb[link] += volume * read_ratio / 100
+        write_gb[link] += volume * (100 - read_ratio) / 100
+
+    finishes = [0.0] * len(starts)
+    link_stats = {}
+    for link, arrivals in per_link.items():
+        arrivals.sort()
+        busy = _simulate_link(capacities[link], arrivals, volumes, finishes)
+        first = arrivals[0][0] if arrivals else 0.0
+        last = max((finishes[index] for _, index in arrivals), default=0.0)
+        link_stats[link] = {
+            'transfers': len(arrivals),
+            'read_gb': read_gb[link],
+            'write_gb': write_gb[link],
+            'busy_seconds': busy,
+            'last_completion': last,
+            # The share of the time between the first start and the last completion the link was moving data
+            'utilization': busy / (last - first) if last > first else 0.0,
+        }
+    return SimulationResult(starts, finishes, links, transfer_links, link_stats)
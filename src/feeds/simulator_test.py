@@ -0,0 +1,58 @@
+'''By Ray Bernard ray.bernard@outlook.com
+     MIT License '''
+import csv
+import os
+import tempfile
+import unittest
+from feeds.bandwidth_calculator import BandwidthCalculator
+from feeds.simulator import simulate
+
+# 8192 Mbps is exactly 1 GB per second
+ONE_GBPS = 8192
+
+
+class TestSimulate(unittest.TestCase):
+    def test_lone_transfer_matches_transfer_time(self):
+        result = simulate([('1 TB', 70, 100, 'wan')], {'wan': '1 Gbps'})
+        expected = BandwidthCalculator('1 Gbps', 70, 30, '1 TB').transfer_time()
+        self.assertAlmostEqual(result.durations()[0], expected)
+        self.assertAlmostEqual(result.link_stats['wan']['read_gb'], 2048 * 0.7)
+
+    def test_fair_sharing(self):
+        # Both share the link from t=2: B moves 5 GB at 0.5 GB/s, then A finishes its last 3 GB alone
+        result = simulate([(5, 50, 0, 'lan'), (2.5, 50, 2, 'lan'), (1, 50, 0, 'idle')], {'lan': ONE_GBPS, 'idle': ONE_GBPS})
+        self.assertEqual(len(result), 3)
+        self.assertAlmostEqual(result.finishes[0], 15)
+        self.assertAlmostEqual(result.finishes[1], 12)
+        self.assertAlmostEqual(result.finishes[2], 2)
+        self.assertAlmostEqual(result.makespan(), 15)
+        stats = result.link_stats['lan']
+        self.assertEqual(stats['transfers'], 2)
+        self.assertAlmostEqual(stats['busy_seconds'], 15)
+        self.assertAlmostEqual(stats['utilization'], 1.0)
+
+    def test_gaps_lower_utilization(self):
+        result = simulate([(1, 50, 0, 'lan'), (1, 50, 8, 'lan')], {'lan': ONE_GBPS})
+        self.assertEqual(result.finishes, [2.0, 10.0])
+        self.assertAlmostEqual(result.link_stats['lan']['utilization'], 0.4)
+
+    def test_invalid_transfers(self):
+        for transfer in [(0, 50, 0, 'lan'), (1, 120, 0, 'lan'), (1, 50, -1, 'lan'), (1, 50, 0, 'wan')]:
+            with self.assertRaises(ValueError):
+                simulate([transfer], {'lan': '10 Gbps'})
+        with self.assertRaises(ValueError):
+            simulate([], {'lan': '0 Gbps'})
+
+    def test_write_to_csv(self):
+        result = simulate([(1, 50, 0, 'lan')], {'lan': ONE_GBPS})
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = os.path.join(tmp, 'simulation.csv')
+            result.write_to_csv(filename)
+            with open(filename, newline='') as file:
+                rows = list(csv.reader(file))
+        self.assertEqual(rows[1], ['0', 'lan', '0.0', '2.0', '2.0', '0 hours, 0 minutes, 2.00 seconds'])
+        self.assertIn('lan', result.summary())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,171 @@
+'''By Ray Bernard ray.bernard@outlook.com
+     MIT License '''
+import csv
+import numpy as np
+
+from .bandwidth_calculator import HEADERS, convert_seconds_to_time, convert_to_gb, convert_to_mbps
+
+
+TABLE_FORMAT = "{:<20} {:<20} {:<20} {:<30} {:<30} {:<25} {:<25} {:<20}"
+
+
+def _ratio_pair(ratio):
+    if isinstance(ratio, (tuple, list)):
+        read_ratio, write_ratio = ratio
+    else:
+        read_ratio, write_ratio = ratio, 100 - ratio
+    return read_ratio / 100, write_ratio / 100
+
+
+class Sweep:
+    """
+    BandwidthCalculator results for every combination of throughput, ratio and size.
+
+    Each axis is parsed once and the grid is evaluated with NumPy
+    broadcasting, in the same floating point steps as calculate() and
+    transfer_time(), so every value matches the scalar result exactly.
+    Results are float64 arrays of shape (throughputs, ratios, sizes);
+    strings are only made by rows(), write_to_csv() and print_to_console().
+    """
+
+    def __init__(self, media_throughputs, ratios, initial_data_sizes):
+        """
+        Constructor of the Sweep class
+
+        Parameters:
+            media_throughputs (list): Throughputs such as '10 Gbps'.
+            ratios (list): Read percentages, with the rest written, or (read, write) percentage pairs.
+            initial_data_sizes (list): Data sizes such as '1 TB'.
+
+        Returns:
+            None
+        """
+        self.media_throughput = np.array([convert_to_mbps(text) for text in media_throughputs], dtype=np.float64)
+        pairs = [_ratio_pair(ratio) for ratio in ratios]
+        self.read_ratio = np.array([read for read, _ in pairs], dtype=np.float64)
+        self.write_ratio = np.array([write for _, write in pairs], dtype=np.float64)
+        self.initial_data_size = np.array([convert_to_gb(text) for text in initial_data_sizes], dtype=np.float64)
+
+        # The same checks as the BandwidthCalculator constructor, for every axis value
+        for read_ratio, write_ratio in pairs:
+            if not (0 <= read_ratio <= 1 and 0 <= write_ratio <= 1):
+                raise ValueError("Read and write ratios must be between 0 and 100.")
+            if read_ratio + write_ratio != 1:
+                raise ValueError("Read and write ratios must add up to 100.")
+        if (self.media_throughput <= 0).any():
+            raise ValueError("Media throughput must be greater than 0.")
+        if (self.initial_data_size <= 0).any():
+            raise ValueError("Initial data size must be greater than 0.")
+
+        mbps = self.media_throughput[:, None, None]
+        size = self.initial_data_size[None, None, :]
+        self.shape = (len(self.media_throughput), len(self.read_ratio), len(self.initial_data_size))
+
+        # Each result only varies along some axes; the rest are broadcast views
+        self.disk_space_read = np.broadcast_to(size * self.read_ratio[None, :, None], self.shape)
+        self.disk_space_write = np.broadcast_to(size * self.write_ratio[None, :, None], self.shape)
+        self.bandwidth_read = np.broadcast_to(mbps * self.read_ratio[None, :, None], self.shape)
+        self.bandwidth_write = np.broadcast_to(mbps * self.write_ratio[None, :, None], self.shape)
+        throughput_in_GBps = mbps / 8 / 1024
+        self.transfer_time = np.broadcast_to((size / 2) / throughput_in_GBps * 2 * 2, self.shape)
+
+    def __len__(self):
+        return self.shape[0] * self.shape[1] * self.shape[2]
+
+    def arrays(self):
+        """
+        Returns the numeric results keyed by name.
+
+        Parameters:
+            None
+
+        Returns:
+            dict: float64 arrays of shape (throughputs, ratios, sizes). Disk
+            space is in GB, bandwidth in Mbps and transfer time in seconds.
+        """
+        return {
+            'disk_space_read': self.disk_space_read,
+            'disk_space_write': self.disk_space_write,
+            'bandwidth_read': self.bandwidth_read,
+            'bandwidth_write': self.bandwidth_write,
+            'transfer_time': self.transfer_time,
+        }
+
+    def rows(self):
+        """
+        Formats the grid as report rows, throughput first, then ratio, then size.
+
+        Parameters:
+            None
+
+        Returns:
+            list: One list of eight strings per combination, the same as calculate().
+        """
+        if not len(self):
+            return []
+        # Every value is formatted once per distinct value, not once per row
+        throughputs = [f"{mbps} Mbps" for mbps in self.media_throughput.tolist()]
+        ratios = [f"{int(read * 100)}:{int(write * 100)}"
+                  for read, write in zip(self.read_ratio.tolist(), self.write_ratio.tolist())]
+        sizes = [f"{size} GB" for size in self.initial_data_size.tolist()]
+        disk_read = [[f"{value} GB" for value in line] for line in self.disk_space_read[0].tolist()]
+        disk_write = [[f"{value} GB" for value in line] for line in self.disk_space_write[0].tolist()]
+        bandwidth_read = [[f"{value} Mbps" for value in line] for line in self.bandwidth_read[:, :, 0].tolist()]
+        bandwidth_write = [[f"{value} Mbps" for value in line] for line in self.bandwidth_write[:, :, 0].tolist()]
+        times = [[convert_seconds_to_time(value) for value in line] for line in self.transfer_time[:, 0, :].tolist()]
+
+        rows = []
+        for t, throughput in enumerate(throughputs):
+            for r, ratio in enumerate(ratios):
+                reads, writes = disk_read[r], disk_write[r]
+                read_mbps, write_mbps = bandwidth_read[t][r], bandwidth_write[t][r]
+                line_times = times[t]
+                rows.extend([throughput, ratio, size, reads[s], writes[s], read_mbps, write_mbps, line_times[s]]
+                            for s, size in enumerate(sizes))
+        return rows
+
+    def write_to_csv(self, filename):
+        """
+        Writes the grid to a CSV file with the BandwidthCalculator headers.
+
+        Parameters:
+            filename (str): The name of the CSV file to write to.
+
+        Returns:
+            int: The number of rows written.
+        """
+        rows = self.rows()
+        with open(filename, 'w', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(HEADERS)
+            writer.writerows(rows)
+        return len(rows)
+
+    def print_to_console(self):
+        """
+        Prints the grid as a table, the same layout as BandwidthCalculator.print_to_console.
+
+        Parameters:
+            None
+
+        Returns:
+            None
+        """
+        print(TABLE_FORMAT.format(*HEADERS))
+        for row in self.rows():
+            print(TABLE_FORMAT.format(*row))
+
+
+def sweep(media_throughputs, ratios, initial_data_sizes):
+    """
+    Evaluates BandwidthCalculator over the cross product of the given axes.
+
+    Parameters:
+        media_throughputs (list): Throughputs such as '10 Gbps'.
+        ratios (list): Read percentages, with the rest written, or (read, write) percentage pairs.
+        initial_data_sizes (list): Data sizes such as '1 TB'.
+
+    Returns:
+        Sweep: The evaluated grid.
+    """
+    return Sweep(media_throughputs, ratios, initial_data_sizes)
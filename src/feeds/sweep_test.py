@@ -0,0 +1,55 @@
+'''By Ray Bernard ray.bernard@outlook.com
+     MIT License '''
+import csv
+import os
+import tempfile
+import unittest
+from feeds.bandwidth_calculator import HEADERS, BandwidthCalculator
+from feeds.sweep import sweep
+
+
+class TestSweep(unittest.TestCase):
+    def setUp(self):
+        self.throughputs = ['100 Mbps', '1 Gbps', '2.5 Gbps', '10 Gbps', '0.4 Tbps']
+        self.ratios = [0, 10, 33, (70, 30), 100]
+        self.sizes = ['500 GB', '1 TB', '3.7 TB', '1 PB']
+
+    def test_matches_scalar_calculator(self):
+        grid = sweep(self.throughputs, self.ratios, self.sizes)
+        self.assertEqual(grid.shape, (5, 5, 4))
+        rows = grid.rows()
+        self.assertEqual(len(rows), len(grid))
+        index = 0
+        for t, throughput in enumerate(self.throughputs):
+            for r, ratio in enumerate(self.ratios):
+                read, write = ratio if isinstance(ratio, tuple) else (ratio, 100 - ratio)
+                for s, size in enumerate(self.sizes):
+                    calculator = BandwidthCalculator(throughput, read, write, size)
+                    self.assertEqual(rows[index], calculator.calculate())
+                    self.assertEqual(grid.transfer_time[t, r, s], calculator.transfer_time())
+                    self.assertEqual(grid.disk_space_read[t, r, s], calculator.initial_data_size * calculator.read_ratio)
+                    self.assertEqual(grid.bandwidth_write[t, r, s], calculator.media_throughput * calculator.write_ratio)
+                    index += 1
+
+    def test_invalid_axes(self):
+        with self.assertRaises(ValueError):
+            sweep(['1 Gbps'], [(60, 50)], ['1 TB'])
+        with self.assertRaises(ValueError):
+            sweep(['0 Gbps'], [50], ['1 TB'])
+        with self.assertRaises(ValueError):
+            sweep(['1 Gbps'], [50], ['0 TB'])
+        self.assertEqual(sweep([], [50], ['1 TB']).rows(), [])
+
+    def test_write_to_csv(self):
+        grid = sweep(['1 Gbps', '10 Gbps'], [50, 80], ['1 TB'])
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = os.path.join(tmp, 'sweep.csv')
+            self.assertEqual(grid.write_to_csv(filename), 4)
+            with open(filename, newline='') as file:
+                rows = list(csv.reader(file))
+        self.assertEqual(rows[0], HEADERS)
+        self.assertEqual(rows[1][-1], '4 hours, 39 minutes, 37.22 seconds')
+
+
+if __name__ == '__main__':
+    unittest.main()
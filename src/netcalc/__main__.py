@@ -0,0 +1,7 @@
+'''By Ray Bernard ray.bernard@outlook.com
+     MIT License '''
+import sys
+
+from netcalc.cli import main
+
+sys.exit(main())
@@ -0,0 +1,209 @@
+'''By Ray Bernard ray.bernard@outlook.com
+     MIT License '''
+import argparse
+import sys
+
+
+# Only argparse and sys are imported at startup. Every mode imports what it
+# needs when it runs, so NumPy and process pools are loaded only on request.
+
+
+def _open_inputs(filenames):
+    """
+    Yields the lines of each input file in turn; '-' or no file reads stdin.
+    """
+    for filename in filenames or ['-']:
+        if filename == '-':
+            yield from sys.stdin
+        else:
+            with open(filename) as file:
+                yield from file
+
+
+def run_network(args):
+    """
+    Writes the CIDR report for the input lines.
+    """
+    from cidr import report
+
+    cache = None
+    if args.cache:
+        from cidr.cache import NetworkCache
+        cache = NetworkCache(args.cache)
+    instrument = None
+    if args.stats and not args.incremental:
+        from netcalc.instrumentation import Instrumentation
+        instrument = Instrumentation()
+
+    if args.incremental:
+        if (args.format != 'csv' or args.columns or args.workers or args.output in (None, '-')
+                or len(args.inputs) != 1 or args.inputs[0] == '-'):
+            raise SystemExit("--incremental needs one input file, all columns and a CSV --output file")
+        from netcalc.incremental import update_network_report
+        counts = update_network_report(args.inputs[0], args.output, batch=args.batch)
+        count = counts['rows']
+        if args.stats:
+            print(_incremental_summary(counts), file=sys.stderr)
+    elif args.workers:
+        if (args.format != 'csv' or args.columns or args.output in (None, '-') or len(args.inputs) != 1
+                or args.inputs[0] == '-'):
+            raise SystemExit("--workers needs one input file, all columns and a CSV --output file")
+        from cidr.parallel import write_to_csv_parallel
+        count = write_to_csv_parallel(args.inputs[0], args.output, workers=args.workers, batch=args.batch)
+    else:
+        from cidr.sinks import SINKS
+        if args.output in (None, '-'):
+            if args.format == 'arrow':
+                raise SystemExit("--format arrow needs an --output file")
+            output = sys.stdout
+        else:
+            output = args.output
+        count = report.write_report(_open_inputs(args.inputs), SINKS[args.format](output), args.columns,
+                                    args.chunk_size, batch=args.batch, cache=cache, instrument=instrument)
+
+    if args.stats:
+        print(f"{count:,} rows", file=sys.stderr)
+        if instrument is not None:
+            print(instrument.summary(), file=sys.stderr)
+        if cache is not None:
+            print(cache.stats(), file=sys.stderr)
+    return 0
+
+
+def _incremental_summary(counts):
+    return (f"{counts['unchanged']:,} unchanged, {counts['added']:,} recomputed, {counts['removed']:,} removed"
+            + (" (full rebuild)" if counts['rebuilt'] else ""))
+
+
+def _bandwidth_requests(args):
+    """
+    Returns the BandwidthCalculator arguments given on the command line or in the input lines.
+    """
+    if args.throughput is not None:
+        return [(args.throughput, args.read, args.write, args.size)]
+
+    import csv
+    from feeds.bulk import is_header
+    requests = []
+    for fields in csv.reader(line for line in _open_inputs(args.inputs) if line.strip()):
+        if is_header(fields):
+            continue
+        if len(fields) != 4:
+            raise ValueError(f"Expected throughput, read ratio, write ratio and size, got {fields}")
+        throughput, read_ratio, write_ratio, size = (field.strip() for field in fields)
+        requests.append((throughput, float(read_ratio), float(write_ratio), size))
+    return requests
+
+
+def run_bandwidth(args):
+    """
+    Writes the bandwidth report for one set of arguments or for each input line.
+    """
+    if args.incremental:
+        if (args.throughput is not None or args.format != 'csv' or args.output in (None, '-')
+                or len(args.inputs) != 1 or args.inputs[0] == '-'):
+            raise SystemExit("--incremental needs one inventory file and a CSV --output file")
+        from netcalc.incremental import update_bandwidth_report
+        counts = update_bandwidth_report(args.inputs[0], args.output)
+        for line_number, text, error in counts['errors']:
+            print(f"netcalc: line {line_number}: {error}: {text}", file=sys.stderr)
+        return 1 if counts['errors'] else 0
+
+    if args.throughput is None and args.format == 'csv':
+        # Inventories stream through in constant memory, one file at a time, and bad rows are reported on stderr
+        from feeds.bulk import process_inventories
+        sources = [sys.stdin if filename == '-' else filename for filename in args.inputs or ['-']]
+        counts = process_inventories(sources, sys.stdout if args.output in (None, '-') else args.output)
+        if counts['errors']:
+            print(f"netcalc: {counts['errors']:,} invalid rows", file=sys.stderr)
+            return 1
+        return 0
+
+    import csv
+    from feeds.bandwidth_calculator import HEADERS, BandwidthCalculator
+
+    rows = [BandwidthCalculator(*request).calculate() for request in _bandwidth_requests(args)]
+    if args.output in (None, '-'):
+        file = sys.stdout
+    else:
+        file = open(args.output, 'w', newline='')
+    try:
+        if args.format == 'csv':
+            writer = csv.writer(file)
+            writer.writerow(HEADERS)
+            writer.writerows(rows)
+        else:
+            line = "{:<20} {:<20} {:<20} {:<30} {:<30} {:<25} {:<25} {:<20}\n"
+            file.write(line.format(*HEADERS))
+            file.writelines(line.format(*row) for row in rows)
+    finally:
+        if file is not sys.stdout:
+            file.close()
+    return 0
+
+
+def build_parser():
+    """
+    Builds the argument parser for the netcalc command.
+
+    Parameters:
+        None
+
+    Returns:
+        argparse.ArgumentParser: The parser.
+    """
+    parser = argparse.ArgumentParser(prog='netcalc', description='Network and bandwidth calculators.')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    network = commands.add_parser('network', help='CIDR report: subnet mask, network ID, broadcast, usable range')
+    network.add_argument('inputs', nargs='*', help="files with one CIDR per line; '-' or none reads stdin")
+    network.add_argument('-o', '--output', help='the file to write; defaults to stdout')
+    network.add_argument('-f', '--format', choices=['csv', 'table', 'jsonl', 'arrow'], default='csv',
+                         help='the output format; arrow needs pyarrow')
+    network.add_argument('-c', '--columns', help='comma-separated columns to write, e.g. network_id,total_ips')
+    network.add_argument('--batch', action='store_true', help='use the NumPy batch engine')
+    network.add_argument('--workers', type=int, help='compute with this many processes (CSV file to file)')
+    network.add_argument('--cache', type=int, metavar='SIZE', help='cache up to SIZE repeated networks')
+    network.add_argument('--chunk-size', type=int, default=65536, help='CIDRs computed per pass')
+    network.add_argument('--incremental', action='store_true',
+                         help='recompute only the input lines changed since the last run (file to file)')
+    network.add_argument('--stats', action='store_true', help='print row counts and stage timings to stderr')
+    network.set_defaults(run=run_network)
+
+    bandwidth = commands.add_parser('bandwidth', help='bandwidth report: disk space, bandwidth and transfer time')
+    bandwidth.add_argument('inputs', nargs='*',
+                           help="CSV files of throughput,read ratio,write ratio,size; '-' or none reads stdin")
+    bandwidth.add_argument('-t', '--throughput', help="the media throughput, e.g. '10 Gbps'")
+    bandwidth.add_argument('-r', '--read', type=float, default=50, help='the read ratio in percent')
+    bandwidth.add_argument('-w', '--write', type=float, default=50, help='the write ratio in percent')
+    bandwidth.add_argument('-s', '--size', default='1 TB', help="the initial data size, e.g. '1 TB'")
+    bandwidth.add_argument('-o', '--output', help='the file to write; defaults to stdout')
+    bandwidth.add_argument('-f', '--format', choices=['table', 'csv'], default='csv', help='the output format')
+    bandwidth.add_argument('--incremental', action='store_true',
+                           help='recompute only the inventory rows changed since the last run (file to file)')
+    bandwidth.set_defaults(run=run_bandwidth)
+    return parser
+
+
+def main(argv=None):
+    """
+    Runs the netcalc command.
+
+    Parameters:
+        argv (list): The arguments. Defaults to sys.argv[1:].
+
+    Returns:
+        int: The exit status.
+    """
+    args = build_parser().parse_args(argv)
+    try:
+        return args.run(args)
+    except BrokenPipeError:
+        return 0
+    except (ValueError, OSError) as error:
+        print(f"netcalc: {error}", file=sys.stderr)
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
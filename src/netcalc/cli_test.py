@@ -0,0 +1,114 @@
+'''By Ray Bernard ray.bernard@outlook.com
+     MIT License '''
+import contextlib
+import csv
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from cidr.report import HEADERS, compute_rows
+from netcalc.cli import main
+
+SRC = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class TestCli(unittest.TestCase):
+    def setUp(self):
+        self.ip_list = ['198.51.100.0/22', '192.168.1.10/26', '172.16.0.5/16']
+        self.tmp = tempfile.TemporaryDirectory()
+        self.input = os.path.join(self.tmp.name, 'cidrs.txt')
+        with open(self.input, 'w') as file:
+            file.write('\n'.join(self.ip_list) + '\n')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def read_csv(self, filename):
+        with open(filename, newline='') as file:
+            return list(csv.reader(file))
+
+    def test_network_file_to_csv(self):
+        output = os.path.join(self.tmp.name, 'network.csv')
+        self.assertEqual(main(['network', self.input, '-o', output]), 0)
+        self.assertEqual(self.read_csv(output), [HEADERS] + compute_rows(self.ip_list, batch=False))
+
+    def test_network_stdin_table(self):
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            sys.stdin, stdin = io.StringIO('10.0.0.0/8\n'), sys.stdin
+            try:
+                self.assertEqual(main(['network', '-f', 'table']), 0)
+            finally:
+                sys.stdin = stdin
+        self.assertIn('255.0.0.0', output.getvalue())
+
+    def test_network_columns_jsonl(self):
+        output = os.path.join(self.tmp.name, 'network.jsonl')
+        self.assertEqual(main(['network', self.input, '-o', output, '-f', 'jsonl', '-c', 'network_id,total_ips']), 0)
+        with open(output) as file:
+            self.assertEqual(file.readline(), '{"network_id":"198.51.100.0","total_ips":1022}\n')
+
+    def test_network_workers(self):
+        output = os.path.join(self.tmp.name, 'network.csv')
+        self.assertEqual(main(['network', self.input, '-o', output, '--workers', '1']), 0)
+        self.assertEqual(self.read_csv(output), [HEADERS] + compute_rows(self.ip_list, batch=False))
+
+    def test_network_incremental(self):
+        output = os.path.join(self.tmp.name, 'network.csv')
+        self.assertEqual(main(['network', self.input, '-o', output, '--incremental']), 0)
+        with open(self.input, 'a') as file:
+            file.write('10.0.0.0/8\n')
+        self.assertEqual(main(['network', self.input, '-o', output, '--incremental']), 0)
+        self.assertEqual(self.read_csv(output), [HEADERS] + compute_rows(self.ip_list + ['10.0.0.0/8'], batch=False))
+        with self.assertRaises(SystemExit):
+            main(['network', self.input, '--incremental'])
+
+    def test_bandwidth(self):
+        output = os.path.join(self.tmp.name, 'feeds.csv')
+        self.assertEqual(main(['bandwidth', '-t', '1 Gbps', '-s', '1 TB', '-o', output]), 0)
+        self.assertEqual(self.read_csv(output)[1][-1], '4 hours, 39 minutes, 37.22 seconds')
+
+        requests = os.path.join(self.tmp.name, 'requests.csv')
+        with open(requests, 'w') as file:
+            file.write('Media Throughput,Read,Write,Size\n1 Gbps,50,50,1 TB\n10 Gbps,80,20,10 TB\n')
+        self.assertEqual(main(['bandwidth', requests, '-o', output]), 0)
+        self.assertEqual(len(self.read_csv(output)), 3)
+
+    def test_bandwidth_files_with_headers(self):
+        first = os.path.join(self.tmp.name, 'a.csv')
+        second = os.path.join(self.tmp.name, 'b.csv')
+        with open(first, 'w') as file:
+            file.write('Media Throughput,Read,Write,Size\n1 Gbps,50,50,1 TB\n10 Gbps,80,20,10 TB\n')
+        with open(second, 'w') as file:
+            file.write('Media Throughput,Read,Write,Size\n1 Gbps,60,40,1 TB\nfast,50,50,1 TB\n')
+        output = os.path.join(self.tmp.name, 'feeds.csv')
+        with contextlib.redirect_stderr(io.StringIO()) as errors:
+            self.assertEqual(main(['bandwidth', first, second, '-o', output]), 1)
+        self.assertEqual(len(self.read_csv(output)), 4)
+        reported = list(csv.reader(io.StringIO(errors.getvalue())))
+        self.assertEqual(reported[0], ['File', 'Line', 'Input', 'Error'])
+        self.assertEqual(reported[1][:3], [second, '3', 'fast,50,50,1 TB'])
+        self.assertEqual(len(reported), 3)
+
+        with open(second, 'w') as file:
+            file.write('Media Throughput,Read,Write,Size\n1 Gbps,60,40,1 TB\n')
+        self.assertEqual(main(['bandwidth', first, second, '-o', output]), 0)
+        self.assertEqual(len(self.read_csv(output)), 4)
+
+    def test_errors(self):
+        with contextlib.redirect_stderr(io.StringIO()) as errors:
+            self.assertEqual(main(['bandwidth', '-t', '0 Gbps']), 1)
+            self.assertEqual(main(['network', os.path.join(self.tmp.name, 'missing.txt')]), 1)
+        self.assertIn('netcalc:', errors.getvalue())
+
+    def test_module_does_not_import_numpy(self):
+        code = ("import sys; from netcalc.cli import main; sys.stdin = open(sys.argv[1]); main(['network']); "
+                "print('numpy' in sys.modules, 'concurrent.futures' in sys.modules)")
+        result = subprocess.run([sys.executable, '-c', code, self.input], env=dict(os.environ, PYTHONPATH=SRC),
+                                check=True, stdout=subprocess.PIPE, text=True)
+        self.assertEqual(result.stdout.strip().splitlines()[-1], 'False False')
+
+
+if __name__ == '__main__':
+    unittest.main()
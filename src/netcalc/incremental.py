@@ -0,0 +1,379 @@
+'''By Ray Bernard ray.bernard@outlook.com
+     MIT License '''
+import csv
+import io
+import os
+import struct
+import numpy as np
+
+
+# Sidecar layout, all little-endian:
+#   header: magic b'NCIX', uint16 version, uint16 report kind, uint64 row count,
+#           uint64 invalid row count, then the size and mtime_ns of the input
+#           and of the output it describes
+#   one uint64 hash of the input line per output row, in output order
+MAGIC = b'NCIX'
+VERSION = 1
+HEADER = struct.Struct('<4sHHQQqqqq')
+NETWORK = 1
+BANDWIDTH = 2
+
+HASH_CHUNK_ROWS = 65536
+WINDOW_ROWS = 4
+_SEED = np.uint64(0x9E3779B97F4A7C15)
+_MULTIPLIER = np.uint64(0xFF51AFD7ED558CCD)
+_FINAL_MULTIPLIER = np.uint64(0xC4CEB9FE1A85EC53)
+_WHITESPACE = list(b' \t\x0b\x0c')
+
+
+def _stamp(filename):
+    stat = os.stat(filename)
+    return stat.st_size, stat.st_mtime_ns
+
+
+class _Sidecar:
+    """
+    The row hashes of the last run and the file stamps they belong to.
+    """
+
+    def __init__(self, kind, hashes, invalid, input_stamp, output_stamp):
+        self.kind = kind
+        self.hashes = hashes
+        self.invalid = invalid
+        self.input_stamp = input_stamp
+        self.output_stamp = output_stamp
+
+    @classmethod
+    def load(cls, filename, kind, output):
+        """
+        Returns the sidecar, or None when it is missing, of another kind or stale for output.
+        """
+        try:
+            with open(filename, 'rb') as file:
+                data = file.read()
+            if len(data) < HEADER.size:
+                return None
+            magic, version, found_kind, rows, invalid, *stamps = HEADER.unpack_from(data)
+            if magic != MAGIC or version != VERSION or found_kind != kind:
+                return None
+            if len(data) != HEADER.size + 8 * rows or _stamp(output) != tuple(stamps[2:]):
+                return None
+        except OSError:
+            return None
+        hashes = np.frombuffer(data, dtype='<u8', offset=HEADER.size).astype(np.uint64)
+        return cls(kind, hashes, invalid, tuple(stamps[:2]), tuple(stamps[2:]))
+
+    def save(self, filename):
+        temporary = f"{filename}.tmp"
+        with open(temporary, 'wb') as file:
+            file.write(HEADER.pack(MAGIC, VERSION, self.kind, len(self.hashes), self.invalid, *self.input_stamp,
+                                   *self.output_stamp))
+            file.write(self.hashes.astype('<u8').tobytes())
+        os.replace(temporary, filename)
+
+
+def _split_lines(data):
+    """
+    Returns the input as bytes and a byte array, and the start and end offset of every line without its line break.
+    """
+    if b'\r' in data:
+        data = data.replace(b'\r\n', b'\n').replace(b'\r', b'\n')
+    if data and not data.endswith(b'\n'):
+        data += b'\n'
+    buffer = np.frombuffer(data, dtype=np.uint8)
+    ends = np.flatnonzero(buffer == ord('\n'))
+    starts = np.empty_like(ends)
+    starts[:1] = 0
+    starts[1:] = ends[:-1] + 1
+    return data, buffer, starts, ends
+
+
+def _blank_lines(data, buffer, starts, ends):
+    """
+    Returns a mask of the empty and whitespace-only lines.
+    """
+    blank = starts == ends
+    if not len(buffer):
+        return blank
+    # Only a line that starts with whitespace can be blank, so just those few are checked one at a time
+    leading = np.flatnonzero(~blank & np.isin(buffer[np.minimum(starts, len(buffer) - 1)], _WHITESPACE))
+    for index in leading.tolist():
+        blank[index] = not data[starts[index]:ends[index]].strip()
+    return blank
+
+
+def _hash_lines(buffer, starts, ends):
+    """
+    Hashes every line to a uint64, a chunk of lines at a time.
+
+    Each chunk is laid out as a zero-padded matrix of 8-byte words, one row
+    per line, and the words are mixed in column by column, so the work is a
+    few vector operations per word of the longest line, not a Python call
+    per line.
+    """
+    hashes = np.empty(len(starts), dtype=np.uint64)
+    padded = np.concatenate([buffer, np.zeros(1, dtype=np.uint8)])
+    for first in range(0, len(starts), HASH_CHUNK_ROWS):
+        chunk_starts = starts[first:first + HASH_CHUNK_ROWS]
+        widths = ends[first:first + HASH_CHUNK_ROWS] - chunk_starts
+        columns = np.arange((int(widths.max()) + 7) // 8 * 8)
+        matrix = padded[np.minimum(chunk_starts[:, None] + columns, len(buffer))]
+        matrix[columns >= widths[:, None]] = 0
+        words = matrix.view('<u8').astype(np.uint64, copy=False)
+        words_used = (widths + 7) // 8
+        state = _SEED ^ (widths.astype(np.uint64) * _MULTIPLIER)
+        for column in range(words.shape[1]):
+            mixed = (state ^ words[:, column]) * _MULTIPLIER
+            mixed ^= mixed >> np.uint64(31)
+            state = np.where(column < words_used, mixed, state)
+        state ^= state >> np.uint64(33)
+        state *= _FINAL_MULTIPLIER
+        state ^= state >> np.uint64(29)
+        hashes[first:first + HASH_CHUNK_ROWS] = state
+    return hashes
+
+
+def _network_inputs(data, buffer, starts, ends):
+    return ~_blank_lines(data, buffer, starts, ends)
+
+
+def _network_rows(lines, batch):
+    from cidr.report import compute_rows
+    return compute_rows([line.decode() for _, line in lines], batch=batch)
+
+
+def _bandwidth_inputs(data, buffer, starts, ends):
+    from feeds.bulk import is_header
+    keep = ~_blank_lines(data, buffer, starts, ends)
+    if len(keep) and keep[0] and is_header(next(csv.reader([data[starts[0]:ends[0]].decode()]))):
+        keep[0] = False
+    return keep
+
+
+def _bandwidth_rows(lines, errors):
+    from feeds.bulk import report_row
+    rows = []
+    for line_number, line in lines:
+        fields = next(csv.reader([line.decode()]))
+        if not ''.join(fields).strip():
+            rows.append(None)
+            continue
+        try:
+            if len(fields) != 4:
+                raise ValueError(f"Expected 4 fields, got {len(fields)}")
+            rows.append(report_row(*map(str.strip, fields)))
+        except ValueError as error:
+            errors.append((line_number, ','.join(fields), str(error)))
+            rows.append(None)
+    return rows
+
+
+def _row_starts(report):
+    # Every row, the header included, ends with '\r\n', and no field holds a line break
+    return np.flatnonzero(np.frombuffer(report, dtype=np.uint8) == ord('\n')) + 1
+
+
+def _search(old_hashes, hashes):
+    """
+    Returns the old index with the same hash for each new hash, or -1, and the sort of the old hashes.
+
+    Both lists are sorted and the new hashes are binary searched in order,
+    which walks the old ones front to back instead of at random.
+    """
+    order = np.argsort(old_hashes)
+    sorted_hashes = old_hashes[order]
+    lookups = np.argsort(hashes)
+    positions = np.minimum(np.searchsorted(sorted_hashes, hashes[lookups]), len(order) - 1)
+    found = sorted_hashes[positions] == hashes[lookups]
+    matches = np.full(len(hashes), -1, dtype=np.int64)
+    matches[lookups[found]] = order[positions[found]]
+    return matches, sorted_hashes, positions[found]
+
+
+def _window_hashes(hashes):
+    """
+    Hashes every run of WINDOW_ROWS consecutive line hashes.
+    """
+    count = len(hashes) - WINDOW_ROWS + 1
+    if count <= 0:
+        return np.empty(0, dtype=np.uint64)
+    state = hashes[:count] * _MULTIPLIER
+    for offset in range(1, WINDOW_ROWS):
+        state = (state ^ hashes[offset:offset + count]) * _MULTIPLIER
+        state ^= state >> np.uint64(31)
+    return state
+
+
+def _match_rows(old_hashes, hashes):
+    """
+    Returns the old row each line can take its result from, or -1, and the number of old rows no line has.
+
+    Any old row with the same hash has the same text, but a repeated line
+    is matched to the copy that continues its neighbours' run where it can,
+    so the report can be copied in long slices. Windows of a few lines are
+    almost always unique even when single lines repeat; matched windows
+    anchor the offset between the two files, and that offset is carried to
+    the lines around each anchor.
+    """
+    if not len(old_hashes) or not len(hashes):
+        return np.full(len(hashes), -1, dtype=np.int64), len(old_hashes)
+    old_rows, sorted_hashes, positions = _search(old_hashes, hashes)
+
+    # An old row is removed when no line has its hash; equal hashes share one flag
+    groups = np.cumsum(np.concatenate([[True], sorted_hashes[1:] != sorted_hashes[:-1]])) - 1
+    present = np.zeros(int(groups[-1]) + 1, dtype=bool)
+    present[groups[positions]] = True
+    removed = int(np.count_nonzero(~present[groups]))
+    if len(present) == len(old_hashes):
+        # No old line repeats, so every match is the only one there is
+        return old_rows, removed
+
+    old_windows = _window_hashes(old_hashes)
+    windows = _window_hashes(hashes)
+    if not len(old_windows) or not len(windows):
+        return old_rows, removed
+    anchors, _, _ = _search(old_windows, windows)
+    lines = np.arange(len(hashes))
+    offsets = np.zeros(len(hashes), dtype=np.int64)
+    anchored = np.zeros(len(hashes), dtype=bool)
+    offsets[:len(anchors)] = anchors - lines[:len(anchors)]
+    anchored[:len(anchors)] = anchors >= 0
+    if not anchored.any():
+        return old_rows, removed
+    previous = np.maximum.accumulate(np.where(anchored, lines, 0))
+    following = np.minimum.accumulate(np.where(anchored, lines, len(lines) - 1)[::-1])[::-1]
+    settled = np.zeros(len(hashes), dtype=bool)
+    # Try the offset of the anchor before each line, then of the one after it
+    for nearest in (previous, following):
+        candidates = lines + offsets[nearest]
+        inside = anchored[nearest] & (candidates >= 0) & (candidates < len(old_hashes)) & ~settled
+        inside[inside] = old_hashes[candidates[inside]] == hashes[inside]
+        old_rows[inside] = candidates[inside]
+        settled |= inside
+    return old_rows, removed
+
+
+def _update(kind, headers, source, output, sidecar_name, select, compute):
+    """
+    Rewrites output for source, with select picking the input lines and compute turning new lines into rows.
+    """
+    sidecar_name = f"{output}.idx" if sidecar_name is None else sidecar_name
+    sidecar = _Sidecar.load(sidecar_name, kind, output) if os.path.exists(output) else None
+    # Invalid rows are never stored, so a run with errors always rereads the input to report them again
+    if sidecar is not None and not sidecar.invalid and sidecar.input_stamp == _stamp(source):
+        return {'rows': len(sidecar.hashes), 'unchanged': len(sidecar.hashes), 'added': 0, 'removed': 0,
+                'errors': [], 'rebuilt': False}
+    report = b''
+    if sidecar is not None:
+        with open(output, 'rb') as file:
+            report = file.read()
+    row_starts = _row_starts(report)
+    rebuilt = sidecar is None or len(row_starts) != len(sidecar.hashes) + 1 or not report.endswith(b'\r\n')
+    old_hashes = np.empty(0, dtype=np.uint64) if rebuilt else sidecar.hashes
+
+    input_stamp = _stamp(source)
+    with open(source, 'rb') as file:
+        data, buffer, starts, ends = _split_lines(file.read())
+    line_numbers = np.flatnonzero(select(data, buffer, starts, ends))
+    starts, ends = starts[line_numbers], ends[line_numbers]
+    hashes = _hash_lines(buffer, starts, ends)
+
+    old_rows, removed = _match_rows(old_hashes, hashes)
+
+    # Only the lines the old report has no row for are computed
+    missing = np.flatnonzero(old_rows < 0)
+    errors = []
+    rows = compute([(int(line_numbers[index]) + 1, data[starts[index]:ends[index]])
+                    for index in missing.tolist()], errors)
+    computed = np.array([row is not None for row in rows], dtype=bool)
+    formatted = io.StringIO()
+    writer = csv.writer(formatted)
+    writer.writerow(headers)
+    writer.writerows(row for row in rows if row is not None)
+    fresh = formatted.getvalue().encode()
+    fresh_starts = _row_starts(fresh)
+
+    # Rows with errors or no fields are left out. Fresh rows are numbered
+    # after the old ones, past a gap so no run crosses from one report to the other
+    kept = np.ones(len(hashes), dtype=bool)
+    kept[missing[~computed]] = False
+    new_rows = old_rows[kept]
+    offset = len(old_hashes) + 1
+    new_rows[new_rows < 0] = np.arange(offset, offset + int(computed.sum()))
+
+    # Rows that follow each other in the old report, or among the fresh rows, are copied as one slice
+    breaks = np.flatnonzero(np.diff(new_rows) != 1) + 1
+    firsts = new_rows[np.concatenate([[0], breaks])].tolist() if len(new_rows) else []
+    lasts = new_rows[np.concatenate([breaks - 1, [len(new_rows) - 1]])].tolist() if len(new_rows) else []
+    old_report = memoryview(report)
+    fresh_report = memoryview(fresh)
+    temporary = f"{output}.tmp"
+    with open(temporary, 'wb') as file:
+        file.write(fresh_report[:fresh_starts[0]])
+        for first, last in zip(firsts, lasts):
+            if first < offset:
+                file.write(old_report[row_starts[first]:row_starts[last + 1]])
+            else:
+                file.write(fresh_report[fresh_starts[first - offset]:fresh_starts[last - offset + 1]])
+    os.replace(temporary, output)
+    hashes = hashes[kept]
+    _Sidecar(kind, hashes, len(errors), input_stamp, _stamp(output)).save(sidecar_name)
+
+    recomputed = int(computed.sum())
+    return {
+        'rows': len(hashes),
+        'unchanged': len(hashes) - recomputed,
+        'added': recomputed,
+        'removed': removed,
+        'errors': errors,
+        'rebuilt': rebuilt,
+    }
+
+
+def update_network_report(source, output, sidecar=None, batch=None):
+    """
+    Brings a CIDR report up to date with its input, recomputing only rows that changed.
+
+    The first run writes the full report and a sidecar index holding one
+    64-bit hash per row. Later runs hash the input lines with NumPy, look
+    each one up in the sidecar, compute only the lines that are new or
+    edited, and write the report by copying runs of unchanged rows from the
+    old one as whole slices, so the Python work follows the size of the
+    diff. When neither file changed since the last run nothing else is
+    read. A missing, stale or foreign sidecar makes a full rebuild.
+
+    Parameters:
+        source (str): The input file, one CIDR per line.
+        output (str): The CSV report, the same as write_to_csv writes.
+        sidecar (str): The sidecar index file. Defaults to output + '.idx'.
+        batch (bool): Use the NumPy batch engine for the recomputed rows.
+
+    Returns:
+        dict: rows, unchanged, added and removed row counts, errors and
+        whether the report was rebuilt from scratch. An edited line counts
+        as one removed and one added row.
+    """
+    from cidr.report import HEADERS
+    return _update(NETWORK, HEADERS, source, output, sidecar, _network_inputs,
+                   lambda lines, errors: _network_rows(lines, batch))
+
+
+def update_bandwidth_report(source, output, sidecar=None):
+    """
+    Brings a feeds report up to date with its inventory, recomputing only rows that changed.
+
+    Works like update_network_report on an inventory CSV of throughput,
+    read %, write % and data size. Invalid rows are left out of the report
+    and listed in errors as (line number, input, message).
+
+    Parameters:
+        source (str): The inventory CSV.
+        output (str): The CSV report, with the BandwidthCalculator headers.
+        sidecar (str): The sidecar index file. Defaults to output + '.idx'.
+
+    Returns:
+        dict: rows, unchanged, added and removed row counts, errors and
+        whether the report was rebuilt from scratch.
+    """
+    from feeds.bandwidth_calculator import HEADERS
+    return _update(BANDWIDTH, HEADERS, source, output, sidecar, _bandwidth_inputs, _bandwidth_rows)
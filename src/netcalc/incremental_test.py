@@ -0,0 +1,142 @@
+'''By Ray Bernard ray.bernard@outlook.com
+     MIT License '''
+import csv
+import os
+import random
+import tempfile
+import unittest
+from cidr.report import HEADERS, compute_rows
+from feeds.bandwidth_calculator import HEADERS as FEED_HEADERS, BandwidthCalculator
+from netcalc import incremental
+from netcalc.incremental import update_bandwidth_report, update_network_report
+
+
+class TestIncremental(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.input = os.path.join(self.tmp.name, 'cidrs.txt')
+        self.output = os.path.join(self.tmp.name, 'report.csv')
+        self.ip_list = ['198.51.100.0/22', '192.168.1.10/26', '172.16.0.5/16', '2001:db8::/64', '10.0.0.0/8']
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write_input(self, lines, filename=None):
+        with open(filename or self.input, 'w') as file:
+            file.write('\n'.join(lines) + '\n')
+        # Make sure the new input never shares a stamp with the one before
+        stat = os.stat(filename or self.input)
+        os.utime(filename or self.input, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000))
+
+    def read_csv(self, filename=None):
+        with open(filename or self.output, newline='') as file:
+            return list(csv.reader(file))
+
+    def test_first_run_builds_the_full_report(self):
+        self.write_input(self.ip_list)
+        counts = update_network_report(self.input, self.output)
+        self.assertTrue(counts['rebuilt'])
+        self.assertEqual(counts['rows'], 5)
+        self.assertEqual(counts['added'], 5)
+        self.assertEqual(self.read_csv(), [HEADERS] + compute_rows(self.ip_list, batch=False))
+        self.assertTrue(os.path.exists(self.output + '.idx'))
+
+    def test_only_changed_rows_are_recomputed(self):
+        self.write_input(self.ip_list)
+        update_network_report(self.input, self.output)
+
+        changed = ['198.51.100.0/22', '192.168.1.10/27', '2001:db8::/64', '10.0.0.0/8', '203.0.113.0/24']
+        self.write_input(changed)
+        seen = []
+        original = incremental._network_rows
+
+        def network_rows(lines, batch):
+            seen.extend(line for _, line in lines)
+            return original(lines, batch)
+        incremental._network_rows = network_rows
+        try:
+            counts = update_network_report(self.input, self.output)
+        finally:
+            incremental._network_rows = original
+        self.assertEqual(seen, [b'192.168.1.10/27', b'203.0.113.0/24'])
+        self.assertEqual((counts['unchanged'], counts['added'], counts['removed']), (3, 2, 2))
+        self.assertFalse(counts['rebuilt'])
+        self.assertEqual(self.read_csv(), [HEADERS] + compute_rows(changed, batch=False))
+
+    def test_unchanged_files_are_not_read(self):
+        self.write_input(self.ip_list)
+        update_network_report(self.input, self.output)
+        counts = update_network_report(self.input, self.output)
+        self.assertEqual((counts['rows'], counts['unchanged'], counts['added']), (5, 5, 0))
+
+    def test_stale_sidecar_rebuilds(self):
+        self.write_input(self.ip_list)
+        update_network_report(self.input, self.output)
+        with open(self.output, 'a') as file:
+            file.write('edited by hand\r\n')
+        self.write_input(self.ip_list[:2])
+        counts = update_network_report(self.input, self.output)
+        self.assertTrue(counts['rebuilt'])
+        self.assertEqual(self.read_csv(), [HEADERS] + compute_rows(self.ip_list[:2], batch=False))
+
+        with open(self.output + '.idx', 'wb') as file:
+            file.write(b'not a sidecar')
+        self.write_input(self.ip_list[:3])
+        self.assertTrue(update_network_report(self.input, self.output)['rebuilt'])
+        self.assertEqual(self.read_csv(), [HEADERS] + compute_rows(self.ip_list[:3], batch=False))
+
+    def test_duplicates_and_blank_lines(self):
+        lines = ['10.0.0.0/8', '', '10.0.0.0/8', '192.168.0.0/16']
+        self.write_input(lines)
+        update_network_report(self.input, self.output)
+        self.write_input(lines + ['10.0.0.0/8'])
+        counts = update_network_report(self.input, self.output)
+        self.assertEqual((counts['rows'], counts['added'], counts['removed']), (4, 0, 0))
+        self.assertEqual(self.read_csv(), [HEADERS] + compute_rows([line for line in lines + ['10.0.0.0/8'] if line],
+                                                                   batch=False))
+
+    def test_edits_among_repeated_lines(self):
+        rng = random.Random(7)
+        pool = ['10.0.0.0/8', '10.1.0.0/16', '192.168.0.0/24', '172.16.0.0/12', '2001:db8::/48']
+        lines = [rng.choice(pool) for _ in range(500)]
+        self.write_input(lines)
+        update_network_report(self.input, self.output)
+        for _ in range(5):
+            index = rng.randrange(len(lines))
+            lines.insert(index, f"203.0.113.{rng.randrange(256)}/32")
+            del lines[rng.randrange(len(lines))]
+            lines[rng.randrange(len(lines))] = rng.choice(pool)
+            self.write_input(lines)
+            update_network_report(self.input, self.output)
+            self.assertEqual(self.read_csv(), [HEADERS] + compute_rows(lines, batch=False))
+
+    def test_bandwidth_report(self):
+        inventory = os.path.join(self.tmp.name, 'inventory.csv')
+        lines = ['Media Throughput,Read,Write,Size', '10 Gbps,50,50,1 TB', 'bad', '1 Gbps, 70, 30, 500 GB']
+        self.write_input(lines, inventory)
+        counts = update_bandwidth_report(inventory, self.output)
+        self.assertEqual(counts['errors'], [(3, 'bad', 'Expected 4 fields, got 1')])
+        expected = [BandwidthCalculator('10 Gbps', 50, 50, '1 TB').calculate(),
+                    BandwidthCalculator('1 Gbps', 70, 30, '500 GB').calculate()]
+        self.assertEqual(self.read_csv(), [FEED_HEADERS] + expected)
+
+        # A run with errors reports them again, even when nothing changed
+        counts = update_bandwidth_report(inventory, self.output)
+        self.assertEqual(len(counts['errors']), 1)
+        self.assertEqual(counts['unchanged'], 2)
+
+        self.write_input(lines[:2] + ['1 Gbps, 70, 30, 500 GB', '40 Gbps,80,20,10 TB'], inventory)
+        counts = update_bandwidth_report(inventory, self.output)
+        self.assertEqual((counts['unchanged'], counts['added'], counts['errors']), (2, 1, []))
+        self.assertEqual(self.read_csv()[-1], BandwidthCalculator('40 Gbps', 80, 20, '10 TB').calculate())
+
+    def test_reports_do_not_share_a_sidecar(self):
+        self.write_input(self.ip_list)
+        update_network_report(self.input, self.output)
+        inventory = os.path.join(self.tmp.name, 'inventory.csv')
+        self.write_input(['10 Gbps,50,50,1 TB'], inventory)
+        self.assertTrue(update_bandwidth_report(inventory, self.output)['rebuilt'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,146 @@
+'''By Ray Bernard ray.bernard@outlook.com
+     MIT License '''
+import time
+
+
+class _Stage:
+    """
+    Times one pass through a stage and adds it to the Instrumentation totals.
+    """
+    __slots__ = ('instrumentation', 'name', 'wall', 'cpu')
+
+    def __init__(self, instrumentation, name):
+        self.instrumentation = instrumentation
+        self.name = name
+
+    def __enter__(self):
+        self.wall = time.perf_counter()
+        self.cpu = time.process_time()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        wall = time.perf_counter() - self.wall
+        cpu = time.process_time() - self.cpu
+        self.instrumentation._add_stage(self.name, wall, cpu)
+        if exc_type is not None:
+            self.instrumentation.count('errors')
+        return False
+
+
+class Instrumentation:
+    """
+    Collects per-stage timings and counters from the report writers.
+
+    Pass an instance as the instrument argument of a writer, for example
+    Network_Calculator.write_to_csv or BandwidthCalculator.write_to_csv.
+    Writers time their stages (parse, compute, format, write) with stage()
+    and count rows, bytes_written and errors with count(). When no instrument
+    is passed the writers skip all of this, so there is no cost when
+    instrumentation is off.
+
+    An optional callback receives every measurement as it happens, as a
+    (metric name, value) pair such as ('write.wall_seconds', 0.012) or
+    ('rows', 65536), ready to forward to a metrics system.
+    """
+
+    def __init__(self, callback=None):
+        """
+        Constructor of the Instrumentation class
+
+        Parameters:
+            callback (callable): Called with (metric name, value) for every measurement.
+
+        Returns:
+            None
+        """
+        self.callback = callback
+        self.stages = {}
+        self.counters = {}
+
+    def stage(self, name):
+        """
+        Returns a context manager that times one pass through a stage.
+
+        Wall and CPU time add up over every pass. An exception raised inside
+        the stage is counted in the errors counter and passed on.
+
+        Parameters:
+            name (str): The stage name, for example 'parse' or 'write'.
+
+        Returns:
+            context manager: The stage timer.
+        """
+        return _Stage(self, name)
+
+    def _add_stage(self, name, wall, cpu):
+        totals = self.stages.get(name)
+        if totals is None:
+            totals = self.stages[name] = {'wall_seconds': 0.0, 'cpu_seconds': 0.0, 'calls': 0}
+        totals['wall_seconds'] += wall
+        totals['cpu_seconds'] += cpu
+        totals['calls'] += 1
+        if self.callback is not None:
+            self.callback(f"{name}.wall_seconds", wall)
+            self.callback(f"{name}.cpu_seconds", cpu)
+
+    def count(self, name, value=1):
+        """
+        Adds to a counter.
+
+        Parameters:
+            name (str): The counter name, for example 'rows' or 'bytes_written'.
+            value (int): The amount to add.
+
+        Returns:
+            None
+        """
+        self.counters[name] = self.counters.get(name, 0) + value
+        if self.callback is not None:
+            self.callback(name, value)
+
+    def as_dict(self):
+        """
+        Returns a copy of everything collected so far.
+
+        Parameters:
+            None
+
+        Returns:
+            dict: 'stages' maps each stage to wall_seconds, cpu_seconds and
+            calls; 'counters' maps each counter to its total.
+        """
+        return {
+            'stages': {name: dict(totals) for name, totals in self.stages.items()},
+            'counters': dict(self.counters),
+        }
+
+    def reset(self):
+        """
+        Clears the collected timings and counters.
+
+        Parameters:
+            None
+
+        Returns:
+            None
+        """
+        self.stages.clear()
+        self.counters.clear()
+
+    def summary(self):
+        """
+        Formats the collected timings and counters as a table.
+
+        Parameters:
+            None
+
+        Returns:
+            str: One line per stage and per counter.
+        """
+        lines = ["{:<15} {:>12} {:>12} {:>10}".format('Stage', 'Wall (s)', 'CPU (s)', 'Calls')]
+        for name, totals in self.stages.items():
+            lines.append("{:<15} {:>12.4f} {:>12.4f} {:>10,}".format(
+                name, totals['wall_seconds'], totals['cpu_seconds'], totals['calls']))
+        for name, value in self.counters.items():
+            lines.append("{:<15} {:>12,}".format(name, value))
+        return '\n'.join(lines)
@@ -0,0 +1,103 @@
+'''By Ray Bernard ray.bernard@outlook.com
+     MIT License '''
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from cidr.network_calculator import Network_Calculator
+from feeds.bandwidth_calculator import BandwidthCalculator
+from netcalc.instrumentation import Instrumentation
+
+
+class TestInstrumentation(unittest.TestCase):
+    def setUp(self):
+        self.ip_list = ['198.51.100.0/22', '192.168.1.10/26', '172.16.0.5/16', '2001:db8::/64']
+
+    def test_stages_and_counters(self):
+        events = []
+        instrument = Instrumentation(callback=lambda name, value: events.append(name))
+        with instrument.stage('parse'):
+            pass
+        with instrument.stage('parse'):
+            pass
+        instrument.count('rows', 5)
+        collected = instrument.as_dict()
+        self.assertEqual(collected['stages']['parse']['calls'], 2)
+        self.assertGreaterEqual(collected['stages']['parse']['wall_seconds'], 0)
+        self.assertEqual(collected['counters'], {'rows': 5})
+        self.assertEqual(events, ['parse.wall_seconds', 'parse.cpu_seconds'] * 2 + ['rows'])
+        self.assertIn('parse', instrument.summary())
+        instrument.reset()
+        self.assertEqual(instrument.as_dict(), {'stages': {}, 'counters': {}})
+
+    def test_errors_are_counted(self):
+        instrument = Instrumentation()
+        with self.assertRaises(ValueError):
+            with instrument.stage('parse'):
+                raise ValueError('bad')
+        self.assertEqual(instrument.counters['errors'], 1)
+
+    def test_network_write_to_csv(self):
+        for batch in (False, True):
+            instrument = Instrumentation()
+            with tempfile.TemporaryDirectory() as tmp:
+                instrumented = os.path.join(tmp, 'instrumented.csv')
+                plain = os.path.join(tmp, 'plain.csv')
+                Network_Calculator.write_to_csv(self.ip_list, instrumented, batch=batch, instrument=instrument)
+                Network_Calculator.write_to_csv(self.ip_list, plain, batch=batch)
+                with open(instrumented) as a, open(plain) as b:
+                    self.assertEqual(a.read(), b.read())
+                size = os.path.getsize(instrumented)
+            stages = instrument.as_dict()['stages']
+            self.assertTrue({'parse', 'format', 'write'} <= set(stages), stages)
+            if batch:
+                self.assertIn('compute', stages)
+            self.assertEqual(instrument.counters['rows'], 4)
+            self.assertEqual(instrument.counters['bytes_written'], size)
+
+    def test_bytes_are_encoded_bytes(self):
+        # int() accepts the no-break space, so the CIDR text is written as given
+        ip_list = ['10.0.0.0/8\u00a0']
+        instrument = Instrumentation()
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = os.path.join(tmp, 'network.csv')
+            Network_Calculator.write_to_csv(ip_list, filename, instrument=instrument)
+            self.assertEqual(instrument.counters['bytes_written'], os.path.getsize(filename))
+
+    def test_instrumentation_does_not_change_results(self):
+        for columns in (None, ['Network ID']):
+            with self.assertRaises(ValueError):
+                Network_Calculator.write_to_csv(['10.0.0.0/8', ''], os.devnull, columns=columns)
+            with self.assertRaises(ValueError):
+                Network_Calculator.write_to_csv(['10.0.0.0/8', ''], os.devnull, instrument=Instrumentation(),
+                                                columns=columns)
+
+    def test_network_print_and_errors(self):
+        instrument = Instrumentation()
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            Network_Calculator.print_network_info(self.ip_list, instrument=instrument)
+        self.assertEqual(instrument.counters['bytes_written'], len(output.getvalue().encode()))
+        with contextlib.redirect_stdout(io.StringIO()) as plain:
+            Network_Calculator.print_network_info(self.ip_list)
+        self.assertEqual(output.getvalue(), plain.getvalue())
+        with self.assertRaises(ValueError):
+            Network_Calculator.write_to_csv(['10.0.0.0/33'], os.devnull, instrument=instrument)
+        self.assertEqual(instrument.counters['errors'], 1)
+
+    def test_bandwidth_writers(self):
+        instrument = Instrumentation()
+        calculator = BandwidthCalculator('1 Gbps', 50, 50, '1 TB')
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = os.path.join(tmp, 'feeds.csv')
+            calculator.write_to_csv(filename, instrument=instrument)
+            size = os.path.getsize(filename)
+        with contextlib.redirect_stdout(io.StringIO()):
+            calculator.print_to_console(instrument=instrument)
+        self.assertEqual(instrument.stages['compute']['calls'], 2)
+        self.assertEqual(instrument.stages['write']['calls'], 2)
+        self.assertEqual(instrument.counters, {'rows': 2, 'bytes_written': size})
+
+
+if __name__ == '__main__':
+    unittest.main()
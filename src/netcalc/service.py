@@ -0,0 +1,373 @@
+'''By Ray Bernard ray.bernard@outlook.com
+     MIT License '''
+import argparse
+import asyncio
+import json
+
+from cidr.report import HEADERS as NETWORK_HEADERS, compute_rows
+from feeds.bandwidth_calculator import HEADERS as BANDWIDTH_HEADERS, BandwidthCalculator
+
+
+MAX_BODY_SIZE = 16 << 20
+DEFAULT_MAX_BATCH = 4096
+DEFAULT_MAX_DELAY = 0.002
+
+_REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+            413: 'Payload Too Large', 500: 'Internal Server Error'}
+
+
+class HTTPError(Exception):
+    """
+    An error reported to the client with an HTTP status code.
+    """
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class MicroBatcher:
+    """
+    Coalesces CIDRs from concurrent requests into one compute_rows call.
+
+    The first request of a batch waits at most max_delay seconds for others
+    to join, or until max_batch CIDRs are pending, so a lone request pays a
+    couple of milliseconds and a burst pays one batch computation.
+    """
+
+    def __init__(self, max_batch=DEFAULT_MAX_BATCH, max_delay=DEFAULT_MAX_DELAY, batch=None):
+        """
+        Constructor of the MicroBatcher class
+
+        Parameters:
+            max_batch (int): The number of pending CIDRs that flushes a batch at once.
+            max_delay (float): The longest time in seconds a CIDR waits for a batch to fill.
+            batch (bool): Use the NumPy batch engine. None uses it when NumPy is installed.
+
+        Returns:
+            None
+        """
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.batch = batch
+        self._pending = []
+        self._count = 0
+        self._timer = None
+        self.batches = 0
+        self.requests = 0
+
+    async def rows(self, ip_list):
+        """
+        Computes the report rows for one request's CIDRs as part of a batch.
+
+        Parameters:
+            ip_list (list): A list of IP addresses with CIDR notation.
+
+        Returns:
+            list: One list of eight strings per CIDR.
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((ip_list, future))
+        self._count += len(ip_list)
+        self.requests += 1
+        if self._count >= self.max_batch:
+            self.flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.max_delay, self.flush)
+        return await future
+
+    def flush(self):
+        """
+        Starts computing every pending request on a worker thread.
+
+        The event loop keeps serving connections while the batch is computed,
+        and each request's future is resolved when the batch is done.
+
+        Parameters:
+            None
+
+        Returns:
+            None
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        # A request cancelled while it waited, for example by a client
+        # disconnect, already has a done future that must not be set again
+        pending = [(ip_list, future) for ip_list, future in self._pending if not future.done()]
+        self._pending, self._count = [], 0
+        if not pending:
+            return
+        self.batches += 1
+
+        results = asyncio.get_running_loop().run_in_executor(None, self._compute, [ip_list for ip_list, _ in pending])
+        results.add_done_callback(lambda done: self._resolve(pending, done))
+
+    def _compute(self, ip_lists):
+        # Runs on a worker thread and returns the rows or the error of each request
+        try:
+            rows = self._compute_rows([ip_cidr for ip_list in ip_lists for ip_cidr in ip_list])
+        except Exception:
+            # One bad request must not fail the others, so compute them one by one
+            results = []
+            for ip_list in ip_lists:
+                try:
+                    results.append(self._compute_rows(ip_list))
+                except Exception as error:
+                    results.append(error)
+            return results
+
+        results, start = [], 0
+        for ip_list in ip_lists:
+            results.append(rows[start:start + len(ip_list)])
+            start += len(ip_list)
+        return results
+
+    def _compute_rows(self, ip_list):
+        return compute_rows(ip_list, self.batch)
+
+    def _resolve(self, pending, done):
+        for index, (_, future) in enumerate(pending):
+            # The request may have been cancelled while its batch was computed
+            if future.done():
+                continue
+            if done.cancelled():
+                future.cancel()
+            elif done.exception() is not None:
+                future.set_exception(done.exception())
+            elif isinstance(done.result()[index], Exception):
+                future.set_exception(done.result()[index])
+            else:
+                future.set_result(done.result()[index])
+
+
+class CalculatorService:
+    """
+    A local HTTP/JSON service that keeps the network and bandwidth calculators warm.
+
+    Connections are kept alive between requests, and network requests from
+    concurrent clients are computed together by a MicroBatcher.
+
+    Endpoints:
+        POST /network    {"cidrs": ["10.0.0.0/8", ...]} or {"cidr": "10.0.0.0/8"}
+        POST /bandwidth  {"media_throughput": "1 Gbps", "read_ratio": 50,
+                          "write_ratio": 50, "initial_data_size": "1 TB"}
+        GET  /health
+    """
+
+    def __init__(self, max_batch=DEFAULT_MAX_BATCH, max_delay=DEFAULT_MAX_DELAY, batch=None):
+        """
+        Constructor of the CalculatorService class
+
+        Parameters:
+            max_batch (int): The number of pending CIDRs that flushes a batch at once.
+            max_delay (float): The longest time in seconds a CIDR waits for a batch to fill.
+            batch (bool): Use the NumPy batch engine. None uses it when NumPy is installed.
+
+        Returns:
+            None
+        """
+        self.batcher = MicroBatcher(max_batch, max_delay, batch)
+        self.server = None
+
+    async def start(self, host='127.0.0.1', port=8080, path=None):
+        """
+        Starts listening on a TCP port, or on a Unix socket when path is given.
+
+        Parameters:
+            host (str): The address to listen on.
+            port (int): The TCP port. 0 picks a free port.
+            path (str): The Unix socket path.
+
+        Returns:
+            asyncio.Server: The listening server.
+        """
+        # Load the compute engines now rather than on the first request
+        compute_rows(['10.0.0.0/24', '2001:db8::/64'], self.batcher.batch)
+        if path is not None:
+            self.server = await asyncio.start_unix_server(self.handle_connection, path)
+        else:
+            self.server = await asyncio.start_server(self.handle_connection, host, port)
+        return self.server
+
+    async def close(self):
+        """
+        Stops listening and waits for the server to close.
+
+        Parameters:
+            None
+
+        Returns:
+            None
+        """
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+
+    async def handle_connection(self, reader, writer):
+        """
+        Serves HTTP/1.1 requests on one connection until the client closes it.
+        """
+        try:
+            while True:
+                request = await self._read_request(reader, writer)
+                if request is None:
+                    break
+                method, target, keep_alive, body = request
+                try:
+                    status, payload = 200, await self.dispatch(method, target, body)
+                except HTTPError as error:
+                    status, payload = error.status, {'error': str(error)}
+                except Exception as error:
+                    status, payload = 500, {'error': str(error)}
+                self._write_response(writer, status, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _read_request(self, reader, writer):
+        try:
+            head = await reader.readuntil(b'\r\n\r\n')
+        except asyncio.IncompleteReadError:
+            return None
+        except asyncio.LimitOverrunError:
+            self._write_response(writer, 413, {'error': 'Request headers too large'}, False)
+            return None
+
+        lines = head.decode('latin-1').split('\r\n')
+        method, target, version = (lines[0].split(' ') + ['', '', ''])[:3]
+        headers = {}
+        for line in lines[1:]:
+            name, _, value = line.partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        connection = headers.get('connection', '').lower()
+        keep_alive = connection != 'close' if version == 'HTTP/1.1' else connection == 'keep-alive'
+        try:
+            length = int(headers.get('content-length', '0') or 0)
+        except ValueError:
+            self._write_response(writer, 400, {'error': 'Invalid Content-Length'}, False)
+            return None
+        if length > MAX_BODY_SIZE:
+            self._write_response(writer, 413, {'error': 'Request body too large'}, False)
+            return None
+        body = await reader.readexactly(length) if length else b''
+        return method, target, keep_alive, body
+
+    def _write_response(self, writer, status, payload, keep_alive):
+        body = json.dumps(payload, separators=(',', ':')).encode()
+        writer.write(f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+                     f"Content-Type: application/json\r\n"
+                     f"Content-Length: {len(body)}\r\n"
+                     f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + body)
+
+    async def dispatch(self, method, target, body):
+        """
+        Routes one request to its handler.
+
+        Parameters:
+            method (str): The HTTP method.
+            target (str): The request path.
+            body (bytes): The JSON request body.
+
+        Returns:
+            dict: The JSON response payload.
+        """
+        path = target.split('?', 1)[0]
+        if path == '/health':
+            return {'status': 'ok', 'requests': self.batcher.requests, 'batches': self.batcher.batches}
+        if path not in ('/network', '/bandwidth'):
+            raise HTTPError(404, f"Unknown path {path}")
+        if method != 'POST':
+            raise HTTPError(405, f"{path} only accepts POST")
+        try:
+            request = json.loads(body or b'{}')
+        except ValueError as error:
+            raise HTTPError(400, f"Invalid JSON: {error}") from None
+        if not isinstance(request, dict):
+            raise HTTPError(400, "The request body must be a JSON object")
+
+        if path == '/network':
+            return await self.network(request)
+        return self.bandwidth(request)
+
+    async def network(self, request):
+        """
+        Computes the network report for the request's CIDRs.
+
+        Parameters:
+            request (dict): {"cidrs": [...]} or {"cidr": "..."}.
+
+        Returns:
+            dict: The report headers and one row per CIDR.
+        """
+        ip_list = request.get('cidrs', [request['cidr']] if 'cidr' in request else None)
+        if not isinstance(ip_list, list) or not all(isinstance(ip_cidr, str) for ip_cidr in ip_list):
+            raise HTTPError(400, "Expected 'cidrs' as a list of strings or 'cidr' as a string")
+        try:
+            rows = await self.batcher.rows(ip_list) if ip_list else []
+        except Exception as error:
+            # The batcher only reports errors raised while computing this request's own CIDRs
+            raise HTTPError(400, str(error)) from None
+        return {'headers': NETWORK_HEADERS, 'rows': rows}
+
+    def bandwidth(self, request):
+        """
+        Computes the bandwidth report for one media throughput, ratio and data size.
+
+        Parameters:
+            request (dict): The BandwidthCalculator constructor arguments by name.
+
+        Returns:
+            dict: The report headers and the row.
+        """
+        try:
+            calculator = BandwidthCalculator(request['media_throughput'], request['read_ratio'],
+                                             request['write_ratio'], request['initial_data_size'])
+        except KeyError as error:
+            raise HTTPError(400, f"Missing field {error}") from None
+        except (TypeError, ValueError, AttributeError) as error:
+            raise HTTPError(400, str(error)) from None
+        return {'headers': BANDWIDTH_HEADERS, 'row': calculator.calculate()}
+
+
+async def serve(host='127.0.0.1', port=8080, path=None, max_batch=DEFAULT_MAX_BATCH, max_delay=DEFAULT_MAX_DELAY):
+    """
+    Runs the calculator service until cancelled.
+
+    Parameters:
+        host (str): The address to listen on.
+        port (int): The TCP port.
+        path (str): Listen on this Unix socket instead of TCP.
+        max_batch (int): The number of pending CIDRs that flushes a batch at once.
+        max_delay (float): The longest time in seconds a CIDR waits for a batch to fill.
+
+    Returns:
+        None
+    """
+    service = CalculatorService(max_batch, max_delay)
+    server = await service.start(host, port, path)
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local HTTP/JSON service for network and bandwidth calculations.')
+    parser.add_argument('--host', default='127.0.0.1', help='the address to listen on')
+    parser.add_argument('--port', type=int, default=8080, help='the TCP port to listen on')
+    parser.add_argument('--unix', help='listen on this Unix socket path instead of TCP')
+    parser.add_argument('--max-batch', type=int, default=DEFAULT_MAX_BATCH, help='pending CIDRs that flush a batch')
+    parser.add_argument('--max-delay', type=float, default=DEFAULT_MAX_DELAY, help='seconds a request waits for a batch')
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.unix, args.max_batch, args.max_delay))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,136 @@
+'''By Ray Bernard ray.bernard@outlook.com
+     MIT License '''
+import asyncio
+import json
+import threading
+import unittest
+from cidr.report import compute_rows
+from netcalc.service import CalculatorService, MicroBatcher
+
+
+async def request(reader, writer, method, path, payload=None, close=False):
+    body = json.dumps(payload).encode() if payload is not None else b''
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(body)}\r\n"
+                 f"{'Connection: close' + chr(13) + chr(10) if close else ''}\r\n".encode() + body)
+    head = await reader.readuntil(b'\r\n\r\n')
+    lines = head.decode().split('\r\n')
+    headers = dict(line.split(': ', 1) for line in lines[1:] if line)
+    data = await reader.readexactly(int(headers['Content-Length']))
+    return int(lines[0].split()[1]), headers, json.loads(data)
+
+
+class TestCalculatorService(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.service = CalculatorService(max_delay=0.01)
+        server = await self.service.start('127.0.0.1', 0)
+        self.port = server.sockets[0].getsockname()[1]
+
+    async def asyncTearDown(self):
+        await self.service.close()
+
+    async def connect(self):
+        return await asyncio.open_connection('127.0.0.1', self.port)
+
+    async def test_network_and_bandwidth_on_one_connection(self):
+        reader, writer = await self.connect()
+        ip_list = ['198.51.100.0/22', '2001:db8::1/64']
+        status, headers, payload = await request(reader, writer, 'POST', '/network', {'cidrs': ip_list})
+        self.assertEqual(status, 200)
+        self.assertEqual(headers['Connection'], 'keep-alive')
+        self.assertEqual(payload['rows'], compute_rows(ip_list, batch=False))
+
+        status, _, payload = await request(reader, writer, 'POST', '/bandwidth', {
+            'media_throughput': '1 Gbps', 'read_ratio': 50, 'write_ratio': 50, 'initial_data_size': '1 TB'})
+        self.assertEqual(status, 200)
+        self.assertEqual(payload['row'][-1], '4 hours, 39 minutes, 37.22 seconds')
+
+        status, headers, _ = await request(reader, writer, 'GET', '/health', close=True)
+        self.assertEqual((status, headers['Connection']), (200, 'close'))
+        self.assertEqual(await reader.read(), b'')
+        writer.close()
+
+    async def test_concurrent_requests_are_batched(self):
+        async def one(index):
+            reader, writer = await self.connect()
+            try:
+                return await request(reader, writer, 'POST', '/network', {'cidr': f"10.{index}.0.0/16"})
+            finally:
+                writer.close()
+
+        results = await asyncio.gather(*(one(index) for index in range(20)))
+        for index, (status, _, payload) in enumerate(results):
+            self.assertEqual(status, 200)
+            self.assertEqual(payload['rows'][0][2], f"10.{index}.0.0")
+        self.assertEqual(self.service.batcher.requests, 20)
+        self.assertLess(self.service.batcher.batches, 20)
+
+    async def test_bad_request_does_not_fail_its_batch(self):
+        async def one(ip_cidr):
+            reader, writer = await self.connect()
+            try:
+                return await request(reader, writer, 'POST', '/network', {'cidrs': [ip_cidr]})
+            finally:
+                writer.close()
+
+        good, bad = await asyncio.gather(one('10.0.0.0/8'), one('10.0.0.0/33'))
+        self.assertEqual(good[0], 200)
+        self.assertEqual(bad[0], 400)
+        self.assertIn('error', bad[2])
+
+    async def test_cancelled_request_does_not_stall_its_batch(self):
+        batcher = MicroBatcher(max_delay=60)
+        tasks = [asyncio.create_task(batcher.rows([ip_cidr])) for ip_cidr in ('10.0.0.0/8', '11.0.0.0/8', '12.0.0.0/8')]
+        await asyncio.sleep(0)
+        tasks[1].cancel()
+        await asyncio.sleep(0)
+        batcher.flush()
+        first, third = await asyncio.wait_for(asyncio.gather(tasks[0], tasks[2]), 1)
+        self.assertEqual((first[0][2], third[0][2]), ('10.0.0.0', '12.0.0.0'))
+        self.assertTrue(tasks[1].cancelled())
+
+        # The one-by-one retry after a bad CIDR skips cancelled requests too
+        tasks = [asyncio.create_task(batcher.rows([ip_cidr])) for ip_cidr in ('10.0.0.0/33', '11.0.0.0/8', '12.0.0.0/8')]
+        await asyncio.sleep(0)
+        tasks[1].cancel()
+        await asyncio.sleep(0)
+        batcher.flush()
+        results = await asyncio.wait_for(asyncio.gather(tasks[0], tasks[2], return_exceptions=True), 1)
+        self.assertIsInstance(results[0], ValueError)
+        self.assertEqual(results[1][0][2], '12.0.0.0')
+
+    async def test_batch_is_computed_off_the_event_loop(self):
+        class FailingBatcher(MicroBatcher):
+            def _compute_rows(self, ip_list):
+                self.threads.add(threading.get_ident())
+                if '10.0.0.0/8' in ip_list:
+                    raise ZeroDivisionError('division by zero')
+                return super()._compute_rows(ip_list)
+
+        batcher = FailingBatcher(max_delay=60)
+        batcher.threads = set()
+        tasks = [asyncio.create_task(batcher.rows([ip_cidr])) for ip_cidr in ('10.0.0.0/8', '11.0.0.0/8')]
+        await asyncio.sleep(0)
+        batcher.flush()
+        results = await asyncio.wait_for(asyncio.gather(*tasks, return_exceptions=True), 1)
+        self.assertIsInstance(results[0], ZeroDivisionError)
+        self.assertEqual(results[1][0][2], '11.0.0.0')
+        self.assertNotIn(threading.get_ident(), batcher.threads)
+
+        self.service.batcher = FailingBatcher(max_delay=0.01)
+        self.service.batcher.threads = set()
+        reader, writer = await self.connect()
+        self.assertEqual((await request(reader, writer, 'POST', '/network', {'cidr': '10.0.0.0/8'}))[0], 400)
+        self.assertEqual((await request(reader, writer, 'POST', '/network', {'cidr': '11.0.0.0/8'}))[0], 200)
+        writer.close()
+
+    async def test_errors(self):
+        reader, writer = await self.connect()
+        self.assertEqual((await request(reader, writer, 'GET', '/nope'))[0], 404)
+        self.assertEqual((await request(reader, writer, 'GET', '/network'))[0], 405)
+        self.assertEqual((await request(reader, writer, 'POST', '/network', {'cidrs': 'x'}))[0], 400)
+        self.assertEqual((await request(reader, writer, 'POST', '/bandwidth', {'read_ratio': 50}))[0], 400)
+        writer.close()
+
+
+if __name__ == '__main__':
+    unittest.main()